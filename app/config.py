@@ -4,6 +4,7 @@
 import os
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict
 
 
 class Settings(BaseSettings):
@@ -25,6 +26,8 @@ class Settings(BaseSettings):
     gemini_api_key: str = ""
     gemini_model: str = "gemini-2.0-flash-exp"
     gemini_api_url: str = "https://generativelanguage.googleapis.com/v1beta/models"
+    gemini_streaming: bool = True   # 생성 중인 결과를 로딩 페이지로 스트리밍 (SSE)
+    gemini_fake: bool = False       # 개발/테스트용 가짜 모델 (API 호출 없음, app/services/gemini_fake.py)
 
     # 환경
     environment: str = "development"
@@ -33,6 +36,14 @@ class Settings(BaseSettings):
     # 캐시
     cache_enabled: bool = True
     cache_duration_hours: int = 24
+    saju_cache_size: int = 4096              # 사주 계산 결과 LRU 항목 수
+    saju_cache_ttl_seconds: int = 60 * 60 * 24
+
+    # AI 생성 작업 큐 (uvicorn 워커 프로세스마다 따로 적용 - 전체 상한은 값 × 워커 수)
+    generation_workers: int = 8                       # 동시에 실행하는 생성 작업 수
+    generation_queue_size: int = 125                  # 대기 작업 상한 (넘으면 '잠시 후 다시' 안내)
+    generation_service_limits: Dict[str, int] = {}    # 서비스별 동시 실행 상한 (JSON, 예: {"saju": 2})
+    generation_drain_seconds: int = 30                # 종료 시 남은 작업을 기다리는 시간
 
     class Config:
         env_file = ".env"
@@ -65,6 +76,8 @@ class Settings(BaseSettings):
         # Gemini API 키 검증
         if not self.gemini_api_key or self.gemini_api_key == "your-gemini-api-key-here":
             errors.append("❌ GEMINI_API_KEY를 설정해야 합니다!")
+        if self.gemini_fake:
+            errors.append("❌ GEMINI_FAKE는 개발/테스트 전용입니다. 프로덕션에서는 False로 설정하세요!")
 
         # DEBUG 모드 검증
         if self.debug:
@@ -211,10 +211,37 @@ async def startup_event():
     validate_environment()
 
     create_tables()
+
+    # 오늘 일진 정보 계산 및 자정 사전 계산 작업 시작
+    from app.services.daily_fortune_cache import daily_fortune_cache
+    daily_fortune_cache.start()
+
+    # 생성 상태 알림 - 다른 워커 프로세스의 완료 알림 수신 (PostgreSQL)
+    from app.services.status_hub import status_hub
+    status_hub.start()
+
+    # AI 생성 작업자 시작
+    from app.services.generation_queue import generation_queue
+    generation_queue.start()
+
     print("[OK] Myeongwolheon server started!")
     print("[URL] http://localhost:8000")
 
 
+# 앱 종료 시 실행
+@app.on_event("shutdown")
+async def shutdown_event():
+    """앱 종료 시 정리 (남은 생성 작업 마무리 후 Gemini 비동기 클라이언트 연결 종료, 일진 사전 계산/상태 알림 수신 중지)"""
+    from app.services.daily_fortune_cache import daily_fortune_cache
+    from app.services.gemini_service import gemini_service
+    from app.services.generation_queue import generation_queue
+    from app.services.status_hub import status_hub
+    await generation_queue.drain()
+    await gemini_service.aclose()
+    await daily_fortune_cache.stop()
+    await status_hub.stop()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -9,6 +9,11 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.services.site_service import SiteService
 from app.services.log_service import LogService
+from app.services.saju_cache import saju_cache
+from app.services.daily_fortune_cache import daily_fortune_cache
+from app.services.generation_queue import generation_queue
+from app.services.generation_stream import generation_streams
+from app.services.status_hub import status_hub
 from app.routers.admin.dashboard import check_admin
 
 router = APIRouter()
@@ -318,3 +323,24 @@ async def load_more_logs(
 
     except Exception as e:
         return JSONResponse({"success": False, "error": str(e)}, status_code=500)
+
+
+@router.get("/admin/logs/saju-cache")
+async def saju_cache_stats(admin=Depends(check_admin)):
+    """사주 계산 캐시 / 일진 정보 캐시 통계 (적중/미스/제거 카운터)"""
+    return JSONResponse({
+        "success": True,
+        "stats": saju_cache.stats(),
+        "daily_stats": daily_fortune_cache.stats()
+    })
+
+
+@router.get("/admin/logs/generation-queue")
+async def generation_queue_stats(admin=Depends(check_admin)):
+    """AI 생성 작업 큐 통계 (대기 작업 수, 대기/실행 시간, 거절 수, 스트림 버퍼 수, 상태 알림 대기자 수)"""
+    return JSONResponse({
+        "success": True,
+        "stats": generation_queue.stats(),
+        "stream_stats": generation_streams.stats(),
+        "status_stats": status_hub.stats()
+    })
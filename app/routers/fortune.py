@@ -1,16 +1,21 @@
 """
 운세 생성 공개 라우터
 """
-from fastapi import APIRouter, Request, Depends, Form, BackgroundTasks
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Request, Depends, Form
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from datetime import date, datetime
-from typing import Optional
+from typing import AsyncIterator, Optional, Tuple
+import asyncio
+import json
 
 from app.database import get_db
 from app.services.fortune_service import FortuneService
 from app.services.site_service import SiteService
+from app.services.generation_queue import generation_queue, QueueFullError
+from app.services.generation_stream import generation_streams
+from app.services.status_hub import status_hub, COMPLETED, ERROR, PROCESSING
 from app.middleware import rate_limiter
 from app.config import get_settings
 
@@ -18,6 +23,23 @@ router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 settings = get_settings()
 
+# 스트림 연결 유지 주석 간격 / 저장된 레코드가 나타나기를 기다리는 최대 시간 (초)
+# (처리 중 레코드는 선점이 오래되어 중단으로 볼 때까지 기다림 - FortuneService.is_stale_claim)
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_PENDING_TIMEOUT_SECONDS = 120
+
+# 선점이 오래되어 중단된 작업으로 보는 처리 중 레코드의 에러 메시지
+STALE_CLAIM_MESSAGE = "운세 생성이 중단되었습니다. 다시 시도해주세요."
+
+# 상태 롱폴링 최대 대기 시간 (초)
+STATUS_LONG_POLL_MAX_SECONDS = 30
+
+STATUS_MESSAGES = {
+    "pending": "운세 생성을 준비 중입니다...",
+    "processing": "분석 중입니다...",
+    "completed": "분석이 완료되었습니다!"
+}
+
 
 @router.get("/fortune/{service_code}", response_class=HTMLResponse)
 async def fortune_form(
@@ -92,46 +114,143 @@ async def loading_page(
     )
 
 
-@router.get("/api/fortune/status/{share_code}")
-async def check_fortune_status(
-    share_code: str,
-    db: Session = Depends(get_db)
-):
-    """운세 생성 상태 체크 API (AJAX 폴링용)"""
+def _load_fortune_status(share_code: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """
+    저장된 결과 → (상태, 결과 텍스트, 에러 메시지) - 스레드에서 실행
+
+    결과 없이 오래된 처리 중 레코드(작업하던 프로세스가 종료된 경우)는 에러로 봅니다.
+    """
+    from app.database import SessionLocal
     from app.models import FortuneResult
 
-    result = db.query(FortuneResult).filter(
-        FortuneResult.share_code == share_code
-    ).first()
+    db = SessionLocal()
+    try:
+        result = db.query(FortuneResult).filter(FortuneResult.share_code == share_code).first()
+        if not result:
+            return "pending", None, None
+        if result.status == "error":
+            return "error", None, result.error_message
+        if result.result_text or result.status == "completed":
+            return "completed", result.result_text, None
+        if FortuneService.is_stale_claim(result):
+            return "error", None, STALE_CLAIM_MESSAGE
+        return result.status or "processing", None, None
+    finally:
+        db.close()
+
+
+async def _wait_fortune_status(share_code: str, timeout: float) -> Tuple[str, Optional[str]]:
+    """
+    생성 상태 (상태, 에러 메시지) - 처리 중이면 끝나거나 timeout초가 지날 때까지 대기
+
+    이 프로세스의 작업이나 이미 받은 알림은 DB 없이 상태 알림에서 읽습니다. 모르는 share_code
+    (다른 워커 프로세스의 작업)는 DB를 한 번 조회하고, 처리 중이면 워커 간 알림을 기다립니다.
+    """
+    state = status_hub.get(share_code)
+    if state is None:
+        with status_hub.watch(share_code):
+            status, _, error_message = await asyncio.to_thread(_load_fortune_status, share_code)
+            if status != PROCESSING or not timeout or not status_hub.relaying:
+                return status, error_message
+            state = await status_hub.wait(share_code, timeout)
+        return state or (PROCESSING, None)
+
+    if timeout and state[0] == PROCESSING:
+        state = await status_hub.wait(share_code, timeout)
+    return state
 
-    # 레코드가 아직 없으면 pending 상태 반환 (404 대신 200 OK)
-    if not result:
-        return JSONResponse(content={
-            "status": "pending",
-            "message": "운세 생성을 준비 중입니다..."
-        })
+
+@router.get("/api/fortune/status/{share_code}")
+async def check_fortune_status(share_code: str, wait: float = 0):
+    """
+    운세 생성 상태 체크 API (AJAX 폴링용)
+
+    wait(초)를 주면 처리 중일 때 끝나거나 wait초가 지날 때까지 기다렸다가 응답합니다 (롱폴링).
+    """
+    wait = min(max(wait, 0), STATUS_LONG_POLL_MAX_SECONDS)
+    status, error_message = await _wait_fortune_status(share_code, wait)
 
     # 에러 상태 체크
-    if result.status == "error":
+    if status == "error":
         return JSONResponse(content={
             "status": "error",
-            "message": result.error_message or "AI 분석 중 오류가 발생했습니다."
-        })
-
-    # 완료 상태 체크
-    if result.result_text or result.status == "completed":
-        return JSONResponse(content={
-            "status": "completed",
-            "message": "분석이 완료되었습니다!"
+            "message": error_message or "AI 분석 중 오류가 발생했습니다."
         })
 
-    # 처리 중
+    # 준비 중(레코드 없음)/처리 중/완료 (404 대신 200 OK)
     return JSONResponse(content={
-        "status": result.status or "processing",
-        "message": "분석 중입니다..."
+        "status": status,
+        "message": STATUS_MESSAGES.get(status, "분석 중입니다...")
     })
 
 
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Server-Sent Events 메시지 한 개"""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+async def _fortune_events(share_code: str, start: int) -> AsyncIterator[str]:
+    """생성 스트림 이벤트 (chunk* → done | error)"""
+    loop = asyncio.get_running_loop()
+    give_up_at = loop.time() + STREAM_PENDING_TIMEOUT_SECONDS
+
+    # 버퍼가 없으면 (스트리밍 꺼짐, 다른 워커 프로세스의 작업, 이미 정리됨) 완료 알림을 기다렸다가
+    # 저장된 결과를 한 번에 보냄 - 생성 중인 조각은 생성하는 프로세스에서만 볼 수 있음
+    buffer = generation_streams.get(share_code)
+    while buffer is None:
+        waited_from = loop.time()
+        status, error_message = await _wait_fortune_status(share_code, STREAM_KEEPALIVE_SECONDS)
+        if status == "completed":
+            _, result_text, _ = await asyncio.to_thread(_load_fortune_status, share_code)
+            if start == 0 and result_text:
+                yield _sse("chunk", {"text": result_text}, 0)
+            yield _sse("done", {"status": "completed"})
+            return
+        if status == "error":
+            yield _sse("error", {"message": error_message or "AI 분석 중 오류가 발생했습니다."})
+            return
+        if status == "pending" and not status_hub.is_pending(share_code) and loop.time() > give_up_at:
+            yield _sse("error", {"message": "분석 시간이 너무 오래 걸리고 있습니다. 잠시 후 다시 시도해주세요."})
+            return
+        if loop.time() - waited_from < 1:
+            # 기다릴 알림이 없으면 (워커 간 알림 없음, 레코드 없음) 저장된 결과를 주기적으로 확인
+            await asyncio.sleep(2)
+        yield ": ping\n\n"
+        buffer = generation_streams.get(share_code)
+
+    index = start
+    while True:
+        while index < len(buffer.chunks):
+            yield _sse("chunk", {"text": buffer.chunks[index]}, index)
+            index += 1
+        if buffer.done:
+            if buffer.error:
+                yield _sse("error", {"message": buffer.error})
+            else:
+                yield _sse("done", {"status": "completed"})
+            return
+        if not await buffer.wait(index, STREAM_KEEPALIVE_SECONDS):
+            yield ": ping\n\n"
+
+
+@router.get("/api/fortune/stream/{share_code}")
+async def stream_fortune(share_code: str, request: Request):
+    """
+    운세 생성 스트림 (Server-Sent Events)
+
+    생성 중인 텍스트를 chunk 이벤트(id = 조각 번호)로 보내고, 끝나면 done 또는 error 이벤트를
+    보냅니다. 다시 연결할 때 Last-Event-ID 다음 조각부터 이어서 보냅니다.
+    """
+    last_event_id = request.headers.get("last-event-id", "")
+    start = int(last_event_id) + 1 if last_event_id.isdigit() else 0
+    return StreamingResponse(
+        _fortune_events(share_code, start),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/pages/results/{service_code}/{share_code}", response_class=HTMLResponse)
 async def view_fortune_result(
     request: Request,
@@ -174,6 +293,11 @@ async def view_fortune_result(
             status_code=404
         )
 
+    # 아직 생성 중이면 로딩 페이지로
+    if fortune_result.status == "processing" and not fortune_result.result_text:
+        from fastapi.responses import RedirectResponse
+        return RedirectResponse(url=f"/loading/{service_code}/{share_code}", status_code=303)
+
     # 결과 데이터 구성 (템플릿에서 사용하는 키 이름에 맞춤)
     result = {
         "id": fortune_result.id,
@@ -185,10 +309,9 @@ async def view_fortune_result(
 
     # 사주 서비스인 경우 사주 계산 데이터 추가
     if service_code == "saju":
-        from app.services.saju_calculator import SajuCalculator
+        from app.services.saju_cache import saju_cache
         from datetime import datetime
 
-        calculator = SajuCalculator()
         request_data = fortune_result.request_payload
         birthdate = datetime.fromisoformat(str(request_data["birthdate"])).date()
         birth_time = request_data.get("birth_time")
@@ -196,7 +319,7 @@ async def view_fortune_result(
         gender = request_data["gender"]
         name = request_data.get("name", "고객")
 
-        saju_data = calculator.calculate_saju(
+        saju_data = saju_cache.calculate_saju(
             birthdate=birthdate,
             birth_time=birth_time,
             calendar_type=calendar_type,
@@ -227,7 +350,6 @@ async def view_fortune_result(
 async def fortune_result(
     request: Request,
     service_code: str,
-    background_tasks: BackgroundTasks,
     name: Optional[str] = Form(None),
     birthdate: Optional[date] = Form(None),
     gender: Optional[str] = Form(None),
@@ -321,64 +443,107 @@ async def fortune_result(
 
     # 캐시가 없으면 새로 생성 (비동기)
     import secrets
+    from fastapi.responses import RedirectResponse
     share_code = secrets.token_urlsafe(8)
 
-    # 백그라운드에서 운세 생성 (비동기)
-    def generate_fortune_bg():
+    # 생성 선점 - 같은 요청을 다른 요청(다른 워커 프로세스 포함)이 먼저 선점했으면 그 결과/로딩 페이지로 합류
+    claim = await asyncio.to_thread(
+        fortune_service.claim_generation, service_code, user_key, request_data, share_code
+    )
+    if claim.share_code != share_code:
+        if claim.result_text:
+            return RedirectResponse(url=f"/pages/results/{service_code}/{claim.share_code}", status_code=303)
+        return RedirectResponse(url=f"/loading/{service_code}/{claim.share_code}", status_code=303)
+
+    # 백그라운드에서 운세 생성 (비동기 - AI 응답은 이벤트 루프에서 기다림)
+    async def generate_fortune_bg():
         # 새로운 DB 세션 생성 (백그라운드 태스크용)
         from app.database import SessionLocal
-        from app.models import FortuneResult
-        import logging
 
         bg_db = SessionLocal()
+        fortune_service = FortuneService(bg_db, client_ip=client_ip)
+        stream = generation_streams.get(share_code)
+        error_message = "운세 생성이 중단되었습니다. 다시 시도해주세요."
         try:
-            fortune_service = FortuneService(bg_db, client_ip=client_ip)
-            fortune_service.get_or_create_fortune(service_code, request_data, share_code=share_code)
-            bg_db.commit()
+            await fortune_service.get_or_create_fortune_async(
+                service_code, request_data, share_code=share_code,
+                on_chunk=stream.append if stream else None
+            )
+            await asyncio.to_thread(bg_db.commit)
+            error_message = None
         except Exception as e:
-            bg_db.rollback()
-            logging.error(f"Background fortune generation error: {str(e)}", exc_info=True)
-
-            # DB에 에러 상태 기록
-            try:
-                # share_code로 레코드 찾기 (이미 생성된 경우)
-                result = bg_db.query(FortuneResult).filter(
-                    FortuneResult.share_code == share_code
-                ).first()
-
-                if result:
-                    # 기존 레코드 업데이트
-                    result.status = "error"
-                    result.error_message = f"AI 분석 중 오류가 발생했습니다: {str(e)}"
-                else:
-                    # 새 에러 레코드 생성
-                    from datetime import date as dt_date
-                    # request_data를 JSON 직렬화 가능한 형태로 변환
-                    serializable_data = fortune_service._make_json_serializable(request_data)
-                    error_result = FortuneResult(
-                        service_code=service_code,
-                        user_key="error",  # 임시 키
-                        share_code=share_code,
-                        date=dt_date.today(),
-                        request_payload=serializable_data,
-                        result_text=None,
-                        status="error",
-                        error_message=f"AI 분석 중 오류가 발생했습니다: {str(e)}",
-                        is_from_cache=False
-                    )
-                    bg_db.add(error_result)
-
-                bg_db.commit()
-            except Exception as db_error:
-                logging.error(f"Failed to save error status to DB: {str(db_error)}", exc_info=True)
-                bg_db.rollback()
+            error_message = f"AI 분석 중 오류가 발생했습니다: {str(e)}"
+            await asyncio.to_thread(record_fortune_error, bg_db, fortune_service, e)
         finally:
             bg_db.close()
+            # 결과를 저장한 뒤 기다리는 클라이언트에 알림
+            generation_streams.close(share_code, error_message)
+            if error_message is None:
+                status_hub.publish(share_code, COMPLETED)
+            else:
+                status_hub.publish(share_code, ERROR, error_message)
+
+    def record_fortune_error(bg_db, fortune_service, e):
+        from app.models import FortuneResult
+        import logging
+
+        bg_db.rollback()
+        logging.error(f"Background fortune generation error: {str(e)}", exc_info=e)
+
+        # DB에 에러 상태 기록
+        try:
+            # share_code로 레코드 찾기 (이미 생성된 경우)
+            result = bg_db.query(FortuneResult).filter(
+                FortuneResult.share_code == share_code
+            ).first()
+
+            if result:
+                # 선점 레코드를 에러로 바꾸고 선점 해제 (같은 사용자가 다시 요청할 수 있게)
+                fortune_service.release_claim(result, f"AI 분석 중 오류가 발생했습니다: {str(e)}")
+            else:
+                # 새 에러 레코드 생성
+                from datetime import date as dt_date
+                # request_data를 JSON 직렬화 가능한 형태로 변환
+                serializable_data = fortune_service._make_json_serializable(request_data)
+                error_result = FortuneResult(
+                    service_code=service_code,
+                    user_key=f"error:{share_code}",  # 임시 키 (uix_service_user_date 충돌 방지)
+                    share_code=share_code,
+                    date=dt_date.today(),
+                    request_payload=serializable_data,
+                    result_text=None,
+                    status="error",
+                    error_message=f"AI 분석 중 오류가 발생했습니다: {str(e)}",
+                    is_from_cache=False
+                )
+                bg_db.add(error_result)
 
-    # 백그라운드 태스크 등록
-    background_tasks.add_task(generate_fortune_bg)
+            bg_db.commit()
+        except Exception as db_error:
+            logging.error(f"Failed to save error status to DB: {str(db_error)}", exc_info=True)
+            bg_db.rollback()
+
+    # 생성 작업 큐에 등록 (대기 작업이 가득 차면 선점을 풀고 잠시 후 다시 시도 안내)
+    try:
+        generation_queue.submit(service_code, share_code, generate_fortune_bg)
+    except QueueFullError:
+        await asyncio.to_thread(fortune_service.release_claim, claim)
+        return templates.TemplateResponse(
+            "results/error.html",
+            {
+                "request": request,
+                "site_config": site_config,
+                "message": "지금 운세를 보려는 분이 많아 잠시 대기 중입니다. 잠시 후 다시 시도해주세요."
+            },
+            status_code=503,
+            headers={"Retry-After": "30"}
+        )
+
+    # 로딩 페이지가 구독할 상태/스트림 버퍼 생성
+    status_hub.register(share_code)
+    if settings.gemini_streaming:
+        generation_streams.open(share_code)
 
     # 즉시 로딩 페이지로 리디렉션 (광고 표시)
     redirect_url = f"/loading/{service_code}/{share_code}"
-    from fastapi.responses import RedirectResponse
     return RedirectResponse(url=redirect_url, status_code=303)
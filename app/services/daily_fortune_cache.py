@@ -0,0 +1,142 @@
+"""
+일진/연간 정보 공용 캐시
+
+오늘의 길흉일 정보와 연간 간지/길일 정보는 그날(그해) 모든 사용자에게 같으므로
+날짜/년도를 키로 프로세스 전체가 한 결과를 공유합니다.
+
+자정(KST) 직전에 백그라운드 작업이 다음 날 항목을 미리 계산해 사전 참조를 통째로
+교체하므로, 날짜가 바뀌는 순간에도 요청이 계산을 기다리거나 몰리지 않습니다.
+"""
+import asyncio
+import logging
+import threading
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Optional
+
+from app.services.saju_calculator import SajuCalculator, saju_calculator
+
+logger = logging.getLogger(__name__)
+
+# 한국 표준시 (서머타임 없음)
+KST = timezone(timedelta(hours=9), 'KST')
+
+# 자정 몇 초 전에 다음 날 항목을 계산할지
+PREWARM_LEAD_SECONDS = 60
+
+
+class DailyFortuneCache:
+    """
+    날짜별 일진 정보 / 년도별 연간 정보 캐시
+
+    읽기는 락 없이 현재 사전 참조에서 조회하고, 쓰기는 새 사전을 만들어 참조를 교체합니다.
+    결과 사전은 모든 요청이 공유하므로 읽기 전용으로 다뤄야 합니다.
+    """
+
+    def __init__(self, calculator: SajuCalculator = saju_calculator,
+                 max_days: int = 3, max_years: int = 4):
+        self.calculator = calculator
+        self.max_days = max_days
+        self.max_years = max_years
+        self._daily: Dict[date, Dict] = {}
+        self._years: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.prewarms = 0
+
+    def get_daily_fortune_info(self, target_date: date) -> Dict:
+        """SajuCalculator.get_daily_fortune_info와 같은 결과 (캐시 경유)"""
+        info = self._daily.get(target_date)
+        if info is not None:
+            self.hits += 1
+            return info
+
+        self.misses += 1
+        info = self.calculator.get_daily_fortune_info(target_date)
+        self._daily = self._swap(self._daily, target_date, info, self.max_days)
+        return info
+
+    def get_year_fortune_info(self, year: int) -> Dict:
+        """SajuCalculator.get_year_fortune_info와 같은 결과 (캐시 경유)"""
+        info = self._years.get(year)
+        if info is not None:
+            self.hits += 1
+            return info
+
+        self.misses += 1
+        info = self.calculator.get_year_fortune_info(year)
+        self._years = self._swap(self._years, year, info, self.max_years)
+        return info
+
+    def _swap(self, entries: Dict, key, value, max_size: int) -> Dict:
+        """key를 추가한 새 사전 (오래된 키부터 max_size개까지만 유지)"""
+        with self._lock:
+            updated = dict(entries)
+            updated[key] = value
+            for old_key in sorted(updated)[:-max_size]:
+                del updated[old_key]
+            return updated
+
+    def prewarm(self, target_date: date):
+        """target_date의 일진 정보와 그해 연간 정보를 미리 계산해 교체"""
+        daily_info = self.calculator.get_daily_fortune_info(target_date)
+        year_info = self._years.get(target_date.year) or self.calculator.get_year_fortune_info(target_date.year)
+
+        self._daily = self._swap(self._daily, target_date, daily_info, self.max_days)
+        self._years = self._swap(self._years, target_date.year, year_info, self.max_years)
+        self.prewarms += 1
+
+    async def _prewarm_loop(self):
+        """매일 자정(KST) 직전에 다음 날 항목 계산"""
+        while True:
+            now = datetime.now(KST)
+            next_midnight = datetime.combine(now.date() + timedelta(days=1), dt_time(), tzinfo=KST)
+            delay = (next_midnight - now).total_seconds() - PREWARM_LEAD_SECONDS
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            try:
+                self.prewarm(next_midnight.date())
+            except Exception:
+                logger.exception("다음 날 일진 정보 사전 계산 실패")
+
+            # 자정이 지난 뒤 다음 주기 계산
+            await asyncio.sleep(max(0.0, (next_midnight - datetime.now(KST)).total_seconds()) + 1)
+
+    def start(self):
+        """오늘 항목을 계산하고 자정 사전 계산 작업 시작 (앱 시작 시 이벤트 루프 안에서 호출)"""
+        if self._task is not None and not self._task.done():
+            return
+        today = datetime.now(KST).date()
+        self.prewarm(today)
+        if date.today() != today:
+            # 서버 시간대가 KST가 아니면 date.today() 키도 채워 둠
+            self.prewarm(date.today())
+        self._task = asyncio.get_running_loop().create_task(self._prewarm_loop())
+
+    async def stop(self):
+        """자정 사전 계산 작업 종료 (앱 종료 시 호출)"""
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """관리자 화면용 카운터"""
+        lookups = self.hits + self.misses
+        return {
+            'days': [d.isoformat() for d in sorted(self._daily)],
+            'years': sorted(self._years),
+            'hits': self.hits,
+            'misses': self.misses,
+            'prewarms': self.prewarms,
+            'prewarm_running': self._task is not None and not self._task.done(),
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0
+        }
+
+
+# 싱글톤 인스턴스
+daily_fortune_cache = DailyFortuneCache()
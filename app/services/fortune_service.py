@@ -1,8 +1,10 @@
 """
 운세 생성 서비스
 """
-from datetime import date, datetime
-from typing import Dict, Optional
+import asyncio
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, Optional
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from pathlib import Path
 import random
@@ -12,7 +14,9 @@ from app.models.fortune_result import FortuneResult
 from app.models.service_config import FortuneServiceConfig
 from app.utils.hashing import build_user_key, get_zodiac
 from app.services.gemini_service import gemini_service
-from app.services.saju_calculator import SajuCalculator
+from app.services.saju_calculator import saju_calculator
+from app.services.saju_cache import saju_cache
+from app.services.daily_fortune_cache import daily_fortune_cache
 from app.config import get_settings
 
 settings = get_settings()
@@ -20,6 +24,9 @@ settings = get_settings()
 # 프롬프트 디렉토리 경로
 PROMPTS_DIR = Path(__file__).parent.parent / "prompts"
 
+# 생성 선점(processing) 레코드가 이보다 오래되면 중단된 작업으로 보고 다시 선점 (초)
+CLAIM_STALE_SECONDS = 600
+
 
 class FortuneService:
     """운세 생성 및 캐싱 서비스"""
@@ -82,7 +89,7 @@ class FortuneService:
         target_date: date
     ) -> Optional[FortuneResult]:
         """
-        캐시된 운세 결과 조회
+        캐시된 운세 결과 조회 (생성이 끝난 결과만 - 생성 중인 선점 레코드는 제외)
 
         Args:
             service_code: 서비스 코드 (today, saju, match, dream)
@@ -98,9 +105,93 @@ class FortuneService:
         return self.db.query(FortuneResult).filter(
             FortuneResult.service_code == service_code,
             FortuneResult.user_key == user_key,
-            FortuneResult.date == target_date
+            FortuneResult.date == target_date,
+            FortuneResult.result_text.isnot(None)
         ).first()
 
+    def claim_generation(
+        self,
+        service_code: str,
+        user_key: str,
+        request_data: dict,
+        share_code: str
+    ) -> FortuneResult:
+        """
+        오늘 (서비스, 사용자 키)의 생성 선점
+
+        처리 중(processing) 레코드를 uix_service_user_date 제약 아래 먼저 넣으므로, 같은 요청이
+        여러 워커 프로세스에 동시에 들어와도 한 요청만 선점하고 AI를 호출합니다.
+
+        Args:
+            service_code: 서비스 코드
+            user_key: 사용자 식별 키
+            request_data: 요청 데이터
+            share_code: 선점에 쓸 공유 코드
+
+        Returns:
+            선점한 레코드 (share_code가 같음) 또는 먼저 선점/생성된 레코드
+        """
+        today = date.today()
+        for _ in range(2):
+            claim = FortuneResult(
+                service_code=service_code,
+                user_key=user_key,
+                share_code=share_code,
+                date=today,
+                request_payload=self._make_json_serializable(request_data),
+                result_text=None,
+                status="processing",
+                is_from_cache=False
+            )
+            self.db.add(claim)
+            try:
+                self.db.commit()
+                return claim
+            except IntegrityError:
+                self.db.rollback()
+
+            existing = self.db.query(FortuneResult).filter(
+                FortuneResult.service_code == service_code,
+                FortuneResult.user_key == user_key,
+                FortuneResult.date == today
+            ).first()
+            if existing is None:
+                # 그 사이 선점이 풀림 - 다시 시도
+                continue
+            if existing.result_text is None and self.is_stale_claim(existing):
+                # 중단된 작업(프로세스 종료 등)의 선점 - 에러로 정리하고 다시 시도
+                self.release_claim(existing, "운세 생성이 중단되었습니다. 다시 시도해주세요.")
+                continue
+            return existing
+
+        raise RuntimeError(f"운세 생성 선점에 실패했습니다: {service_code}")
+
+    @staticmethod
+    def is_stale_claim(claim: FortuneResult) -> bool:
+        """CLAIM_STALE_SECONDS가 지나도 결과가 없는 선점인지 (중단된 작업)"""
+        if claim.created_at is None:
+            return False
+        created_at = claim.created_at
+        if created_at.tzinfo is None:
+            # SQLite의 CURRENT_TIMESTAMP는 시간대 없는 UTC
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - created_at).total_seconds() > CLAIM_STALE_SECONDS
+
+    def release_claim(self, claim: FortuneResult, error_message: Optional[str] = None):
+        """
+        생성 선점 해제 (같은 사용자가 다시 요청할 수 있게 함)
+
+        error_message가 있으면 에러 레코드로 남기고 user_key만 비워 두며(에러 로그용),
+        없으면 레코드를 지웁니다 (생성을 시작하지 못한 경우).
+        """
+        if error_message is None:
+            self.db.delete(claim)
+        else:
+            claim.status = "error"
+            claim.error_message = error_message
+            claim.user_key = f"error:{claim.share_code}"
+        self.db.commit()
+
     def create_fortune_result(
         self,
         service_code: str,
@@ -120,35 +211,30 @@ class FortuneService:
         Returns:
             (생성된 운세 결과, 사주 데이터 또는 None)
         """
-        saju_data = None
+        prompt, saju_data = self.prepare_generation(service_code, request_data)
 
-        # 2026 신년운세는 별도 처리
-        if service_code == "newyear2026":
-            prompt = self.build_newyear2026_prompt(request_data)
-            result_text = gemini_service.generate_content(prompt, service_code=service_code, db=self.db, client_ip=self.client_ip)
+        # Gemini API 호출
+        result_text = gemini_service.generate_content(prompt, service_code=service_code, db=self.db, client_ip=self.client_ip)
 
-            serializable_data = self._make_json_serializable(request_data)
+        fortune_result = self.save_generated_result(service_code, user_key, request_data, result_text, share_code)
+        return fortune_result, saju_data
 
-            # share_code가 없으면 생성
-            if not share_code:
-                share_code = self._generate_unique_share_code()
+    def prepare_generation(self, service_code: str, request_data: dict) -> tuple[str, Optional[Dict]]:
+        """
+        AI 호출 전 준비 (서비스 설정 확인, 사주 계산, 프롬프트 생성)
 
-            fortune_result = FortuneResult(
-                service_code=service_code,
-                user_key=user_key,
-                share_code=share_code,
-                date=date.today(),
-                request_payload=serializable_data,
-                result_text=result_text,
-                status="completed",
-                is_from_cache=False
-            )
+        Args:
+            service_code: 서비스 코드
+            request_data: 요청 데이터 (사주 데이터 등이 추가됨)
 
-            self.db.add(fortune_result)
-            self.db.commit()
-            self.db.refresh(fortune_result)
+        Returns:
+            (프롬프트, 사주 데이터 또는 None)
+        """
+        saju_data = None
 
-            return fortune_result, saju_data
+        # 2026 신년운세는 별도 처리
+        if service_code == "newyear2026":
+            return self.build_newyear2026_prompt(request_data), saju_data
 
         # 서비스 설정 조회
         service_config = self.db.query(FortuneServiceConfig).filter(
@@ -160,14 +246,13 @@ class FortuneService:
 
         # 사주 서비스인 경우 사주 계산
         if service_code == "saju":
-            calculator = SajuCalculator()
             birthdate = datetime.fromisoformat(str(request_data["birthdate"])).date()
             birth_time = request_data.get("birth_time")
             calendar_type = request_data.get("calendar", "solar")
             gender = request_data["gender"]
             name = request_data.get("name", "고객")
 
-            saju_data = calculator.calculate_saju(
+            saju_data = saju_cache.calculate_saju(
                 birthdate=birthdate,
                 birth_time=birth_time,
                 calendar_type=calendar_type,
@@ -181,18 +266,41 @@ class FortuneService:
             request_data["saju_data"] = saju_data
 
         # 프롬프트 생성
-        prompt = self.build_prompt(service_code, service_config, request_data)
+        return self.build_prompt(service_code, service_config, request_data), saju_data
 
-        # Gemini API 호출
-        result_text = gemini_service.generate_content(prompt, service_code=service_code, db=self.db, client_ip=self.client_ip)
+    def save_generated_result(
+        self,
+        service_code: str,
+        user_key: str,
+        request_data: dict,
+        result_text: str,
+        share_code: str = None
+    ) -> FortuneResult:
+        """
+        AI 응답을 운세 결과로 저장
 
+        share_code로 선점한 레코드(claim_generation)가 있으면 그 레코드를 채우고, 없으면 새로
+        넣습니다. 새로 넣다가 같은 (서비스, 사용자 키, 날짜) 레코드와 충돌하면 먼저 저장된
+        레코드를 돌려줍니다.
+        """
         # request_data를 JSON 직렬화 가능하게 변환 (date 객체를 문자열로)
         serializable_data = self._make_json_serializable(request_data)
 
-        # share_code가 없으면 생성
-        if not share_code:
+        claim = None
+        if share_code:
+            claim = self.db.query(FortuneResult).filter(FortuneResult.share_code == share_code).first()
+        else:
             share_code = self._generate_unique_share_code()
 
+        if claim is not None:
+            claim.request_payload = serializable_data
+            claim.result_text = result_text
+            claim.status = "completed"
+            claim.error_message = None
+            self.db.commit()
+            self.db.refresh(claim)
+            return claim
+
         # DB 저장
         fortune_result = FortuneResult(
             service_code=service_code,
@@ -206,10 +314,28 @@ class FortuneService:
         )
 
         self.db.add(fortune_result)
-        self.db.commit()
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # 다른 요청(다른 워커 프로세스 포함)이 먼저 저장 - 그 결과 사용
+            self.db.rollback()
+            winner = self.db.query(FortuneResult).filter(
+                FortuneResult.service_code == service_code,
+                FortuneResult.user_key == user_key,
+                FortuneResult.date == fortune_result.date
+            ).first()
+            if winner is None:
+                raise
+            if winner.result_text is None:
+                # 먼저 선점한 작업이 아직 생성 중이면 이 결과로 채움
+                winner.result_text = result_text
+                winner.status = "completed"
+                self.db.commit()
+                self.db.refresh(winner)
+            return winner
         self.db.refresh(fortune_result)
 
-        return fortune_result, saju_data
+        return fortune_result
 
     def _make_json_serializable(self, data: dict) -> dict:
         """
@@ -251,97 +377,151 @@ class FortuneService:
         # user_key 생성
         user_key = self.generate_user_key(service_code, request_data)
 
+        # 캐시 조회
+        result = self.find_cached_fortune(service_code, user_key, request_data, share_code)
+        if result is not None:
+            return result
+
+        # 새로 생성
+        new_result, saju_data = self.create_fortune_result(service_code, user_key, request_data, share_code=share_code)
+        return self._build_new_result(service_code, request_data, new_result, saju_data)
+
+    async def get_or_create_fortune_async(
+        self,
+        service_code: str,
+        request_data: dict,
+        share_code: str = None,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> Dict:
+        """
+        get_or_create_fortune의 비동기 버전
+
+        AI 호출은 이벤트 루프에서 기다리고, DB 조회/저장과 사주 계산만 스레드에서 실행하므로
+        응답을 기다리는 동안 워커 스레드를 잡지 않습니다. 세션(self.db)은 한 번에 한 작업만 씁니다.
+        on_chunk가 있으면 스트리밍으로 생성하며 받은 텍스트 조각마다 호출합니다.
+        """
+        user_key = self.generate_user_key(service_code, request_data)
+
+        result = await asyncio.to_thread(self.find_cached_fortune, service_code, user_key, request_data, share_code)
+        if result is not None:
+            return result
+
+        prompt, saju_data = await asyncio.to_thread(self.prepare_generation, service_code, request_data)
+        if on_chunk is None:
+            result_text = await gemini_service.generate_content_async(
+                prompt, service_code=service_code, db=self.db, client_ip=self.client_ip
+            )
+        else:
+            result_text = await gemini_service.stream_content_async(
+                prompt, on_chunk, service_code=service_code, db=self.db, client_ip=self.client_ip
+            )
+        new_result = await asyncio.to_thread(
+            self.save_generated_result, service_code, user_key, request_data, result_text, share_code
+        )
+        return self._build_new_result(service_code, request_data, new_result, saju_data)
+
+    def find_cached_fortune(
+        self,
+        service_code: str,
+        user_key: str,
+        request_data: dict,
+        share_code: str = None
+    ) -> Optional[Dict]:
+        """
+        오늘 캐시된 운세가 있으면 결과 딕셔너리 (share_code가 있으면 공유용 레코드 추가), 없으면 None
+        """
         # 오늘 날짜
         today = date.today()
 
-        # 캐시 조회
         cached = self.find_cached_result(service_code, user_key, today)
+        if not cached:
+            return None
 
-        if cached:
-            # share_code가 전달되었으면 새 레코드 생성 (공유용)
-            if share_code:
-                new_record = FortuneResult(
-                    service_code=service_code,
-                    user_key=user_key,
-                    share_code=share_code,
-                    date=today,
-                    request_payload=cached.request_payload,
-                    result_text=cached.result_text,
-                    status="completed",
-                    is_from_cache=True
-                )
-                self.db.add(new_record)
-                self.db.commit()
-                self.db.refresh(new_record)
-
-                result = {
-                    "id": new_record.id,
-                    "share_code": new_record.share_code,
-                    "service_code": service_code,
-                    "is_cached": True,
-                    "result_text": cached.result_text,
-                    "date": cached.date
-                }
-            else:
-                # share_code가 없으면 캐시된 레코드 그대로 사용
-                result = {
-                    "id": cached.id,
-                    "share_code": cached.share_code,
-                    "service_code": service_code,
-                    "is_cached": True,
-                    "result_text": cached.result_text,
-                    "date": cached.date
-                }
-
-            # 캐시된 결과의 경우 사주 서비스면 다시 계산
-            if service_code == "saju":
-                calculator = SajuCalculator()
-                birthdate = datetime.fromisoformat(str(request_data["birthdate"])).date()
-                birth_time = request_data.get("birth_time")
-                calendar_type = request_data.get("calendar", "solar")
-                gender = request_data["gender"]
-                name = request_data.get("name", "고객")
-
-                saju_data = calculator.calculate_saju(
-                    birthdate=birthdate,
-                    birth_time=birth_time,
-                    calendar_type=calendar_type,
-                    gender=gender
-                )
-
-                # 이름을 사주 데이터에 추가
-                saju_data["name"] = name
-
-                result["saju_data"] = saju_data
-
-            # 오늘의 운세인 경우 daily_fortune_info 추가 (캐시에서도 계산)
-            if service_code == "today":
-                calculator = SajuCalculator()
-                daily_info = calculator.get_daily_fortune_info(today)
-                result["daily_fortune_info"] = daily_info
-
-            # 궁합인 경우 compatibility_info 추가 (캐시에서도 계산)
-            if service_code == "match":
-                calculator = SajuCalculator()
-                birthdate_obj = datetime.fromisoformat(str(request_data["birthdate"])).date()
-                partner_birthdate_obj = datetime.fromisoformat(str(request_data["partner_birthdate"])).date()
-                compatibility = calculator.calculate_compatibility(
-                    birthdate_obj, request_data["gender"],
-                    partner_birthdate_obj, request_data["partner_gender"]
-                )
-                result["compatibility_info"] = compatibility
-
-            # 신년운세인 경우 year_fortune_info 추가 (캐시에서도 계산)
-            if service_code == "newyear2026":
-                calculator = SajuCalculator()
-                year_info = calculator.get_year_fortune_info(2026)
-                result["year_fortune_info"] = year_info
+        # share_code가 전달되었으면 새 레코드 생성 (공유용)
+        if share_code:
+            new_record = FortuneResult(
+                service_code=service_code,
+                user_key=user_key,
+                share_code=share_code,
+                date=today,
+                request_payload=cached.request_payload,
+                result_text=cached.result_text,
+                status="completed",
+                is_from_cache=True
+            )
+            self.db.add(new_record)
+            self.db.commit()
+            self.db.refresh(new_record)
+
+            result = {
+                "id": new_record.id,
+                "share_code": new_record.share_code,
+                "service_code": service_code,
+                "is_cached": True,
+                "result_text": cached.result_text,
+                "date": cached.date
+            }
+        else:
+            # share_code가 없으면 캐시된 레코드 그대로 사용
+            result = {
+                "id": cached.id,
+                "share_code": cached.share_code,
+                "service_code": service_code,
+                "is_cached": True,
+                "result_text": cached.result_text,
+                "date": cached.date
+            }
+
+        # 캐시된 결과의 경우 사주 서비스면 다시 계산
+        if service_code == "saju":
+            birthdate = datetime.fromisoformat(str(request_data["birthdate"])).date()
+            birth_time = request_data.get("birth_time")
+            calendar_type = request_data.get("calendar", "solar")
+            gender = request_data["gender"]
+            name = request_data.get("name", "고객")
 
-            return result
+            saju_data = saju_cache.calculate_saju(
+                birthdate=birthdate,
+                birth_time=birth_time,
+                calendar_type=calendar_type,
+                gender=gender
+            )
 
-        # 새로 생성
-        new_result, saju_data = self.create_fortune_result(service_code, user_key, request_data, share_code=share_code)
+            # 이름을 사주 데이터에 추가
+            saju_data["name"] = name
+
+            result["saju_data"] = saju_data
+
+        # 오늘의 운세인 경우 daily_fortune_info 추가 (캐시에서도 계산)
+        if service_code == "today":
+            daily_info = daily_fortune_cache.get_daily_fortune_info(today)
+            result["daily_fortune_info"] = daily_info
 
+        # 궁합인 경우 compatibility_info 추가 (캐시에서도 계산)
+        if service_code == "match":
+            birthdate_obj = datetime.fromisoformat(str(request_data["birthdate"])).date()
+            partner_birthdate_obj = datetime.fromisoformat(str(request_data["partner_birthdate"])).date()
+            compatibility = saju_calculator.calculate_compatibility(
+                birthdate_obj, request_data["gender"],
+                partner_birthdate_obj, request_data["partner_gender"]
+            )
+            result["compatibility_info"] = compatibility
+
+        # 신년운세인 경우 year_fortune_info 추가 (캐시에서도 계산)
+        if service_code == "newyear2026":
+            year_info = daily_fortune_cache.get_year_fortune_info(2026)
+            result["year_fortune_info"] = year_info
+
+        return result
+
+    def _build_new_result(
+        self,
+        service_code: str,
+        request_data: dict,
+        new_result: FortuneResult,
+        saju_data: Optional[Dict]
+    ) -> Dict:
+        """새로 생성한 운세 결과 → 결과 딕셔너리"""
         result = {
             "id": new_result.id,
             "share_code": new_result.share_code,
@@ -459,20 +639,24 @@ class FortuneService:
         calendar_text = "양력" if calendar == "solar" else "음력"
         year = int(str(birthdate)[:4])
         zodiac = get_zodiac(year)
-        today_str = date.today().strftime("%Y년 %m월 %d일")
-
-        calculator = SajuCalculator()
+        today = date.today()
+        today_str = today.strftime("%Y년 %m월 %d일")
 
-        # 본인 사주팔자 계산
+        # 본인 원국 (캐시된 차트) - 프롬프트에는 기둥, 오행, 신강신약만 쓰므로 해당 섹션만 계산
         birthdate_obj = datetime.fromisoformat(str(birthdate)).date()
-        saju_data = calculator.calculate_saju(birthdate_obj, birth_time, calendar, data["gender"])
+        chart = saju_cache.get_chart(birthdate_obj, birth_time, calendar, data["gender"])
+        saju_data = chart.to_dict(sections=('pillars', 'ohang', 'strength'))
+
+        # 오늘 일진과 원국의 관계만 계산
+        daily_delta = saju_calculator.daily_delta(chart, today)
 
         # 오늘의 길흉일 정보 계산
-        daily_info = calculator.get_daily_fortune_info(date.today())
+        daily_info = daily_fortune_cache.get_daily_fortune_info(today)
 
         # 계산된 데이터를 data에 추가 (결과 화면에서 사용)
         data['daily_fortune_info'] = daily_info
         data['saju_data'] = saju_data
+        data['daily_delta'] = daily_delta.to_dict()
 
         # 사주 정보 텍스트 구성
         pillars = saju_data['pillars']
@@ -484,7 +668,14 @@ class FortuneService:
 - 시주(時柱): {pillars['cheongan'][0]}{pillars['jiji'][0]}
 - 오행 분포: {saju_data['ohang']}
 - 신강신약: {saju_data['strength']}
+
+[오늘 일진({daily_delta.gan}{daily_delta.ji})과 본인 사주의 관계]
+- 오늘 천간의 십성: {daily_delta.sipsung} / 오늘 지지의 십성: {daily_delta.sipsung_jiji}
+- 일간의 십이운성: {daily_delta.sipiunsung}
+- 합충형해: {data['daily_delta']['summary']}
 """
+        for relation in data['daily_delta']['relations']:
+            saju_info += f"  · {relation['description']}\n"
 
         return template.format(
             character_name=config.character_name,
@@ -643,18 +834,25 @@ class FortuneService:
         partner_calendar = data.get("partner_calendar", "solar")
         partner_calendar_text = "양력" if partner_calendar == "solar" else "음력"
 
-        calculator = SajuCalculator()
         birthdate_obj = datetime.fromisoformat(str(birthdate)).date()
         partner_birthdate_obj = datetime.fromisoformat(str(partner_birthdate)).date()
 
+        # 궁합 프롬프트에 쓰는 섹션만 계산 (대운, 용신 제외)
+        match_sections = ('pillars', 'ohang', 'strength', 'hap_chung_hyeong_pa_hae', 'sinsals')
+
         # 본인 사주 계산
-        person1_saju = calculator.calculate_saju(birthdate_obj, birth_time, calendar, data["gender"])
+        person1_saju = saju_cache.calculate_saju(
+            birthdate_obj, birth_time, calendar, data["gender"], sections=match_sections
+        )
 
         # 상대방 사주 계산
-        person2_saju = calculator.calculate_saju(partner_birthdate_obj, partner_birth_time, partner_calendar, data["partner_gender"])
+        person2_saju = saju_cache.calculate_saju(
+            partner_birthdate_obj, partner_birth_time, partner_calendar, data["partner_gender"],
+            sections=match_sections
+        )
 
         # 궁합 분석 계산
-        compatibility = calculator.calculate_compatibility(
+        compatibility = saju_calculator.calculate_compatibility(
             birthdate_obj, data["gender"],
             partner_birthdate_obj, data["partner_gender"]
         )
@@ -791,8 +989,7 @@ class FortuneService:
         zodiac = get_zodiac(year)
 
         # 2026년 간지 및 길일 정보 계산
-        calculator = SajuCalculator()
-        year_info = calculator.get_year_fortune_info(2026)
+        year_info = daily_fortune_cache.get_year_fortune_info(2026)
 
         # 계산된 데이터를 data에 추가 (결과 화면에서 사용)
         data['year_fortune_info'] = year_info
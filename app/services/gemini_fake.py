@@ -0,0 +1,69 @@
+"""
+가짜 Gemini 모델 (개발/테스트용)
+
+GEMINI_FAKE=True이면 GeminiService의 비동기 HTTP 클라이언트가 실제 API 대신 이 전송 계층을
+씁니다. generateContent는 전체 응답을, streamGenerateContent(alt=sse)는 같은 텍스트를 조각으로
+나눠 일정 간격으로 흘려보내므로 API 키 없이 스트리밍 화면과 작업 큐를 확인할 수 있습니다.
+"""
+import asyncio
+import json
+from typing import AsyncIterator, Dict
+
+import httpx
+
+FAKE_TEXT = (
+    "## 총평\n\n"
+    "오늘은 맑은 물이 바위를 돌아 흐르듯, 서두르지 않아도 일이 제자리를 찾아가는 날입니다. "
+    "작은 약속을 지키는 것이 큰 신뢰로 돌아옵니다.\n\n"
+    "## 재물운\n\n"
+    "들어오는 돈보다 새는 돈을 살피면 좋습니다. 충동적인 결제는 하루만 미뤄 보세요.\n\n"
+    "## 애정운\n\n"
+    "먼저 건네는 안부 한마디가 관계의 온도를 높입니다.\n\n"
+    "## 건강운\n\n"
+    "물을 자주 마시고, 저녁에는 가벼운 산책으로 기운을 고르세요.\n"
+)
+
+
+def _response_json(text: str, prompt_chars: int, done: bool) -> Dict:
+    data = {'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}}]}
+    if done:
+        # 실제 API처럼 마지막 조각에 사용량 포함 (글자 수로 대충 추정)
+        completion_tokens = len(FAKE_TEXT) // 2
+        data['usageMetadata'] = {
+            'promptTokenCount': prompt_chars // 2,
+            'candidatesTokenCount': completion_tokens,
+            'totalTokenCount': prompt_chars // 2 + completion_tokens
+        }
+    return data
+
+
+def fake_transport(text: str = FAKE_TEXT, chunk_chars: int = 24, delay: float = 0.05) -> httpx.MockTransport:
+    """
+    Gemini REST API를 흉내 내는 httpx 전송 계층
+
+    Args:
+        text: 응답 텍스트
+        chunk_chars: 스트리밍 조각 크기 (글자)
+        delay: 조각 사이 간격 (초)
+    """
+    async def stream_body(prompt_chars: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(text), chunk_chars):
+            await asyncio.sleep(delay)
+            done = start + chunk_chars >= len(text)
+            payload = _response_json(text[start:start + chunk_chars], prompt_chars, done)
+            yield f"data: {json.dumps(payload, ensure_ascii=False)}\r\n\r\n".encode('utf-8')
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b'{}')
+        prompt_chars = sum(len(part.get('text', ''))
+                           for content in body.get('contents', []) for part in content.get('parts', []))
+
+        if request.url.path.endswith(':streamGenerateContent'):
+            return httpx.Response(200, headers={'content-type': 'text/event-stream'},
+                                  content=stream_body(prompt_chars))
+        if request.url.path.endswith(':generateContent'):
+            await asyncio.sleep(delay * (len(text) // chunk_chars + 1))
+            return httpx.Response(200, json=_response_json(text, prompt_chars, True))
+        return httpx.Response(404, json={'error': {'message': f'unknown path: {request.url.path}'}})
+
+    return httpx.MockTransport(handler)
@@ -1,10 +1,18 @@
 """
 Gemini API 서비스
+
+동기 경로(generate_content)는 google-generativeai SDK를 쓰고, 비동기 경로(generate_content_async)는
+REST API를 httpx.AsyncClient로 직접 호출합니다. 비동기 클라이언트는 이벤트 루프마다 하나를 만들어
+연결(keep-alive)을 재사용하고, 재시도 대기는 asyncio.sleep이라 대기 중에 스레드를 잡지 않습니다.
 """
 import google.generativeai as genai
+import asyncio
+import httpx
+import json
+import random
 import time
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Callable, Dict, List, Optional, Tuple
 from app.config import get_settings
 
 settings = get_settings()
@@ -20,6 +28,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 생성 설정 (SDK 형식, REST 호출 시 camelCase로 변환)
+GENERATION_CONFIG = {
+    "temperature": 0.8,
+    "top_k": 40,
+    "top_p": 0.95,
+    "max_output_tokens": 2048,
+}
+
+# 재시도할 HTTP 상태 코드 (요청 한도 초과, 일시적 서버 오류)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class GeminiAPIError(Exception):
+    """Gemini REST 호출 실패 (retryable이면 재시도 대상)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _camel_case(name: str) -> str:
+    head, *rest = name.split('_')
+    return head + ''.join(part.title() for part in rest)
+
 
 class GeminiService:
     """Gemini API 래퍼"""
@@ -31,6 +66,14 @@ class GeminiService:
         self.max_retries = 3
         self.retry_delay = 2  # 초
 
+        # 비동기 경로 설정
+        self.request_timeout = 60      # 시도 한 번의 응답 대기 (초)
+        self.deadline = 150            # 재시도를 포함한 호출 전체 기한 (초)
+        self.max_retry_delay = 16      # 지수 백오프 상한 (초)
+        self.max_connections = 200     # 연결 풀 크기 (동시에 진행 중인 생성 수 상한)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
     def generate_content(self, prompt: str, service_code: Optional[str] = None, db=None, client_ip: Optional[str] = None) -> str:
         """
         Gemini API 호출하여 텍스트 생성 (재시도 로직 포함)
@@ -51,15 +94,7 @@ class GeminiService:
             try:
                 logger.info(f"[{service_code}] Gemini API 호출 시작 (시도 {attempt}/{self.max_retries})")
 
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config={
-                        "temperature": 0.8,
-                        "top_k": 40,
-                        "top_p": 0.95,
-                        "max_output_tokens": 2048,
-                    }
-                )
+                response = self.model.generate_content(prompt, generation_config=GENERATION_CONFIG)
 
                 # 응답 검증
                 if not response or not response.text:
@@ -67,100 +102,297 @@ class GeminiService:
 
                 logger.info(f"[{service_code}] Gemini API 호출 성공 (응답 길이: {len(response.text)}자)")
 
-                # 응답 시간 계산
-                response_time_ms = int((time.time() - start_time) * 1000)
-
                 # API 사용 로깅 (DB가 있고 service_code가 있는 경우만)
                 if db and service_code:
-                    try:
-                        from app.utils.logger import Logger
-                        db_logger = Logger(db)
-
-                        # 토큰 사용량 추출 (Gemini API response에서)
-                        prompt_tokens = None
-                        completion_tokens = None
-                        total_tokens = None
-                        estimated_cost = 0.0
-
-                        if hasattr(response, 'usage_metadata'):
-                            usage = response.usage_metadata
-                            prompt_tokens = getattr(usage, 'prompt_token_count', None)
-                            completion_tokens = getattr(usage, 'candidates_token_count', None)
-                            total_tokens = getattr(usage, 'total_token_count', None)
-
-                            # 비용 계산 (Gemini 2.0 Flash 기준)
-                            # Input: $0.075 per 1M tokens
-                            # Output: $0.30 per 1M tokens
-                            if prompt_tokens and completion_tokens:
-                                estimated_cost = (prompt_tokens * 0.075 / 1_000_000) + (completion_tokens * 0.30 / 1_000_000)
-
-                        db_logger.log_api_usage(
-                            model=settings.gemini_model,
-                            service_code=service_code,
-                            prompt_tokens=prompt_tokens,
-                            completion_tokens=completion_tokens,
-                            total_tokens=total_tokens,
-                            estimated_cost=estimated_cost,
-                            response_time_ms=response_time_ms,
-                            is_cached=False,
-                            cache_hit=False,
-                            client_ip=client_ip
-                        )
-                    except Exception as log_error:
-                        # 로깅 실패는 무시 (메인 기능에 영향 주지 않음)
-                        logger.warning(f"[{service_code}] API usage logging failed: {log_error}")
+                    # 토큰 사용량 추출 (Gemini API response에서)
+                    usage = getattr(response, 'usage_metadata', None)
+                    token_counts = (
+                        getattr(usage, 'prompt_token_count', None),
+                        getattr(usage, 'candidates_token_count', None),
+                        getattr(usage, 'total_token_count', None)
+                    )
+                    self._log_usage(db, service_code, client_ip, token_counts, int((time.time() - start_time) * 1000))
 
                 return response.text
 
             except Exception as e:
                 last_error = e
-                error_msg = str(e)
-                error_type = type(e).__name__
 
                 # 마지막 시도가 아니면 재시도
                 if attempt < self.max_retries:
                     logger.warning(
                         f"[{service_code}] Gemini API 호출 실패 (시도 {attempt}/{self.max_retries})\n"
-                        f"  에러 타입: {error_type}\n"
-                        f"  에러 메시지: {error_msg}\n"
+                        f"  에러 타입: {type(e).__name__}\n"
+                        f"  에러 메시지: {e}\n"
                         f"  {self.retry_delay}초 후 재시도..."
                     )
                     time.sleep(self.retry_delay)
                     continue
-                else:
-                    # 모든 재시도 실패
-                    logger.error(
-                        f"[{service_code}] Gemini API 호출 최종 실패 ({self.max_retries}회 시도)\n"
-                        f"  에러 타입: {error_type}\n"
-                        f"  에러 메시지: {error_msg}\n"
-                        f"  클라이언트 IP: {client_ip}"
-                    )
 
-                    # DB에 에러 로깅
-                    if db:
-                        try:
-                            from app.utils.logger import Logger
-                            error_logger = Logger(db)
-                            error_logger.log_error(
-                                error_type=f"GeminiAPI_{error_type}",
-                                error_message=f"[{service_code}] {error_msg}",
-                                stack_trace=None,
-                                url=None,
-                                method="AI_GENERATE",
-                                client_ip=client_ip,
-                                user_agent=f"Gemini API ({service_code})"
-                            )
-                        except Exception as log_error:
-                            logger.warning(f"에러 로깅 실패: {log_error}")
-
-        # 모든 시도 실패 시
+        raise self._final_error(db, service_code, client_ip, last_error, self.max_retries)
+
+    async def generate_content_async(self, prompt: str, service_code: Optional[str] = None, db=None,
+                                     client_ip: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """
+        generate_content의 비동기 버전 (REST API, 연결 재사용)
+
+        요청 한도 초과/일시적 서버 오류/연결 오류만 재시도하고, 대기 시간은 지수 백오프에
+        지터를 섞어 정합니다 (429 응답의 Retry-After가 있으면 따름). 재시도를 포함한 전체
+        호출이 deadline 초를 넘거나 작업이 취소되면 진행 중인 요청도 함께 중단됩니다.
+
+        Args:
+            prompt: 입력 프롬프트
+            service_code: 서비스 코드 (로깅용)
+            db: DB 세션 (로깅용, 로그 쓰기는 스레드에서 실행)
+            client_ip: 클라이언트 IP (로깅용)
+            deadline: 전체 기한 (초, 기본 self.deadline)
+
+        Returns:
+            생성된 텍스트
+        """
+        return await self._generate_async(prompt, None, service_code, db, client_ip, deadline)
+
+    async def stream_content_async(self, prompt: str, on_chunk: Callable[[str], None],
+                                   service_code: Optional[str] = None, db=None,
+                                   client_ip: Optional[str] = None, deadline: Optional[float] = None) -> str:
+        """
+        스트리밍 생성 (streamGenerateContent) - 받은 조각마다 on_chunk를 호출하고 전체 텍스트 반환
+
+        재시도/기한 규칙은 generate_content_async와 같지만, 조각을 하나라도 넘긴 뒤의 실패는
+        같은 내용이 두 번 나가지 않도록 재시도하지 않습니다.
+        """
+        return await self._generate_async(prompt, on_chunk, service_code, db, client_ip, deadline)
+
+    async def _generate_async(self, prompt: str, on_chunk: Optional[Callable[[str], None]],
+                              service_code: Optional[str], db, client_ip: Optional[str],
+                              deadline: Optional[float]) -> str:
+        last_error = None
+        attempts = 0
+        delivered = False
+        start_time = time.monotonic()
+
+        def forward(text: str):
+            nonlocal delivered
+            delivered = True
+            on_chunk(text)
+
+        try:
+            async with asyncio.timeout(deadline or self.deadline):
+                for attempt in range(1, self.max_retries + 1):
+                    attempts = attempt
+                    try:
+                        logger.info(f"[{service_code}] Gemini API 비동기 호출 시작 (시도 {attempt}/{self.max_retries})")
+                        if on_chunk is None:
+                            text, token_counts = await self._request(prompt)
+                        else:
+                            text, token_counts = await self._stream_request(prompt, forward)
+                        logger.info(f"[{service_code}] Gemini API 호출 성공 (응답 길이: {len(text)}자)")
+
+                        if db and service_code:
+                            response_time_ms = int((time.monotonic() - start_time) * 1000)
+                            await asyncio.to_thread(self._log_usage, db, service_code, client_ip,
+                                                    token_counts, response_time_ms)
+                        return text
+
+                    except (GeminiAPIError, httpx.TransportError) as e:
+                        last_error = e
+                        if attempt >= self.max_retries or delivered or not getattr(e, 'retryable', True):
+                            break
+
+                        delay = self._backoff_delay(attempt, getattr(e, 'retry_after', None))
+                        logger.warning(
+                            f"[{service_code}] Gemini API 호출 실패 (시도 {attempt}/{self.max_retries})\n"
+                            f"  에러 타입: {type(e).__name__}\n"
+                            f"  에러 메시지: {e}\n"
+                            f"  {delay:.1f}초 후 재시도..."
+                        )
+                        await asyncio.sleep(delay)
+
+        except TimeoutError:
+            message = f"{deadline or self.deadline}초 안에 응답을 받지 못했습니다"
+            last_error = TimeoutError(f"{message} (마지막 오류: {last_error})" if last_error else message)
+
+        raise await asyncio.to_thread(self._final_error, db, service_code, client_ip, last_error, attempts)
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """attempt번째 실패 후 대기 시간 (지수 백오프 값의 절반~전체 사이 균등 지터, Retry-After 우선)"""
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_delay)
+        ceiling = min(self.max_retry_delay, self.retry_delay * 2 ** (attempt - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프의 공용 HTTP 클라이언트 (루프가 바뀌면 새로 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop or self._client.is_closed:
+            transport = None
+            if settings.gemini_fake:
+                # 개발/테스트용 가짜 모델 (실제 API를 호출하지 않음)
+                from app.services.gemini_fake import fake_transport
+                transport = fake_transport()
+            self._client = httpx.AsyncClient(
+                base_url=settings.gemini_api_url.rstrip('/') + '/',
+                headers={'x-goog-api-key': settings.gemini_api_key},
+                timeout=httpx.Timeout(self.request_timeout, connect=10),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                transport=transport
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def aclose(self):
+        """비동기 HTTP 클라이언트 종료 (앱 종료 시 호출)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    @staticmethod
+    def _request_body(prompt: str) -> Dict:
+        return {
+            'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+            'generationConfig': {_camel_case(key): value for key, value in GENERATION_CONFIG.items()}
+        }
+
+    @staticmethod
+    def _status_error(response: httpx.Response) -> GeminiAPIError:
+        retry_after = response.headers.get('retry-after')
+        return GeminiAPIError(
+            f"HTTP {response.status_code}: {response.text[:500]}",
+            status_code=response.status_code,
+            retryable=response.status_code in RETRYABLE_STATUS_CODES,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None
+        )
+
+    @staticmethod
+    def _parse_response(data: Dict) -> Tuple[str, Optional[str], Tuple[Optional[int], Optional[int], Optional[int]]]:
+        """GenerateContentResponse → (텍스트, 차단 사유, 토큰 수)"""
+        candidates = data.get('candidates') or [{}]
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        text = ''.join(part.get('text', '') for part in parts)
+        block_reason = (data.get('promptFeedback') or {}).get('blockReason')
+        usage = data.get('usageMetadata') or {}
+        return text, block_reason, (usage.get('promptTokenCount'), usage.get('candidatesTokenCount'),
+                                    usage.get('totalTokenCount'))
+
+    @staticmethod
+    def _empty_error(block_reason: Optional[str]) -> GeminiAPIError:
+        return GeminiAPIError(f"AI 응답이 비어있습니다 (차단 사유: {block_reason})" if block_reason
+                              else "AI 응답이 비어있습니다")
+
+    async def _request(self, prompt: str) -> Tuple[str, Tuple[Optional[int], Optional[int], Optional[int]]]:
+        """generateContent REST 호출 한 번 → (텍스트, (입력, 출력, 전체) 토큰 수)"""
+        response = await self._get_client().post(f"/{settings.gemini_model}:generateContent",
+                                                 json=self._request_body(prompt))
+        if response.status_code != 200:
+            raise self._status_error(response)
+
+        try:
+            data = response.json()
+        except ValueError as e:
+            raise GeminiAPIError(f"응답을 해석할 수 없습니다: {e}")
+
+        text, block_reason, token_counts = self._parse_response(data)
+        if not text:
+            raise self._empty_error(block_reason)
+        return text, token_counts
+
+    async def _stream_request(self, prompt: str, on_chunk: Callable[[str], None]
+                              ) -> Tuple[str, Tuple[Optional[int], Optional[int], Optional[int]]]:
+        """streamGenerateContent(SSE) 호출 한 번 - 조각마다 on_chunk 호출 → (전체 텍스트, 토큰 수)"""
+        parts: List[str] = []
+        block_reason = None
+        token_counts = (None, None, None)
+
+        async with self._get_client().stream('POST', f"/{settings.gemini_model}:streamGenerateContent",
+                                             params={'alt': 'sse'}, json=self._request_body(prompt)) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise self._status_error(response)
+
+            async for line in response.aiter_lines():
+                if not line.startswith('data:'):
+                    continue
+                try:
+                    data = json.loads(line[5:])
+                except ValueError as e:
+                    raise GeminiAPIError(f"응답을 해석할 수 없습니다: {e}")
+
+                text, block_reason, counts = self._parse_response(data)
+                if any(count is not None for count in counts):
+                    token_counts = counts  # 사용량은 조각마다 누적값으로 옴
+                if text:
+                    parts.append(text)
+                    on_chunk(text)
+
+        if not parts:
+            raise self._empty_error(block_reason)
+        return ''.join(parts), token_counts
+
+    def _log_usage(self, db, service_code: str, client_ip: Optional[str],
+                   token_counts: Tuple[Optional[int], Optional[int], Optional[int]], response_time_ms: int):
+        """API 사용량 DB 로깅 (실패는 무시 - 메인 기능에 영향 주지 않음)"""
+        try:
+            from app.utils.logger import Logger
+            prompt_tokens, completion_tokens, total_tokens = token_counts
+
+            # 비용 계산 (Gemini 2.0 Flash 기준)
+            # Input: $0.075 per 1M tokens
+            # Output: $0.30 per 1M tokens
+            estimated_cost = 0.0
+            if prompt_tokens and completion_tokens:
+                estimated_cost = (prompt_tokens * 0.075 / 1_000_000) + (completion_tokens * 0.30 / 1_000_000)
+
+            Logger(db).log_api_usage(
+                model=settings.gemini_model,
+                service_code=service_code,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=total_tokens,
+                estimated_cost=estimated_cost,
+                response_time_ms=response_time_ms,
+                is_cached=False,
+                cache_hit=False,
+                client_ip=client_ip
+            )
+        except Exception as log_error:
+            logger.warning(f"[{service_code}] API usage logging failed: {log_error}")
+
+    def _final_error(self, db, service_code: Optional[str], client_ip: Optional[str],
+                     last_error: Optional[Exception], attempts: int) -> Exception:
+        """모든 시도 실패 → 로그/DB 에러 기록 후 호출자에게 올릴 예외"""
+        error_type = type(last_error).__name__
+        logger.error(
+            f"[{service_code}] Gemini API 호출 최종 실패 ({attempts}회 시도)\n"
+            f"  에러 타입: {error_type}\n"
+            f"  에러 메시지: {last_error}\n"
+            f"  클라이언트 IP: {client_ip}"
+        )
+
+        # DB에 에러 로깅
+        if db:
+            try:
+                from app.utils.logger import Logger
+                Logger(db).log_error(
+                    error_type=f"GeminiAPI_{error_type}",
+                    error_message=f"[{service_code}] {last_error}",
+                    stack_trace=None,
+                    url=None,
+                    method="AI_GENERATE",
+                    client_ip=client_ip,
+                    user_agent=f"Gemini API ({service_code})"
+                )
+            except Exception as log_error:
+                logger.warning(f"에러 로깅 실패: {log_error}")
+
         final_error = Exception(
             f"AI 운세 생성에 실패했습니다. "
-            f"({self.max_retries}회 시도 후 실패)\n"
+            f"({attempts}회 시도 후 실패)\n"
             f"오류: {str(last_error)}"
         )
         logger.critical(f"[{service_code}] 최종 에러 발생: {final_error}")
-        raise final_error
+        return final_error
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,206 @@
+"""
+AI 운세 생성 작업 큐
+
+운세 생성 요청을 프로세스 안의 큐에 넣고, 정해진 수의 작업자(asyncio 작업)가 꺼내 실행합니다.
+대기 작업이 상한을 넘으면 submit이 QueueFullError를 올리므로 라우터는 요청을 쌓아 두지 않고
+바로 '잠시 후 다시' 안내를 보여 줄 수 있습니다.
+
+서비스별 동시 실행 상한이 있으면, 상한에 걸린 서비스의 작업은 작업자를 붙잡지 않고 서비스별
+대기열로 옮겨 두었다가 같은 서비스 작업이 끝날 때 이어서 실행합니다. 그래서 한 서비스에 요청이
+몰려도 다른 서비스 작업은 계속 진행됩니다.
+
+같은 요청의 중복 생성은 큐가 아니라 운세 생성 라우터가 DB 선점(FortuneService.claim_generation)으로
+막습니다 (워커 프로세스 사이 포함).
+
+앱 종료 시 drain()이 새 작업을 받지 않고 남은 작업이 끝나기를 기다린 뒤 작업자를 멈춥니다.
+
+큐와 상한은 uvicorn 워커 프로세스마다 따로 있으므로, 서버 전체의 동시 실행/대기 상한은
+설정값 × 워커 수입니다 (DEPLOYMENT.md의 --workers와 함께 조정).
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 대기/실행 시간 통계에 쓰는 최근 작업 수
+METRICS_WINDOW = 1000
+
+
+class QueueFullError(Exception):
+    """대기 작업이 상한에 도달했거나 종료 중이라 작업을 받을 수 없음"""
+
+
+@dataclass
+class GenerationJob:
+    """생성 작업 하나 (run은 인자 없는 코루틴 함수)"""
+    service_code: str
+    share_code: str
+    run: Callable[[], Awaitable]
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class GenerationQueue:
+    """
+    상한이 있는 생성 작업 큐와 작업자 풀
+
+    start()/drain()은 이벤트 루프 안에서 호출합니다 (앱 시작/종료 이벤트).
+    """
+
+    def __init__(self, max_size: int = 125, workers: int = 8,
+                 service_limits: Optional[Dict[str, int]] = None, drain_seconds: float = 30):
+        self.max_size = max_size
+        self.workers = workers
+        self.service_limits = dict(service_limits or {})
+        self.drain_seconds = drain_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._deferred: Dict[str, Deque[GenerationJob]] = defaultdict(deque)
+        self._running: Dict[str, int] = defaultdict(int)
+        self._accepting = True
+
+        self.accepted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.failed = 0
+        self._wait_times: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._run_times: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    @property
+    def depth(self) -> int:
+        """실행을 기다리는 작업 수 (서비스별 대기열 포함)"""
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return queued + sum(len(jobs) for jobs in self._deferred.values())
+
+    def start(self):
+        """작업자 시작 (이미 실행 중이면 무시)"""
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._accepting = True
+        self._tasks = [loop.create_task(self._worker(), name=f"generation-worker-{i}") for i in range(self.workers)]
+        logger.info(f"생성 작업 큐 시작 (작업자 {self.workers}개, 대기 상한 {self.max_size})")
+
+    def submit(self, service_code: str, share_code: str, run: Callable[[], Awaitable]) -> int:
+        """
+        작업 등록
+
+        Args:
+            service_code: 서비스 코드 (서비스별 동시 실행 상한, 통계용)
+            share_code: 작업 결과를 저장할 공유 코드
+            run: 실행할 코루틴 함수
+
+        Returns:
+            등록 직후 대기 작업 수 (이 작업 포함)
+
+        Raises:
+            QueueFullError: 대기 작업이 상한에 도달했거나 종료 중인 경우
+        """
+        if self._accepting and not self._tasks:
+            self.start()
+        if not self._accepting:
+            self.rejected += 1
+            raise QueueFullError("종료 중이라 생성 작업을 받지 않습니다")
+        if self.depth >= self.max_size:
+            self.rejected += 1
+            raise QueueFullError(f"생성 작업 대기열이 가득 찼습니다 ({self.depth}/{self.max_size})")
+
+        self._queue.put_nowait(GenerationJob(service_code, share_code, run))
+        self.accepted += 1
+        return self.depth
+
+    def _has_capacity(self, service_code: str) -> bool:
+        limit = self.service_limits.get(service_code)
+        return limit is None or self._running[service_code] < limit
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            while job is not None:
+                if not self._has_capacity(job.service_code):
+                    # 서비스 상한 - 같은 서비스 작업이 끝나면 그 작업자가 이어서 실행
+                    self._deferred[job.service_code].append(job)
+                    break
+                await self._execute(job)
+                deferred = self._deferred.get(job.service_code)
+                job = deferred.popleft() if deferred else None
+
+    async def _execute(self, job: GenerationJob):
+        started = time.monotonic()
+        self._wait_times.append(started - job.enqueued_at)
+        self._running[job.service_code] += 1
+        try:
+            await job.run()
+            self.completed += 1
+        except Exception:
+            self.failed += 1
+            logger.exception(f"[{job.service_code}] 생성 작업 실패 (share_code: {job.share_code})")
+        finally:
+            self._running[job.service_code] -= 1
+            self._run_times.append(time.monotonic() - started)
+            self._queue.task_done()
+
+    async def drain(self, timeout: Optional[float] = None):
+        """새 작업을 막고 남은 작업을 timeout초까지 기다린 뒤 작업자 종료 (앱 종료 시 호출)"""
+        self._accepting = False
+        if not self._tasks:
+            return
+
+        timeout = self.drain_seconds if timeout is None else timeout
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"생성 작업 종료 대기 시간 초과 - 대기 {self.depth}개, "
+                           f"실행 중 {sum(self._running.values())}개 작업을 중단합니다")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    def _summarize(samples: Deque[float]) -> Dict:
+        if not samples:
+            return {'avg_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+        ordered = sorted(samples)
+        return {
+            'avg_ms': round(sum(ordered) / len(ordered) * 1000),
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000),
+            'max_ms': round(ordered[-1] * 1000)
+        }
+
+    def stats(self) -> Dict:
+        """관리자 화면용 카운터 (대기/실행 시간은 최근 METRICS_WINDOW개 작업 기준)"""
+        return {
+            'depth': self.depth,
+            'max_size': self.max_size,
+            'workers': self.workers,
+            'running': sum(self._running.values()),
+            'running_by_service': {code: count for code, count in self._running.items() if count},
+            'deferred_by_service': {code: len(jobs) for code, jobs in self._deferred.items() if jobs},
+            'service_limits': self.service_limits,
+            'accepting': self._accepting,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'completed': self.completed,
+            'failed': self.failed,
+            'wait_time': self._summarize(self._wait_times),
+            'run_time': self._summarize(self._run_times)
+        }
+
+
+# 싱글톤 인스턴스
+generation_queue = GenerationQueue(
+    max_size=settings.generation_queue_size,
+    workers=settings.generation_workers,
+    service_limits=settings.generation_service_limits,
+    drain_seconds=settings.generation_drain_seconds
+)
@@ -0,0 +1,100 @@
+"""
+생성 중인 운세 텍스트 스트림
+
+생성 작업이 Gemini 스트리밍 응답의 조각을 share_code별 버퍼에 붙이고, SSE 엔드포인트가
+버퍼를 따라 읽어 브라우저로 보냅니다. 구독자는 원하는 위치(이미 받은 조각 수)부터 읽을 수
+있으므로 늦게 연결하거나 다시 연결해도 처음부터/이어서 받습니다.
+
+버퍼는 작업이 끝난 뒤 RETENTION_SECONDS 동안만 남겨 두고 지웁니다. 그 뒤의 요청은
+저장된 FortuneResult에서 결과를 읽습니다. 프로세스 메모리에만 있으므로 생성 작업과
+같은 프로세스에서 SSE를 처리해야 합니다.
+"""
+import asyncio
+import time
+from typing import Dict, List, Optional
+
+# 끝난 버퍼를 남겨 두는 시간 (초)
+RETENTION_SECONDS = 60
+
+
+class StreamBuffer:
+    """share_code 하나의 생성 텍스트 조각"""
+
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[str] = None
+        self.created_at = time.monotonic()
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        # 기다리던 구독자를 깨우고 다음 변경용 이벤트로 교체
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def append(self, text: str):
+        """조각 추가 (끝난 버퍼에는 무시)"""
+        if not self.done:
+            self.chunks.append(text)
+            self._notify()
+
+    def finish(self, error: Optional[str] = None):
+        """생성 종료 (error가 있으면 실패)"""
+        if not self.done:
+            self.done = True
+            self.error = error
+            self._notify()
+
+    async def wait(self, known: int, timeout: float) -> bool:
+        """
+        조각이 known개보다 많아지거나 끝날 때까지 대기
+
+        Returns:
+            새 조각이 있거나 끝났으면 True, timeout이면 False
+        """
+        if len(self.chunks) > known or self.done:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class GenerationStreams:
+    """share_code → StreamBuffer 목록 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, retention_seconds: float = RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._buffers: Dict[str, StreamBuffer] = {}
+
+    def open(self, share_code: str) -> StreamBuffer:
+        """버퍼 생성 (이미 있으면 그 버퍼)"""
+        buffer = self._buffers.get(share_code)
+        if buffer is None:
+            buffer = self._buffers[share_code] = StreamBuffer()
+        return buffer
+
+    def get(self, share_code: str) -> Optional[StreamBuffer]:
+        return self._buffers.get(share_code)
+
+    def close(self, share_code: str, error: Optional[str] = None):
+        """생성 종료 표시 후 보존 시간이 지나면 버퍼 제거"""
+        buffer = self._buffers.get(share_code)
+        if buffer is None:
+            return
+        buffer.finish(error)
+        asyncio.get_running_loop().call_later(self.retention_seconds, self._discard, share_code, buffer)
+
+    def _discard(self, share_code: str, buffer: StreamBuffer):
+        if self._buffers.get(share_code) is buffer:
+            del self._buffers[share_code]
+
+    def stats(self) -> Dict:
+        """관리자 화면용 카운터"""
+        active = sum(1 for buffer in self._buffers.values() if not buffer.done)
+        return {'buffers': len(self._buffers), 'active': active}
+
+
+# 싱글톤 인스턴스
+generation_streams = GenerationStreams()
@@ -0,0 +1,122 @@
+"""
+연간 일진 달력 (길흉일)
+
+한 해(또는 여러 해)의 모든 날짜에 대해 일주, 12신살, 길흉 등급을 NumPy 배열 연산 한 번으로
+계산합니다. 길흉 등급/좋은 일/나쁜 일/설명은 12신살에만 의존하므로 신살별 12행 테이블로
+만들어 두고, 날짜별 결과 사전은 조회할 때만 만듭니다.
+
+계산기 모듈이 이 모듈을 가져오므로 여기서는 계산기를 인자로만 받습니다.
+"""
+from datetime import date
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.services.saju_calculator import SajuCalculator
+
+
+class YearAlmanac:
+    """
+    한 해의 일진 달력
+
+    배열은 1월 1일부터 하루 한 칸이며, 일주 육십갑자 인덱스와 12신살 코드를 담습니다.
+    """
+
+    def __init__(self, calculator: "SajuCalculator", year: int,
+                 day_indexes: np.ndarray, sinsal_codes: np.ndarray):
+        self.calculator = calculator
+        self.year = year
+        self.first_ordinal = date(year, 1, 1).toordinal()
+        self.day_indexes = day_indexes
+        self.sinsal_codes = sinsal_codes
+
+        # 12신살별 (신살, 길흉 등급, 좋은 일, 나쁜 일, 설명)
+        self._sinsal_rows = []
+        for sinsal in calculator.DAY_SINSALS:
+            luck_level = calculator._determine_luck_level(sinsal, '', '')
+            good_activities, bad_activities = calculator._get_activities(sinsal, '')
+            description = calculator._get_luck_description(sinsal, luck_level)
+            self._sinsal_rows.append((sinsal, luck_level, good_activities, bad_activities, description))
+
+        self._lucky_days: Optional[List[Dict]] = None
+
+    def __len__(self) -> int:
+        return len(self.day_indexes)
+
+    def day(self, target_date: date) -> Dict:
+        """특정 날짜의 길흉일 정보 (get_daily_fortune_info와 같은 결과)"""
+        offset = target_date.toordinal() - self.first_ordinal
+        if not 0 <= offset < len(self):
+            raise ValueError(f"{self.year}년 달력에 없는 날짜입니다: {target_date}")
+
+        calc = self.calculator
+        day_index = int(self.day_indexes[offset])
+        gan_index, ji_index = day_index % 10, day_index % 12
+        day_gan, day_ji = calc.CHEONGAN[gan_index], calc.JIJI[ji_index]
+        sinsal, luck_level, good_activities, bad_activities, description = \
+            self._sinsal_rows[self.sinsal_codes[offset]]
+
+        return {
+            'ganzhi': (day_gan, day_ji),
+            'ganzhi_kr': f'{calc.CHEONGAN_KR[gan_index]}{calc.JIJI_KR[ji_index]}',
+            'ganzhi_full': f'{day_gan}{day_ji}',
+            'ohang': calc.OHANG_NAMES[calc.GAN_OHANG[gan_index]],
+            'sinsal': sinsal,
+            'luck_level': luck_level,
+            'good_activities': list(good_activities),
+            'bad_activities': list(bad_activities),
+            'description': description
+        }
+
+    def days(self) -> List[Dict]:
+        """1월 1일부터 12월 31일까지 날짜별 길흉일 정보"""
+        return [self.day(date.fromordinal(self.first_ordinal + offset)) for offset in range(len(self))]
+
+    def lucky_days(self) -> List[Dict]:
+        """대길일(LUCKY_DAY_SINSALS) 전체 목록 [{'date', 'ganzhi', 'sinsal'}]"""
+        if self._lucky_days is None:
+            calc = self.calculator
+            lucky_codes = [calc.DAY_SINSALS.index(sinsal) for sinsal in calc.LUCKY_DAY_SINSALS]
+            offsets = np.flatnonzero(np.isin(self.sinsal_codes, lucky_codes))
+            self._lucky_days = []
+            for offset in offsets.tolist():
+                day_index = int(self.day_indexes[offset])
+                self._lucky_days.append({
+                    'date': date.fromordinal(self.first_ordinal + offset).strftime('%m월 %d일'),
+                    'ganzhi': f'{calc.CHEONGAN_KR[day_index % 10]}{calc.JIJI_KR[day_index % 12]}',
+                    'sinsal': calc.DAY_SINSALS[self.sinsal_codes[offset]]
+                })
+        return [dict(day) for day in self._lucky_days]
+
+
+def build_almanacs(calculator: "SajuCalculator", start_year: int,
+                   end_year: Optional[int] = None) -> Dict[int, YearAlmanac]:
+    """
+    start_year ~ end_year(포함) 일진 달력을 배열 연산 한 번으로 생성
+
+    Returns:
+        {년도: YearAlmanac}
+    """
+    end_year = end_year or start_year
+    days = np.arange(np.datetime64(f'{start_year:04d}-01-01'), np.datetime64(f'{end_year + 1:04d}-01-01'))
+    ordinals = days.astype(np.int64) + date(1970, 1, 1).toordinal()
+    months = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+
+    day_indexes = calculator.day_pillar_index(ordinals).astype(np.int8)
+    sinsal_codes = calculator.day_sinsal_index(day_indexes % 12, months).astype(np.int8)
+
+    almanacs = {}
+    start = 0
+    for year in range(start_year, end_year + 1):
+        end = start + (date(year + 1, 1, 1) - date(year, 1, 1)).days
+        almanacs[year] = YearAlmanac(calculator, year, day_indexes[start:end], sinsal_codes[start:end])
+        start = end
+    return almanacs
+
+
+@lru_cache(maxsize=16)
+def get_year_almanac(calculator: "SajuCalculator", year: int) -> YearAlmanac:
+    """년도별 일진 달력 캐시"""
+    return build_almanacs(calculator, year)[year]
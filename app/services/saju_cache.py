@@ -0,0 +1,131 @@
+"""
+사주 계산 결과 캐시
+
+같은 생년월일시의 사주가 결과 생성, 캐시 히트, 공유 URL 조회 때마다 반복 계산되므로
+정규화한 입력 키로 calculate_saju 결과를 LRU/TTL 방식으로 보관합니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from app.config import get_settings
+from app.services.saju_calculator import SajuCalculator, SajuChart, saju_calculator
+from app.services.saju_store import SajuChartStore, get_saju_chart_store
+from app.utils.korean_lunar_calendar import lunar_to_solar
+
+settings = get_settings()
+
+
+class SajuCache:
+    """
+    사주 차트 캐시 (스레드 안전)
+
+    키는 (양력 날짜 서수, 시지, 남성 여부)입니다. 음력 입력은 양력으로 바꾼 뒤 키를 만들고,
+    시각은 시지(2시간 단위)로 묶으므로 같은 사주는 입력 형식과 관계없이 한 항목을 씁니다.
+
+    미스가 나면 사전 계산 저장소(빌드되어 있는 경우)를 먼저 읽고, 없거나 범위 밖이면 계산합니다.
+
+    SajuChart를 보관하므로 섹션은 처음 요청될 때 한 번만 계산됩니다. 차트는 섹션을 작은 불변
+    결과 객체로 들고 있고 calculate_saju는 매번 새 사전으로 직렬화하므로, 호출부에서
+    saju_data["name"] 같은 키를 추가하거나 안쪽 목록을 고쳐도 캐시에 영향이 없습니다.
+    """
+
+    def __init__(self, calculator: SajuCalculator = saju_calculator,
+                 max_size: int = 4096, ttl_seconds: float = 86400,
+                 store: Optional[SajuChartStore] = None):
+        self.calculator = calculator
+        self.store = store
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[int, int, bool], Tuple[float, SajuChart]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.store_reads = 0
+
+    def make_key(self, birthdate: date, birth_time: Optional[str] = None,
+                 calendar_type: str = 'solar', gender: str = 'male') -> Tuple[int, int, bool]:
+        """입력 정규화 → (양력 날짜 서수, 시지 0-11, 남성 여부)"""
+        if calendar_type == 'lunar':
+            birthdate = lunar_to_solar(birthdate.year, birthdate.month, birthdate.day, False)
+        hour = self.calculator.parse_hour(birth_time)
+        return birthdate.toordinal(), ((hour + 1) // 2) % 12, gender == 'male'
+
+    def calculate_saju(self, birthdate: date, birth_time: Optional[str] = None,
+                       calendar_type: str = 'solar', gender: str = 'male', sections=None) -> Dict:
+        """SajuCalculator.calculate_saju와 같은 인자/결과 (캐시 경유, sections로 일부 섹션만 요청 가능)"""
+        return self.get_chart(birthdate, birth_time, calendar_type, gender).to_dict(sections)
+
+    def get_chart(self, birthdate: date, birth_time: Optional[str] = None,
+                  calendar_type: str = 'solar', gender: str = 'male') -> SajuChart:
+        """SajuCalculator.build_chart와 같은 인자 (캐시 경유)"""
+        key = self.make_key(birthdate, birth_time, calendar_type, gender)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, chart = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return chart
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+
+        # 계산은 락 밖에서 수행 (동시에 같은 키가 계산되더라도 결과는 동일)
+        ordinal, hour_ji, is_male = key
+        solar_date = date.fromordinal(ordinal)
+        gender = 'male' if is_male else 'female'
+        chart = self.store.chart(solar_date, hour_ji, gender) if self.store else None
+        from_store = chart is not None
+        if chart is None:
+            chart = self.calculator.chart_from_solar(solar_date, hour_ji * 2, gender)
+
+        with self._lock:
+            if from_store:
+                self.store_reads += 1
+            self._entries[key] = (now + self.ttl_seconds, chart)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return chart
+
+    def stats(self) -> Dict:
+        """캐시 크기 조정용 카운터"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'store_reads': self.store_reads,
+                'store_enabled': self.store is not None,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0
+            }
+
+    def clear(self):
+        """항목과 카운터 초기화"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.store_reads = 0
+
+
+# 싱글톤 인스턴스
+saju_cache = SajuCache(
+    max_size=settings.saju_cache_size,
+    ttl_seconds=settings.saju_cache_ttl_seconds,
+    store=get_saju_chart_store()
+)
@@ -1,13 +1,392 @@
 """
 사주팔자 계산 서비스
+
+내부 계산은 정수 코드(천간 0-9, 지지 0-11, 육십갑자 0-59, 오행 0-4 = 木火土金水)와
+테이블 인덱싱으로 처리하고, 한자/한글 문자열은 결과 사전을 만들 때만 사용합니다.
 """
-from datetime import datetime, date
-from typing import Dict, List, Tuple
-from app.utils.korean_lunar_calendar import KoreanLunarCalendar
+from bisect import bisect_right
+from datetime import date
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.saju_almanac import YearAlmanac, get_year_almanac
+from app.services.saju_compatibility import get_compatibility_matrix
+from app.services.saju_results import (RELATION_KINDS, DaeunResult, DailyDelta, DayRelation, LuckPeriod,
+                                       OhangResult, PillarsResult, RelationEntry, RelationsResult, SinsalEntry,
+                                       SinsalsResult, StrengthResult, YongsinResult)
+from app.utils.korean_lunar_calendar import lunar_to_solar
+from app.utils.solar_terms import get_solar_term_table, kst_minutes, minutes_to_datetime
+
+
+def _compile_codes(mapping: Dict, keys: List[str], names: List[str]) -> tuple:
+    """문자 사전 → keys 순서의 정수 코드 튜플 (값이 목록이면 코드 튜플)"""
+    def encode(value):
+        if isinstance(value, str):
+            return names.index(value)
+        return tuple(names.index(v) for v in value)
+    return tuple(encode(mapping[key]) for key in keys)
+
+
+def _compile_table(mapping: Dict, rows: List[str], cols: List[str], names: List[str]) -> tuple:
+    """(행, 열) 문자 사전 → 2차원 정수 코드 테이블 (키는 (행, 열) 튜플 또는 중첩 사전)"""
+    def lookup(row, col):
+        return mapping[(row, col)] if (row, col) in mapping else mapping[row][col]
+    return tuple(tuple(names.index(lookup(row, col)) for col in cols) for row in rows)
+
+
+def _compile_pair_table(mapping: Dict, names: List[str]) -> tuple:
+    """문자 쌍 → 결과 사전을 순서에 무관한 n×n 테이블로 변환 (해당 없음은 '')"""
+    table = [[''] * len(names) for _ in names]
+    for (a, b), value in mapping.items():
+        table[names.index(a)][names.index(b)] = value
+        table[names.index(b)][names.index(a)] = value
+    return tuple(tuple(row) for row in table)
+
+
+def _compile_relation_matrix(names: List[str], pair_rules: List[Tuple[List[Tuple[str, str]], int]],
+                             group_rules: List[Tuple[List[str], int]]) -> tuple:
+    """
+    관계 규칙 → n×n 비트 테이블
+
+    pair_rules의 (쌍 목록, 비트)는 해당 쌍(순서 무관) 칸에, group_rules의 (그룹, 비트)는
+    두 글자가 모두 그룹에 속하는 칸(같은 글자 포함)에 비트를 켭니다.
+    """
+    table = [[0] * len(names) for _ in names]
+    for pairs, bit in pair_rules:
+        for a, b in pairs:
+            a, b = names.index(a), names.index(b)
+            table[a][b] |= 1 << bit
+            table[b][a] |= 1 << bit
+    for group, bit in group_rules:
+        codes = [names.index(item) for item in group]
+        for a in codes:
+            for b in codes:
+                table[a][b] |= 1 << bit
+    return tuple(tuple(row) for row in table)
+
+
+def _compile_groups(groups: List[Tuple[List[str], str]], names: List[str]) -> tuple:
+    """[(문자 목록, 결과)] → ((정수 코드 집합, 결과), ...)"""
+    return tuple((frozenset(names.index(item) for item in group), value) for group, value in groups)
+
+
+def sexagenary_index(gan: int, ji: int) -> int:
+    """천간/지지 코드 → 육십갑자 인덱스 (0=甲子, 음양이 맞지 않는 조합은 없음)"""
+    return (6 * gan - 5 * ji) % 60
+
+
+class PillarCodes(NamedTuple):
+    """사주 네 기둥의 정수 코드 (순서: 년, 월, 일, 시)"""
+    gans: Tuple[int, int, int, int]
+    jis: Tuple[int, int, int, int]
+
+    @property
+    def day_gan(self) -> int:
+        return self.gans[2]
+
+    def sexagenary(self) -> Tuple[int, int, int, int]:
+        """기둥별 육십갑자 인덱스"""
+        return tuple(sexagenary_index(gan, ji) for gan, ji in zip(self.gans, self.jis))
+
+
+# 기둥 순서 (PillarCodes 인덱스)
+YEAR, MONTH, DAY, HOUR = range(4)
+PILLAR_KEYS = ('year', 'month', 'day', 'hour')
+
+# 두 기둥 조합 (합충형파해 비트 순서)
+PILLAR_PAIRS = ((0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3))
+
+# 합충형파해 비트마스크: 쌍 관계는 PILLAR_PAIRS 순서로 6비트씩, 삼합/형은 그룹 순서
+RELATION_CHEONGAN_HAP = 0
+RELATION_YUKHAP = 6
+RELATION_CHUNG = 12
+RELATION_HAE = 18
+RELATION_SAMHAP = 24
+RELATION_HYEONG = 28
+# 관계 테이블 칸에서 기둥 쌍 위치만큼 밀어야 하는 비트 (나머지는 삼합/형 그룹 비트)
+RELATION_PAIR_FLAGS = (1 << RELATION_CHEONGAN_HAP) | (1 << RELATION_YUKHAP) | (1 << RELATION_CHUNG) | (1 << RELATION_HAE)
+
+# 신살 비트마스크: SINSAL_RULES 순서로 규칙마다 3비트 (0=없음, 1-4=처음 해당한 기둥 + 1)
+SINSAL_POSITION_BITS = 3
+
+# 신살 기준 글자: 이름 → (0=천간 / 1=지지, 기둥)
+SINSAL_ANCHORS = {
+    'day_gan': (0, DAY),
+    'year_gan': (0, YEAR),
+    'year_ji': (1, YEAR),
+}
+
+
+class SinsalRule(NamedTuple):
+    """
+    신살 규칙
+
+    기준 글자(anchor)로 targets에서 대상 지지를 찾고, positions 기둥을 년→시 순서로 보며
+    처음 대상 지지가 나온 기둥을 기록합니다. targets에 없는 기준 글자는 해당 없음입니다.
+    """
+    name: str
+    group: str                      # beneficial / harmful / neutral
+    anchor: str                     # SINSAL_ANCHORS 키
+    targets: Dict                   # 기준 글자 → 대상 지지 (문자 또는 목록)
+    description: str
+    positions: Tuple[int, ...] = (YEAR, MONTH, DAY, HOUR)
+
+
+def _compile_sinsal_rules(rules: List[SinsalRule], gan_names: List[str], ji_names: List[str]):
+    """
+    신살 규칙 → 평탄한 정수 배열
+
+    Returns:
+        (기준 종류[규칙], 기준 기둥[규칙], 대상 지지 비트[규칙][기준 코드 0-11],
+         기둥 허용 비트[규칙] (기둥 i → 1 << i))
+    """
+    kinds, pillars, target_bits, position_bits = [], [], [], []
+    for rule in rules:
+        kind, pillar = SINSAL_ANCHORS[rule.anchor]
+        anchor_names = ji_names if kind else gan_names
+        row = [0] * len(ji_names)
+        for code, anchor in enumerate(anchor_names):
+            targets = rule.targets.get(anchor, ())
+            for target in ([targets] if isinstance(targets, str) else targets):
+                row[code] |= 1 << ji_names.index(target)
+        kinds.append(kind)
+        pillars.append(pillar)
+        target_bits.append(tuple(row))
+        position_bits.append(sum(1 << i for i in rule.positions))
+    return tuple(kinds), tuple(pillars), tuple(target_bits), tuple(position_bits)
+
+
+class SajuRecord(NamedTuple):
+    """정수 코드로 계산한 사주 분석 결과 (결과 사전으로 직렬화하기 전 단계)"""
+    codes: PillarCodes
+    birth_year: int
+    sipsung: Tuple[int, ...]        # 천간 십성 코드 (년, 월, 일, 시)
+    sipsung_jiji: Tuple[int, ...]   # 지지 본기 십성 코드
+    sipiunsung: Tuple[int, ...]     # 십이운성 코드
+    ohang_counts: Tuple[int, ...]   # 木火土金水 개수
+    strength: int                   # 신강신약 코드 (0=극약 ... 6=극왕)
+    yongsin: Tuple[int, int, int]   # 용신, 희신, 기신 오행 코드
+    daeun_start: int                # 대운 시작 나이
+    daeun_step: int                 # 1=순행, -1=역행
+    relations: int                  # 합충형파해 비트마스크
+    sinsals: int                    # 신살 비트마스크
+
+
+class LuckPillar(NamedTuple):
+    """운의 한 칸 (대운 10년 / 세운 1년 / 월운 1개월, 천간/지지 정수 코드)"""
+    unit: str       # 'daeun' / 'seun' / 'wolun'
+    year: int       # 대운은 시작 년도, 세운/월운은 해당 년도
+    month: int      # 월운의 월 (대운/세운은 0)
+    age: int        # 출생년 기준 나이 (year - birth_year)
+    gan: int
+    ji: int
+
+
+# 운 단위 (luck_timeline의 unit)
+LUCK_UNITS = ('daeun', 'seun', 'wolun')
+
+
+class SajuChart:
+    """
+    사주 차트 (섹션은 처음 접근할 때 계산해 인스턴스에 보관)
+
+    일부 섹션만 쓰는 서비스(오늘의 운세, 궁합 등)는 합충형파해/신살 같은 나머지 분석 비용을
+    치르지 않습니다. 계산은 결정적이므로 여러 스레드가 같은 차트를 공유해도 되고,
+    동시에 처음 접근하면 같은 값을 두 번 계산할 뿐입니다.
+
+    섹션은 saju_results의 불변 결과 객체로 보관하고 결과 사전은 to_dict()에서 만듭니다.
+    """
+
+    # calculate_saju 결과 사전의 섹션 (키 순서)
+    SECTIONS = ('pillars', 'day_gan', 'ohang', 'daeun', 'strength', 'yongsin',
+                'hap_chung_hyeong_pa_hae', 'sinsals')
+
+    def __init__(self, calculator: 'SajuCalculator', codes: PillarCodes,
+                 birth_year: int, birth_minutes: int, gender: str):
+        self.calculator = calculator
+        self.codes = codes
+        self.birth_year = birth_year
+        self.birth_minutes = birth_minutes  # kst_minutes 출생 시각 (대운 시작 나이용)
+        self.gender = gender
+        self._values = {}
+
+    @classmethod
+    def from_record(cls, calculator: 'SajuCalculator', record: SajuRecord) -> 'SajuChart':
+        """미리 계산된 SajuRecord로 차트 생성 (정수 분석 단계 생략)"""
+        chart = cls(calculator, record.codes, record.birth_year, None, None)
+        chart._values.update({
+            'sipsung': record.sipsung,
+            'sipsung_jiji': record.sipsung_jiji,
+            'sipiunsung': record.sipiunsung,
+            'ohang_counts': record.ohang_counts,
+            'strength_code': record.strength,
+            'yongsin_codes': record.yongsin,
+            'daeun_start': record.daeun_start,
+            'daeun_step': record.daeun_step,
+            'relation_mask': record.relations,
+            'sinsal_mask': record.sinsals,
+        })
+        return chart
+
+    def _get(self, name: str):
+        try:
+            return self._values[name]
+        except KeyError:
+            value = self._values[name] = getattr(self, '_compute_' + name)()
+            return value
+
+    # ---- 정수 분석 ----
+    def _compute_sipsung(self):
+        row = self.calculator.SIPSUNG_TABLE[self.codes.day_gan]
+        return tuple(row[gan] for gan in self.codes.gans)
+
+    def _compute_sipsung_jiji(self):
+        row = self.calculator.SIPSUNG_TABLE[self.codes.day_gan]
+        bongi = self.calculator.JI_BONGI
+        return tuple(row[bongi[ji]] for ji in self.codes.jis)
+
+    def _compute_sipiunsung(self):
+        row = self.calculator.SIPIUNSUNG_TABLE[self.codes.day_gan]
+        return tuple(row[ji] for ji in self.codes.jis)
+
+    def _compute_ohang_counts(self):
+        return tuple(self.calculator._ohang_counts(self.codes))
+
+    def _compute_day_ohang(self):
+        return self.calculator.GAN_OHANG[self.codes.day_gan]
+
+    def _compute_strength_code(self):
+        c = self.calculator
+        return c._strength_code(c._ohang_percent(self._get('ohang_counts')[self._get('day_ohang')]))
+
+    def _compute_yongsin_codes(self):
+        return self.calculator._yongsin_codes(self._get('day_ohang'), self._get('strength_code'))
+
+    def _compute_daeun_start(self):
+        return self.calculator.daeun_start_age(self.birth_minutes, self._get('daeun_step'))
+
+    def _compute_daeun_step(self):
+        return self.calculator.daeun_step(self.codes.gans[YEAR], self.gender)
+
+    def _compute_relation_mask(self):
+        return self.calculator.relation_mask(self.codes)
+
+    def _compute_sinsal_mask(self):
+        return self.calculator.sinsal_mask(self.codes)
+
+    @property
+    def record(self) -> SajuRecord:
+        """모든 정수 분석 결과 (사전 계산 저장소용)"""
+        return SajuRecord(
+            codes=self.codes,
+            birth_year=self.birth_year,
+            sipsung=self._get('sipsung'),
+            sipsung_jiji=self._get('sipsung_jiji'),
+            sipiunsung=self._get('sipiunsung'),
+            ohang_counts=self._get('ohang_counts'),
+            strength=self._get('strength_code'),
+            yongsin=self._get('yongsin_codes'),
+            daeun_start=self._get('daeun_start'),
+            daeun_step=self._get('daeun_step'),
+            relations=self._get('relation_mask'),
+            sinsals=self._get('sinsal_mask')
+        )
+
+    # ---- 직렬화 섹션 ----
+    def _compute_pillars(self) -> PillarsResult:
+        c = self.calculator
+        gans, jis = self.codes
+        sipsung = self._get('sipsung')
+        sipsung_jiji = self._get('sipsung_jiji')
+        sipiunsung = self._get('sipiunsung')
+
+        # 출력 순서: 시, 일, 월, 년
+        order = (HOUR, DAY, MONTH, YEAR)
+        return PillarsResult(
+            cheongan=tuple(c.CHEONGAN[gans[i]] for i in order),
+            jiji=tuple(c.JIJI[jis[i]] for i in order),
+            sipsung=tuple('日干' if i == DAY else c.SIPSUNG_NAMES[sipsung[i]] for i in order),
+            sipsung_jiji=tuple(c.SIPSUNG_NAMES[sipsung_jiji[i]] for i in order),
+            sipiunsung=tuple(c.SIPIUNSUNG_NAMES[sipiunsung[i]] for i in order)
+        )
+
+    def _compute_day_gan(self) -> str:
+        return self.calculator.CHEONGAN[self.codes.day_gan]
+
+    def _compute_ohang(self) -> OhangResult:
+        return self.calculator._ohang_result(self._get('ohang_counts'))
+
+    def _compute_daeun(self) -> DaeunResult:
+        gans, jis = self.codes
+        return self.calculator._daeun_result(
+            self.birth_year, gans[MONTH], jis[MONTH], self._get('daeun_start'), self._get('daeun_step')
+        )
+
+    def _compute_strength(self) -> StrengthResult:
+        return self.calculator.STRENGTH_RESULTS[self._get('strength_code')]
+
+    def _compute_yongsin(self) -> YongsinResult:
+        return self.calculator._yongsin_result(self._get('yongsin_codes'))
+
+    def _compute_hap_chung_hyeong_pa_hae(self) -> RelationsResult:
+        return self.calculator.relations_result(self.codes, self._get('relation_mask'))
+
+    def _compute_sinsals(self) -> SinsalsResult:
+        return self.calculator.sinsals_result(self.codes, self._get('sinsal_mask'))
+
+    def timeline(self, unit: str, start: Optional[date] = None,
+                 count: Optional[int] = None) -> Iterator[Dict]:
+        """대운/세운/월운 결과 사전을 순서대로 생성 (SajuCalculator.luck_timeline)"""
+        return self.calculator.luck_timeline(self, unit, start, count)
+
+    def daily_delta(self, target_date: date) -> DailyDelta:
+        """target_date 일진이 이 원국에 주는 영향 (SajuCalculator.daily_delta)"""
+        return self.calculator.daily_delta(self, target_date)
+
+    def section(self, name: str):
+        """섹션 결과 객체 하나 (처음 접근할 때 계산, day_gan은 문자열)"""
+        if name not in self.SECTIONS:
+            raise ValueError(f"알 수 없는 사주 섹션입니다: {name}")
+        return self._get(name)
+
+    pillars = property(lambda self: self._get('pillars'))
+    day_gan = property(lambda self: self._get('day_gan'))
+    ohang = property(lambda self: self._get('ohang'))
+    daeun = property(lambda self: self._get('daeun'))
+    strength = property(lambda self: self._get('strength'))
+    yongsin = property(lambda self: self._get('yongsin'))
+    hap_chung_hyeong_pa_hae = property(lambda self: self._get('hap_chung_hyeong_pa_hae'))
+    sinsals = property(lambda self: self._get('sinsals'))
+
+    def to_dict(self, sections=None) -> Dict:
+        """
+        calculate_saju 형식의 결과 사전
+
+        Args:
+            sections: 포함할 섹션 이름 목록 (None이면 전체, 순서는 SECTIONS 기준)
+
+        Returns:
+            새 결과 사전 (호출할 때마다 새로 만들므로 호출부에서 고쳐도 차트에 영향 없음)
+        """
+        if sections is None:
+            names = self.SECTIONS
+        else:
+            unknown = set(sections) - set(self.SECTIONS)
+            if unknown:
+                raise ValueError(f"알 수 없는 사주 섹션입니다: {', '.join(sorted(unknown))}")
+            names = [name for name in self.SECTIONS if name in sections]
+
+        result = {}
+        for name in names:
+            value = self._get(name)
+            result[name] = value if isinstance(value, str) else value.to_dict()
+        return result
 
 
 class SajuCalculator:
-    """사주팔자 계산 클래스"""
+    """사주팔자 계산 클래스 (인스턴스 상태가 없어 스레드 간 공유 가능)"""
 
     # 천간 (天干) - 10개
     CHEONGAN = ['甲', '乙', '丙', '丁', '戊', '己', '庚', '辛', '壬', '癸']
@@ -98,12 +477,182 @@ class SajuCalculator:
               '申': '長生', '酉': '沐浴', '戌': '冠帶', '亥': '建祿', '子': '帝旺', '丑': '衰'},
     }
 
-    def __init__(self):
-        self.calendar = KoreanLunarCalendar()
+    # 지장간 본기
+    JIJI_BONGI = {
+        '子': '癸', '丑': '己', '寅': '甲', '卯': '乙',
+        '辰': '戊', '巳': '丙', '午': '丁', '未': '己',
+        '申': '庚', '酉': '辛', '戌': '戊', '亥': '壬'
+    }
 
-    def get_ganzhi(self, year: int, month: int, day: int, hour: int = 0) -> Dict[str, Tuple[str, str]]:
+    # 합충형파해
+    CHEONGAN_HAP_MAP = {
+        ('甲', '己'): '토', ('乙', '庚'): '금', ('丙', '辛'): '수',
+        ('丁', '壬'): '목', ('戊', '癸'): '화'
+    }
+    YUKHAP_MAP = {
+        ('子', '丑'): '토', ('寅', '亥'): '목', ('卯', '戌'): '화',
+        ('辰', '酉'): '금', ('巳', '申'): '수', ('午', '未'): '화'
+    }
+    SAMHAP_GROUPS = [
+        (['申', '子', '辰'], '수'),
+        (['寅', '午', '戌'], '화'),
+        (['巳', '酉', '丑'], '금'),
+        (['亥', '卯', '未'], '목')
+    ]
+    CHUNG_PAIRS = [
+        ('子', '午'), ('丑', '未'), ('寅', '申'),
+        ('卯', '酉'), ('辰', '戌'), ('巳', '亥')
+    ]
+    HYEONG_GROUPS = [
+        (['寅', '巳', '申'], '무은지형'),
+        (['丑', '未', '戌'], '세형'),
+        (['子', '卯'], '무례지형')
+    ]
+    HAE_PAIRS = [
+        ('子', '未'), ('丑', '午'), ('寅', '巳'),
+        ('卯', '辰'), ('申', '亥'), ('酉', '戌')
+    ]
+
+    # 신살
+    CHEONEUR_MAP = {  # 천을귀인 (일간 기준)
+        '甲': ['丑', '未'], '戊': ['丑', '未'],
+        '乙': ['子', '申'], '己': ['子', '申'],
+        '丙': ['亥', '酉'], '丁': ['亥', '酉'],
+        '庚': ['丑', '未'], '辛': ['寅', '午'],
+        '壬': ['卯', '巳'], '癸': ['卯', '巳']
+    }
+    YEOKMA_MAP = {  # 역마살 (년지 기준)
+        '寅': '申', '午': '寅', '戌': '申',
+        '申': '寅', '子': '寅', '辰': '申',
+        '巳': '亥', '酉': '巳', '丑': '亥',
+        '亥': '巳', '卯': '巳', '未': '亥'
+    }
+    DOHWA_MAP = {  # 도화살 (년지 기준)
+        '寅': '卯', '午': '卯', '戌': '卯',
+        '申': '酉', '子': '酉', '辰': '酉',
+        '巳': '午', '酉': '午', '丑': '午',
+        '亥': '子', '卯': '子', '未': '子'
+    }
+    HWAGAE_MAP = {  # 화개살 (년지 기준)
+        '寅': '戌', '午': '戌', '戌': '戌',
+        '申': '辰', '子': '辰', '辰': '辰',
+        '巳': '丑', '酉': '丑', '丑': '丑',
+        '亥': '未', '卯': '未', '未': '未'
+    }
+    YANGIN_MAP = {  # 양인살 (일간 기준)
+        '甲': '卯', '乙': '寅',
+        '丙': '午', '丁': '巳',
+        '戊': '午', '己': '巳',
+        '庚': '酉', '辛': '申',
+        '壬': '子', '癸': '亥'
+    }
+    GONGMANG_MAP = {  # 공망 (간단 버전: 년간 기준, 10천간 - 12지지 = 2개)
+        '甲': ['戌', '亥'], '乙': ['亥', '子'],
+        '丙': ['子', '丑'], '丁': ['丑', '寅'],
+        '戊': ['寅', '卯'], '己': ['卯', '辰'],
+        '庚': ['辰', '巳'], '辛': ['巳', '午'],
+        '壬': ['午', '未'], '癸': ['未', '申']
+    }
+    GOEGANG_MAP = {  # 괴강살 (일주: 일간 기준 일지)
+        '庚': ['辰', '戌'], '壬': ['辰'], '戊': ['戌']
+    }
+
+    # 신살 규칙 (결과 목록과 비트마스크 슬롯 순서)
+    SINSAL_RULES = [
+        SinsalRule('천을귀인', 'beneficial', 'day_gan', CHEONEUR_MAP,  # 天乙貴人 - 최고의 귀인
+                   '귀인의 도움을 받는 길신입니다. 어려움에서 도움을 받을 수 있습니다.'),
+        SinsalRule('역마살', 'neutral', 'year_ji', YEOKMA_MAP,  # 驛馬殺 - 이동수
+                   '이동과 변화가 많은 삶입니다. 여행, 이사, 직장 이동이 잦을 수 있습니다.'),
+        SinsalRule('도화살', 'neutral', 'year_ji', DOHWA_MAP,  # 桃花殺 - 인기운
+                   '인기가 많고 이성운이 좋습니다. 예술적 재능이 있을 수 있습니다.'),
+        SinsalRule('화개살', 'neutral', 'year_ji', HWAGAE_MAP,  # 華蓋殺 - 예술/종교
+                   '예술적, 종교적 재능이 있습니다. 학문과 연구에도 뛰어날 수 있습니다.'),
+        SinsalRule('양인살', 'harmful', 'day_gan', YANGIN_MAP,  # 羊刃殺 - 강한 성격
+                   '성격이 강하고 극단적일 수 있습니다. 리더십이 있으나 충동적일 수 있습니다.'),
+        SinsalRule('공망', 'harmful', 'year_gan', GONGMANG_MAP,  # 空亡
+                   '허무함이나 공허함을 느낄 수 있습니다. 일이 뜻대로 안 될 때가 있습니다.'),
+        SinsalRule('괴강살', 'neutral', 'day_gan', GOEGANG_MAP,  # 魁罡殺
+                   '특별한 성격과 능력을 가졌습니다. 강한 카리스마가 있으나 고집이 셀 수 있습니다.',
+                   positions=(DAY,)),
+    ]
+
+    # ---- 정수 코드 테이블 (위 문자 테이블에서 생성) ----
+    OHANG_NAMES = ['木', '火', '土', '金', '水']
+    OHANG_KR_NAMES = ['목', '화', '토', '금', '수']
+    SIPSUNG_NAMES = ['比肩', '劫財', '食神', '傷官', '偏財', '正財', '偏官', '正官', '偏印', '正印']
+    SIPIUNSUNG_NAMES = ['長生', '沐浴', '冠帶', '建祿', '帝旺', '衰', '病', '死', '墓', '絶', '胎', '養']
+
+    CHEONGAN_INDEX = {gan: i for i, gan in enumerate(CHEONGAN)}
+    JIJI_INDEX = {ji: i for i, ji in enumerate(JIJI)}
+    GAN_OHANG = _compile_codes(OHANG, CHEONGAN, OHANG_NAMES)
+    JI_OHANG = _compile_codes(OHANG, JIJI, OHANG_NAMES)
+    JI_BONGI = _compile_codes(JIJI_BONGI, JIJI, CHEONGAN)
+    SIPSUNG_TABLE = _compile_table(SIPSUNG_MAP, CHEONGAN, CHEONGAN, SIPSUNG_NAMES)        # [일간][천간]
+    SIPIUNSUNG_TABLE = _compile_table(SIPIUNSUNG_MAP, CHEONGAN, JIJI, SIPIUNSUNG_NAMES)  # [일간][지지]
+
+    CHEONGAN_HAP_TABLE = _compile_pair_table(CHEONGAN_HAP_MAP, CHEONGAN)  # [천간][천간] → 합화 오행
+    YUKHAP_TABLE = _compile_pair_table(YUKHAP_MAP, JIJI)                 # [지지][지지] → 육합 오행
+    SAMHAP_CODES = _compile_groups(SAMHAP_GROUPS, JIJI)
+    HYEONG_CODES = _compile_groups(HYEONG_GROUPS, JIJI)
+
+    # 합충형파해 관계 비트 테이블 (RELATION_* 배치, 쌍 관계는 기둥 쌍 0번 위치 기준)
+    STEM_RELATION_TABLE = _compile_relation_matrix(
+        CHEONGAN, [(list(CHEONGAN_HAP_MAP), RELATION_CHEONGAN_HAP)], []
+    )
+    BRANCH_RELATION_TABLE = _compile_relation_matrix(
+        JIJI,
+        [(list(YUKHAP_MAP), RELATION_YUKHAP), (CHUNG_PAIRS, RELATION_CHUNG), (HAE_PAIRS, RELATION_HAE)],
+        [(group, RELATION_SAMHAP + n) for n, (group, _) in enumerate(SAMHAP_GROUPS)]
+        + [(group, RELATION_HYEONG + n) for n, (group, _) in enumerate(HYEONG_GROUPS)]
+    )
+
+    # 신살 규칙 배열 (규칙 순서) 및 일괄 계산용 numpy 사본
+    (SINSAL_ANCHOR_KINDS, SINSAL_ANCHOR_PILLARS,
+     SINSAL_TARGET_BITS, SINSAL_POSITION_MASKS) = _compile_sinsal_rules(SINSAL_RULES, CHEONGAN, JIJI)
+    SINSAL_PROGRAM = tuple(zip(SINSAL_ANCHOR_KINDS, SINSAL_ANCHOR_PILLARS,
+                               SINSAL_TARGET_BITS, SINSAL_POSITION_MASKS))
+    SINSAL_TARGET_ARRAY = np.array(SINSAL_TARGET_BITS, dtype=np.uint16)                 # [규칙, 기준 코드]
+    SINSAL_POSITION_ARRAY = (np.array(SINSAL_POSITION_MASKS)[:, None] >> np.arange(4)) & 1  # [규칙, 기둥]
+
+    # 오행 상태 / 신강신약 구간 (bisect_right 경계)
+    OHANG_STATUS_THRESHOLDS = [10, 15, 25, 35]
+    OHANG_STATUS_NAMES = ['부족', '약함', '적정', '발달', '과다']
+    STRENGTH_THRESHOLDS = [8, 12, 18, 28, 35, 42]
+    STRENGTH_LEVELS = ['극약', '태약', '신약', '중화', '신강', '태강', '극왕']
+    STRENGTH_POSITIONS = [5, 15, 30, 50, 70, 85, 95]
+    STRENGTH_RESULTS = tuple(StrengthResult(level, position)
+                             for level, position in zip(STRENGTH_LEVELS, STRENGTH_POSITIONS))
+    WEAK_STRENGTH_CODES = range(3)  # 극약, 태약, 신약
+
+    # 오행 코드 / 용신 오프셋의 일괄 계산용 numpy 사본
+    GAN_OHANG_ARRAY = np.array(GAN_OHANG, dtype=np.int64)
+    JI_OHANG_ARRAY = np.array(JI_OHANG, dtype=np.int64)
+    YONGSIN_OFFSETS = np.array([[-1, 0, -2], [1, 2, 0]], dtype=np.int64)  # [신약 0 / 신강 1, 용신·희신·기신]
+
+    # 계산 규칙이 바뀌면 올림 (사전 계산 저장소가 이 값으로 호환 여부를 확인)
+    ENGINE_VERSION = 3
+
+    # 절기 테이블 범위 밖 날짜용 월별 절입일 근사값 (소한, 입춘, 경칩, ..., 대설)
+    APPROX_JEOL_DAYS = [6, 4, 6, 5, 6, 6, 7, 8, 8, 8, 7, 7]
+
+    # 일진 12신살 순서 / 대길일로 보는 신살
+    DAY_SINSALS = ['청룡', '명당', '천형', '주작', '금궤', '천덕',
+                   '백호', '옥당', '천뢰', '현무', '사명', '구진']
+    LUCKY_DAY_SINSALS = ['청룡', '명당', '금궤', '천덕']
+
+    # 일주 기준일: 1900-01-01의 date.toordinal()
+    DAY_PILLAR_BASE_ORDINAL = 693596
+
+    def day_pillar_index(self, ordinal: int) -> int:
+        """날짜 서수(date.toordinal) → 일주 육십갑자 인덱스"""
+        return (ordinal - self.DAY_PILLAR_BASE_ORDINAL + 16) % 60  # 1900-01-01 = 甲戌일
+
+    def pillar_codes(self, year: int, month: int, day: int, hour: int = 0) -> PillarCodes:
         """
-        년월일시의 간지를 계산
+        년월일시의 간지를 정수 코드로 계산
+
+        년주는 입춘, 월주는 절입 시각을 기준으로 바뀝니다. 출생 시각은 시지 구간의
+        가운데(子시 0시, 丑시 2시, ...)로 보므로 (날짜, 시지)가 같으면 결과도 같습니다.
 
         Args:
             year: 년도
@@ -112,66 +661,68 @@ class SajuCalculator:
             hour: 시 (0-23)
 
         Returns:
-            {'year': (천간, 지지), 'month': (천간, 지지), 'day': (천간, 지지), 'hour': (천간, 지지)}
+            PillarCodes (천간 0-9, 지지 0-11)
         """
-        # 년주 계산 (입춘 기준)
-        year_gan = self.CHEONGAN[(year - 4) % 10]
-        year_ji = self.JIJI[(year - 4) % 12]
-
-        # 월주 계산 (절입 기준)
-        month_index = (year * 12 + month + 11) % 60
-        month_gan = self.CHEONGAN[month_index % 10]
-        month_ji = self.JIJI[(month - 1) % 12]
-
-        # 일주 계산
-        base_date = datetime(1900, 1, 1)
-        target_date = datetime(year, month, day)
-        days_diff = (target_date - base_date).days
-        day_index = (days_diff + 16) % 60  # 1900-01-01 = 甲戌일
-        day_gan = self.CHEONGAN[day_index % 10]
-        day_ji = self.JIJI[day_index % 12]
-
-        # 시주 계산
-        hour_ji_index = ((hour + 1) // 2) % 12
-        hour_ji = self.JIJI[hour_ji_index]
-
-        # 시간의 천간은 일간에 따라 결정
-        day_gan_index = self.CHEONGAN.index(day_gan)
-        hour_gan_index = (day_gan_index % 5) * 2 + hour_ji_index
-        hour_gan = self.CHEONGAN[hour_gan_index % 10]
+        # 일주 계산 (잘못된 날짜는 ValueError)
+        solar_date = date(year, month, day)
+        day_index = self.day_pillar_index(solar_date.toordinal())
+        day_gan = day_index % 10
+
+        # 시주 계산 - 시간의 천간은 일간에 따라 결정
+        hour_ji = ((hour + 1) // 2) % 12
+        hour_gan = ((day_gan % 5) * 2 + hour_ji) % 10
+
+        # 년주/월주 계산 - 월간은 년간에 따라 결정 (오호둔)
+        saju_year, month_ji = self.saju_month(kst_minutes(solar_date, hour_ji * 2))
+        year_gan = (saju_year - 4) % 10
+        month_gan = self._month_gan(year_gan, month_ji)
+
+        return PillarCodes(
+            # 년주 (입춘 기준), 월주 (절입 기준), 일주, 시주
+            gans=(year_gan, month_gan, day_gan, hour_gan),
+            jis=((saju_year - 4) % 12, month_ji, day_index % 12, hour_ji)
+        )
 
-        return {
-            'year': (year_gan, year_ji),
-            'month': (month_gan, month_ji),
-            'day': (day_gan, day_ji),
-            'hour': (hour_gan, hour_ji)
-        }
+    def saju_month(self, minutes: int) -> Tuple[int, int]:
+        """
+        KST 시각(kst_minutes) → (사주 년도, 월지 코드)
 
-    def calculate_saju(self, birthdate: date, birth_time: str = None,
-                      calendar_type: str = 'solar', gender: str = 'male') -> Dict:
+        절기 테이블 범위(1899~2101년) 밖은 월별 절입일 근사값으로 계산합니다.
         """
-        사주팔자 계산
+        table = get_solar_term_table()
+        if table.covers(minutes):
+            return table.saju_month(minutes)
+
+        moment = minutes_to_datetime(minutes)
+        month_ji = moment.month % 12 if moment.day >= self.APPROX_JEOL_DAYS[moment.month - 1] else (moment.month - 1) % 12
+        return (moment.year - 1 if moment.month <= 2 and month_ji < 2 else moment.year), month_ji
+
+    @staticmethod
+    def _month_gan(year_gan: int, month_ji: int) -> int:
+        """년간 + 월지 → 월간 (甲己년 寅월 = 丙, 乙庚년 寅월 = 戊, ...)"""
+        return ((year_gan % 5) * 2 + 2 + (month_ji - 2) % 12) % 10
+
+    def get_ganzhi(self, year: int, month: int, day: int, hour: int = 0) -> Dict[str, Tuple[str, str]]:
+        """
+        년월일시의 간지를 계산
 
         Args:
-            birthdate: 생년월일
-            birth_time: 태어난 시간 (HH:MM 형식 또는 "23-01" 형식)
-            calendar_type: 'solar' 또는 'lunar'
-            gender: 'male' 또는 'female'
+            year: 년도
+            month: 월
+            day: 일
+            hour: 시 (0-23)
 
         Returns:
-            사주 데이터
+            {'year': (천간, 지지), 'month': (천간, 지지), 'day': (천간, 지지), 'hour': (천간, 지지)}
         """
-        year = birthdate.year
-        month = birthdate.month
-        day = birthdate.day
-
-        # 음력인 경우 양력으로 변환
-        if calendar_type == 'lunar':
-            self.calendar.setLunarDate(year, month, day, False)
-            solar = self.calendar.SolarIsoFormat().split('-')
-            year, month, day = int(solar[0]), int(solar[1]), int(solar[2])
+        codes = self.pillar_codes(year, month, day, hour)
+        return {
+            key: (self.CHEONGAN[gan], self.JIJI[ji])
+            for key, gan, ji in zip(PILLAR_KEYS, codes.gans, codes.jis)
+        }
 
-        # 시간 파싱
+    def parse_hour(self, birth_time: str = None) -> int:
+        """태어난 시간 문자열 → 시 (모르거나 잘못된 형식이면 0시)"""
         hour = 0
         if birth_time and birth_time not in ['미상', '모름', '']:
             try:
@@ -185,269 +736,352 @@ class SajuCalculator:
             except (ValueError, AttributeError):
                 # 잘못된 형식의 birth_time은 0시로 처리
                 hour = 0
+        return hour
 
-        # 간지 계산
-        ganzhi = self.get_ganzhi(year, month, day, hour)
-
-        # 일간 (나를 나타내는 천간)
-        day_gan = ganzhi['day'][0]
+    def build_chart(self, birthdate: date, birth_time: str = None,
+                    calendar_type: str = 'solar', gender: str = 'male') -> SajuChart:
+        """
+        사주 차트 생성 (섹션은 접근할 때 계산)
 
-        # 사주팔자 구성
-        pillars = {
-            'year': ganzhi['year'],
-            'month': ganzhi['month'],
-            'day': ganzhi['day'],
-            'hour': ganzhi['hour']
-        }
+        Args:
+            birthdate: 생년월일
+            birth_time: 태어난 시간 (HH:MM 형식 또는 "23-01" 형식)
+            calendar_type: 'solar' 또는 'lunar'
+            gender: 'male' 또는 'female'
 
-        # 십성 계산
-        sipsung = {
-            'year': self.get_sipsung(day_gan, pillars['year'][0]),
-            'month': self.get_sipsung(day_gan, pillars['month'][0]),
-            'day': '日干',
-            'hour': self.get_sipsung(day_gan, pillars['hour'][0])
-        }
+        Returns:
+            SajuChart
+        """
+        # 음력인 경우 양력으로 변환
+        if calendar_type == 'lunar':
+            birthdate = lunar_to_solar(birthdate.year, birthdate.month, birthdate.day, False)
 
-        # 지지의 십성
-        sipsung_jiji = {
-            'year': self.get_sipsung_jiji(day_gan, pillars['year'][1]),
-            'month': self.get_sipsung_jiji(day_gan, pillars['month'][1]),
-            'day': self.get_sipsung_jiji(day_gan, pillars['day'][1]),
-            'hour': self.get_sipsung_jiji(day_gan, pillars['hour'][1])
-        }
+        return self.chart_from_solar(birthdate, self.parse_hour(birth_time), gender)
 
-        # 십이운성
-        sipiunsung = {
-            'year': self.get_sipiunsung(day_gan, pillars['year'][1]),
-            'month': self.get_sipiunsung(day_gan, pillars['month'][1]),
-            'day': self.get_sipiunsung(day_gan, pillars['day'][1]),
-            'hour': self.get_sipiunsung(day_gan, pillars['hour'][1])
-        }
+    def chart_from_solar(self, solar_date: date, hour: int = 0, gender: str = 'male') -> SajuChart:
+        """양력 날짜와 시(0-23)로 사주 차트 생성 (입력 정규화가 끝난 경우)"""
+        codes = self.pillar_codes(solar_date.year, solar_date.month, solar_date.day, hour)
+        return SajuChart(self, codes, solar_date.year, kst_minutes(solar_date, codes.jis[HOUR] * 2), gender)
 
-        # 오행 분석
-        ohang_analysis = self.analyze_ohang(pillars)
+    def calculate_saju(self, birthdate: date, birth_time: str = None,
+                      calendar_type: str = 'solar', gender: str = 'male') -> Dict:
+        """
+        사주팔자 계산
 
-        # 대운 계산 (생월과 생일 정보 전달)
-        daeun = self.calculate_daeun(year, pillars['month'][0], pillars['month'][1], gender, month, day)
+        Args:
+            birthdate: 생년월일
+            birth_time: 태어난 시간 (HH:MM 형식 또는 "23-01" 형식)
+            calendar_type: 'solar' 또는 'lunar'
+            gender: 'male' 또는 'female'
 
-        # 신강신약 계산
-        strength = self.calculate_strength(pillars, ohang_analysis)
+        Returns:
+            사주 데이터
+        """
+        return self.build_chart(birthdate, birth_time, calendar_type, gender).to_dict()
 
-        # 용신 계산
-        yongsin = self.calculate_yongsin(day_gan, ohang_analysis, strength)
+    def calculate_saju_solar(self, solar_date: date, hour: int = 0, gender: str = 'male') -> Dict:
+        """양력 날짜와 시(0-23)로 사주팔자 계산 (입력 정규화가 끝난 경우)"""
+        return self.chart_from_solar(solar_date, hour, gender).to_dict()
 
-        # 합충형파해 계산
-        hap_chung = self.calculate_hap_chung_hyeong_pa_hae(pillars)
+    def analyze_codes(self, codes: PillarCodes, birth_year: int, birth_minutes: int, gender: str) -> SajuRecord:
+        """정수 코드 기준 사주 분석 (문자열을 만들지 않음, birth_minutes는 kst_minutes 출생 시각)"""
+        return SajuChart(self, codes, birth_year, birth_minutes, gender).record
 
-        # 신살 계산
-        sinsals = self.calculate_sinsals(pillars)
+    def serialize_record(self, record: SajuRecord) -> Dict:
+        """SajuRecord → calculate_saju 결과 사전 (문자열은 여기서만 생성)"""
+        return SajuChart.from_record(self, record).to_dict()
 
-        return {
-            'pillars': {
-                'cheongan': [pillars['hour'][0], pillars['day'][0],
-                           pillars['month'][0], pillars['year'][0]],
-                'jiji': [pillars['hour'][1], pillars['day'][1],
-                        pillars['month'][1], pillars['year'][1]],
-                'sipsung': [sipsung['hour'], sipsung['day'],
-                          sipsung['month'], sipsung['year']],
-                'sipsung_jiji': [sipsung_jiji['hour'], sipsung_jiji['day'],
-                               sipsung_jiji['month'], sipsung_jiji['year']],
-                'sipiunsung': [sipiunsung['hour'], sipiunsung['day'],
-                             sipiunsung['month'], sipiunsung['year']]
-            },
-            'day_gan': day_gan,
-            'ohang': ohang_analysis,
-            'daeun': daeun,
-            'strength': strength,
-            'yongsin': yongsin,
-            'hap_chung_hyeong_pa_hae': hap_chung,  # 합충형파해 추가
-            'sinsals': sinsals  # 신살 추가
-        }
+    def _pillars_to_codes(self, pillars: Dict) -> PillarCodes:
+        """{'year': (천간, 지지), ...} 문자 기둥 → PillarCodes"""
+        return PillarCodes(
+            gans=tuple(self.CHEONGAN_INDEX[pillars[key][0]] for key in PILLAR_KEYS),
+            jis=tuple(self.JIJI_INDEX[pillars[key][1]] for key in PILLAR_KEYS)
+        )
 
     def get_sipsung(self, day_gan: str, target_gan: str) -> str:
         """십성 구하기"""
-        key = (day_gan, target_gan)
-        return self.SIPSUNG_MAP.get(key, '')
+        if day_gan not in self.CHEONGAN_INDEX or target_gan not in self.CHEONGAN_INDEX:
+            return ''
+        code = self.SIPSUNG_TABLE[self.CHEONGAN_INDEX[day_gan]][self.CHEONGAN_INDEX[target_gan]]
+        return self.SIPSUNG_NAMES[code]
 
     def get_sipsung_jiji(self, day_gan: str, jiji: str) -> str:
         """지지의 주요 십성 구하기 (지장간 중 본기 기준)"""
-        # 지장간 본기
-        jiji_bongi = {
-            '子': '癸', '丑': '己', '寅': '甲', '卯': '乙',
-            '辰': '戊', '巳': '丙', '午': '丁', '未': '己',
-            '申': '庚', '酉': '辛', '戌': '戊', '亥': '壬'
-        }
-        bongi = jiji_bongi.get(jiji, '')
-        return self.get_sipsung(day_gan, bongi)
+        if jiji not in self.JIJI_INDEX:
+            return ''
+        return self.get_sipsung(day_gan, self.CHEONGAN[self.JI_BONGI[self.JIJI_INDEX[jiji]]])
 
     def get_sipiunsung(self, day_gan: str, jiji: str) -> str:
         """십이운성 구하기"""
-        if day_gan in self.SIPIUNSUNG_MAP:
-            return self.SIPIUNSUNG_MAP[day_gan].get(jiji, '')
-        return ''
+        if day_gan not in self.CHEONGAN_INDEX or jiji not in self.JIJI_INDEX:
+            return ''
+        code = self.SIPIUNSUNG_TABLE[self.CHEONGAN_INDEX[day_gan]][self.JIJI_INDEX[jiji]]
+        return self.SIPIUNSUNG_NAMES[code]
+
+    def _ohang_counts(self, codes: PillarCodes) -> List[int]:
+        """오행 코드별 개수 (천간 4 + 지지 4)"""
+        counts = [0] * 5
+        for gan in codes.gans:
+            counts[self.GAN_OHANG[gan]] += 1
+        for ji in codes.jis:
+            counts[self.JI_OHANG[ji]] += 1
+        return counts
+
+    @staticmethod
+    def _ohang_percent(count: int, total: int = 8) -> float:
+        return round((count / total * 100), 1) if total > 0 else 0
+
+    def _ohang_result(self, counts: Tuple[int, ...]) -> OhangResult:
+        """오행 개수 → 결과 객체"""
+        total = sum(counts)
+        percents = tuple(self._ohang_percent(count, total) for count in counts)
+        return OhangResult(
+            names=tuple(self.OHANG_NAMES),
+            counts=counts,
+            percents=percents,
+            statuses=tuple(self.get_ohang_status(percent) for percent in percents)
+        )
+
+    def _serialize_ohang(self, counts: List[int]) -> Dict:
+        return self._ohang_result(tuple(counts)).to_dict()
 
     def analyze_ohang(self, pillars: Dict) -> Dict:
         """오행 분석"""
-        ohang_count = {'木': 0, '火': 0, '土': 0, '金': 0, '水': 0}
-
-        # 천간 오행
-        for pillar in ['hour', 'day', 'month', 'year']:
-            gan = pillars[pillar][0]
-            if gan in self.OHANG:
-                ohang_count[self.OHANG[gan]] += 1
-
-        # 지지 오행
+        counts = [0] * 5
         for pillar in ['hour', 'day', 'month', 'year']:
-            ji = pillars[pillar][1]
-            if ji in self.OHANG:
-                ohang_count[self.OHANG[ji]] += 1
-
-        # 총 개수
-        total = sum(ohang_count.values())
-
-        # 퍼센트 계산
-        ohang_percent = {}
-        for ohang, count in ohang_count.items():
-            percent = round((count / total * 100), 1) if total > 0 else 0
-            status = self.get_ohang_status(percent)
-            ohang_percent[ohang] = {
-                'count': count,
-                'percent': percent,
-                'status': status
-            }
-
-        return ohang_percent
+            gan, ji = pillars[pillar][0], pillars[pillar][1]
+            if gan in self.CHEONGAN_INDEX:
+                counts[self.GAN_OHANG[self.CHEONGAN_INDEX[gan]]] += 1
+            if ji in self.JIJI_INDEX:
+                counts[self.JI_OHANG[self.JIJI_INDEX[ji]]] += 1
+        return self._serialize_ohang(counts)
 
     def get_ohang_status(self, percent: float) -> str:
         """오행 상태 판단"""
-        if percent < 10:
-            return '부족'
-        elif percent < 15:
-            return '약함'
-        elif percent < 25:
-            return '적정'
-        elif percent < 35:
-            return '발달'
-        else:
-            return '과다'
+        return self.OHANG_STATUS_NAMES[bisect_right(self.OHANG_STATUS_THRESHOLDS, percent)]
 
     def calculate_daeun(self, birth_year: int, month_gan: str, month_ji: str,
                        gender: str, birth_month: int = 1, birth_day: int = 1) -> Dict:
-        """대운 계산"""
-        # 양남음녀는 순행, 음남양녀는 역행
-        year_gan_index = (birth_year - 4) % 10
-        is_yang_year = year_gan_index % 2 == 0
-        is_male = gender == 'male'
-
-        is_forward = (is_yang_year and is_male) or (not is_yang_year and not is_male)
-
-        # 대운 시작 나이 계산 (절기 기준 간략화)
-        # 실제로는 생월생일에 따라 다음/이전 절기까지 일수를 계산하지만,
-        # 여기서는 생월을 기준으로 근사치 계산
-        # 생월 초순(1-10일): 1~3세, 중순(11-20일): 4~6세, 하순(21-31일): 7~9세
-        if birth_day <= 10:
-            start_age = 2
-        elif birth_day <= 20:
-            start_age = 5
-        else:
-            start_age = 8
+        """대운 계산 (출생 시각을 모르므로 생일 0시 기준)"""
+        minutes = kst_minutes(date(birth_year, birth_month, birth_day))
+        step = self.daeun_step((self.saju_month(minutes)[0] - 4) % 10, gender)
+        return self._serialize_daeun(
+            birth_year, self.CHEONGAN_INDEX[month_gan], self.JIJI_INDEX[month_ji],
+            self.daeun_start_age(minutes, step), step
+        )
 
-        # 대운 주기 생성
-        month_gan_index = self.CHEONGAN.index(month_gan)
-        month_ji_index = self.JIJI.index(month_ji)
+    @staticmethod
+    def daeun_step(year_gan: int, gender: str) -> int:
+        """년간 기준 양남음녀는 순행(1), 음남양녀는 역행(-1)"""
+        is_yang_year = year_gan % 2 == 0
+        return 1 if is_yang_year == (gender == 'male') else -1
 
-        periods = []
-        current_year = birth_year + start_age
+    def daeun_start_age(self, birth_minutes: int, step: int) -> int:
+        """
+        대운 시작 나이 (출생 시각부터 절입까지 3일 = 1년, 반올림해 1~10세)
 
-        for i in range(7):  # 7개 대운 생성
-            if is_forward:
-                daeun_gan = self.CHEONGAN[(month_gan_index + i + 1) % 10]
-                daeun_ji = self.JIJI[(month_ji_index + i + 1) % 12]
-            else:
-                daeun_gan = self.CHEONGAN[(month_gan_index - i - 1) % 10]
-                daeun_ji = self.JIJI[(month_ji_index - i - 1) % 12]
-
-            periods.append({
-                'year': current_year,
-                'age': start_age + i * 10,
-                'gan': daeun_gan,
-                'ji': daeun_ji
-            })
-            current_year += 10
+        순행은 다음 절까지, 역행은 직전 절부터 출생까지의 시간으로 계산합니다.
+        절기 테이블 범위 밖은 생일로 근사합니다.
+        """
+        table = get_solar_term_table()
+        if not table.covers(birth_minutes):
+            # 생월 초순(1-10일): 2세, 중순(11-20일): 5세, 하순(21-31일): 8세
+            birth_day = minutes_to_datetime(birth_minutes).day
+            return 2 if birth_day <= 10 else 5 if birth_day <= 20 else 8
+
+        prev_jeol, next_jeol = table.jeol_bounds(birth_minutes)
+        minutes = next_jeol - birth_minutes if step > 0 else birth_minutes - prev_jeol
+        return min(10, max(1, (minutes + 2160) // 4320))  # 4320분 = 3일
+
+    def _daeun_result(self, birth_year: int, month_gan: int, month_ji: int,
+                      start_age: int, step: int) -> DaeunResult:
+        daeun = self.iter_daeun(birth_year, month_gan, month_ji, start_age, step)
+        return DaeunResult(start_age, tuple(
+            LuckPeriod(pillar.year, pillar.age, self.CHEONGAN[pillar.gan], self.JIJI[pillar.ji])
+            for pillar in islice(daeun, 7)  # 7개 대운
+        ))
+
+    def _serialize_daeun(self, birth_year: int, month_gan: int, month_ji: int,
+                         start_age: int, step: int) -> Dict:
+        return self._daeun_result(birth_year, month_gan, month_ji, start_age, step).to_dict()
+
+    def iter_daeun(self, birth_year: int, month_gan: int, month_ji: int,
+                   start_age: int, step: int, first: int = 0) -> Iterator[LuckPillar]:
+        """
+        대운을 first번째(0부터)부터 끝없이 생성
 
-        return {
-            'start_age': start_age,
-            'periods': periods
+        n번째 대운은 월주에서 step 방향으로 n + 1칸 이동한 간지이고 start_age + 10n세에 시작합니다.
+        """
+        gan = (month_gan + step * (first + 1)) % 10
+        ji = (month_ji + step * (first + 1)) % 12
+        age = start_age + first * 10
+        while True:
+            yield LuckPillar('daeun', birth_year + age, 0, age, gan, ji)
+            gan = (gan + step) % 10
+            ji = (ji + step) % 12
+            age += 10
+
+    def iter_seun(self, start_year: int, birth_year: int) -> Iterator[LuckPillar]:
+        """start_year부터 세운(년주)을 끝없이 생성"""
+        year = start_year
+        gan, ji = (year - 4) % 10, (year - 4) % 12
+        while True:
+            yield LuckPillar('seun', year, 0, year - birth_year, gan, ji)
+            year += 1
+            gan = (gan + 1) % 10
+            ji = (ji + 1) % 12
+
+    def iter_wolun(self, start_year: int, start_month: int, birth_year: int) -> Iterator[LuckPillar]:
+        """
+        start_year년 start_month월부터 월운(월주)을 끝없이 생성
+
+        각 달의 월운은 그달에 드는 절(節)부터의 월주입니다 (1월은 전년도 丑월, 2월은 寅월, ...).
+        """
+        year, month = start_year, start_month
+        ji = month % 12
+        gan = self._month_gan((year - (1 if month == 1 else 0) - 4) % 10, ji)
+        while True:
+            yield LuckPillar('wolun', year, month, year - birth_year, gan, ji)
+            # 월주는 육십갑자 순서로 이어지므로 천간/지지도 한 칸씩 진행 (입춘에서도 이어짐)
+            gan = (gan + 1) % 10
+            ji = (ji + 1) % 12
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+    def serialize_luck(self, pillar: LuckPillar) -> Dict:
+        """LuckPillar → 결과 사전 (대운 periods 항목과 같은 키, 월운은 month 추가)"""
+        result = {
+            'year': pillar.year,
+            'age': pillar.age,
+            'gan': self.CHEONGAN[pillar.gan],
+            'ji': self.JIJI[pillar.ji]
         }
+        if pillar.unit == 'wolun':
+            result['month'] = pillar.month
+        return result
+
+    def luck_timeline(self, chart: SajuChart, unit: str, start: Optional[date] = None,
+                      count: Optional[int] = None) -> Iterator[Dict]:
+        """
+        사주 차트의 대운/세운/월운을 지연 생성
+
+        필요한 만큼만 꺼내 쓰면 되므로 평생 운세도 전체를 계산/직렬화하지 않고 나눠 볼 수 있습니다.
+        (예: 앞으로 36개월 → luck_timeline(chart, 'wolun', date.today(), 36))
+
+        Args:
+            chart: 사주 차트
+            unit: 'daeun'(10년) / 'seun'(1년) / 'wolun'(1개월)
+            start: 시작 시점 (None이면 대운은 첫 대운, 세운/월운은 출생년 1월).
+                   대운은 start가 속한 대운부터 시작합니다.
+            count: 생성할 개수 (None이면 끝없이)
+
+        Returns:
+            결과 사전 이터레이터
+        """
+        birth_year = chart.birth_year
+        if unit == 'daeun':
+            start_age = chart._get('daeun_start')
+            first = max(0, (start.year - birth_year - start_age) // 10) if start else 0
+            gans, jis = chart.codes
+            pillars = self.iter_daeun(birth_year, gans[MONTH], jis[MONTH], start_age,
+                                      chart._get('daeun_step'), first)
+        elif unit == 'seun':
+            pillars = self.iter_seun(start.year if start else birth_year, birth_year)
+        elif unit == 'wolun':
+            pillars = self.iter_wolun(start.year if start else birth_year, start.month if start else 1, birth_year)
+        else:
+            raise ValueError(f"알 수 없는 운 단위입니다: {unit} (가능: {', '.join(LUCK_UNITS)})")
+
+        return map(self.serialize_luck, islice(pillars, count))
+
+    def _strength_code(self, same_ohang_percent: float) -> int:
+        """일간과 같은 오행의 비율 → 신강신약 코드 (0=극약 ... 6=극왕)"""
+        return bisect_right(self.STRENGTH_THRESHOLDS, same_ohang_percent)
+
+    def _serialize_strength(self, code: int) -> Dict:
+        return self.STRENGTH_RESULTS[code].to_dict()
 
     def calculate_strength(self, pillars: Dict, ohang_analysis: Dict) -> Dict:
         """신강신약 계산"""
-        day_gan = pillars['day'][0]
-        day_gan_ohang = self.OHANG[day_gan]
-
-        # 일간과 같은 오행의 비율
-        same_ohang_percent = ohang_analysis[day_gan_ohang]['percent']
-
-        # 신강신약 레벨 결정
-        if same_ohang_percent < 8:
-            level = '극약'
-            position = 5
-        elif same_ohang_percent < 12:
-            level = '태약'
-            position = 15
-        elif same_ohang_percent < 18:
-            level = '신약'
-            position = 30
-        elif same_ohang_percent < 28:
-            level = '중화'
-            position = 50
-        elif same_ohang_percent < 35:
-            level = '신강'
-            position = 70
-        elif same_ohang_percent < 42:
-            level = '태강'
-            position = 85
+        day_gan_ohang = self.OHANG[pillars['day'][0]]
+        return self._serialize_strength(self._strength_code(ohang_analysis[day_gan_ohang]['percent']))
+
+    def _yongsin_codes(self, day_ohang: int, strength_code: int) -> Tuple[int, int, int]:
+        """용신/희신/기신 오행 코드 (木0 → 火1 → 土2 → 金3 → 水4 순으로 생, 두 칸 뒤를 극)"""
+        # 신약한 경우 - 나를 생하는 오행이 용신, 희신은 나와 같은 오행, 기신은 나를 극하는 오행
+        if strength_code in self.WEAK_STRENGTH_CODES:
+            yongsin, heesin, gisin = (day_ohang - 1) % 5, day_ohang, (day_ohang - 2) % 5
+        # 신강한 경우 - 나를 설기하는 오행이 용신, 희신은 내가 극하는 오행, 기신은 나와 같은 오행
         else:
-            level = '극왕'
-            position = 95
+            yongsin, heesin, gisin = (day_ohang + 1) % 5, (day_ohang + 2) % 5, day_ohang
+        return yongsin, heesin, gisin
 
-        return {
-            'level': level,
-            'position': position
-        }
+    def _yongsin_result(self, codes: Tuple[int, int, int]) -> YongsinResult:
+        """용신/희신/기신 코드 → 결과 객체"""
+        yongsin, heesin, gisin = codes
+        return YongsinResult(self.OHANG_KR_NAMES[yongsin], self.OHANG_KR_NAMES[heesin], self.OHANG_KR_NAMES[gisin])
+
+    def _serialize_yongsin(self, codes: Tuple[int, int, int]) -> Dict:
+        return self._yongsin_result(tuple(codes)).to_dict()
 
     def calculate_yongsin(self, day_gan: str, ohang_analysis: Dict, strength: Dict) -> Dict:
         """용신 계산"""
-        day_gan_ohang = self.OHANG[day_gan]
+        day_ohang = self.GAN_OHANG[self.CHEONGAN_INDEX[day_gan]]
+        return self._serialize_yongsin(self._yongsin_codes(day_ohang, self.STRENGTH_LEVELS.index(strength['level'])))
 
-        # 오행 상생상극 관계
-        sheng = {'木': '火', '火': '土', '土': '金', '金': '水', '水': '木'}  # 생
-        ke = {'木': '土', '土': '水', '水': '火', '火': '金', '金': '木'}    # 극
-
-        # 신약한 경우 - 나를 생하는 오행이 용신
-        if strength['level'] in ['극약', '태약', '신약']:
-            reverse_sheng = {v: k for k, v in sheng.items()}
-            yongsin_ohang = reverse_sheng.get(day_gan_ohang, '水')
-            heesin_ohang = day_gan_ohang  # 희신은 나와 같은 오행
+    def daily_delta(self, chart: SajuChart, target_date: date) -> DailyDelta:
+        """
+        오늘 일진과 원국의 관계만 계산
 
-            # 기신은 나를 극하는 오행
-            reverse_ke = {v: k for k, v in ke.items()}
-            gisin_ohang = reverse_ke.get(day_gan_ohang, '土')
+        원국은 바뀌지 않으므로 (캐시된) 차트의 정수 코드와 그날 일주만으로 일간 기준 십성/십이운성과
+        원국 네 기둥과의 천간합/지지 육합/반합/충/형/해를 테이블 조회로 구합니다.
+        차트 섹션은 계산하지 않습니다.
 
-        # 신강한 경우 - 나를 설기하는 오행이 용신
-        else:
-            yongsin_ohang = sheng.get(day_gan_ohang, '水')  # 내가 생하는 오행
-            heesin_ohang = ke.get(day_gan_ohang, '土')      # 희신은 나를 극하는 오행
-            gisin_ohang = day_gan_ohang                      # 기신은 나와 같은 오행
-
-        # 오행을 한글로 변환
-        ohang_kr = {'木': '목', '火': '화', '土': '토', '金': '금', '水': '수'}
+        Args:
+            chart: 원국 사주 차트
+            target_date: 날짜
 
-        return {
-            'yongsin': ohang_kr.get(yongsin_ohang, '수'),
-            'heesin': ohang_kr.get(heesin_ohang, '금'),
-            'gisin': ohang_kr.get(gisin_ohang, '토')
-        }
+        Returns:
+            DailyDelta
+        """
+        gans, jis = chart.codes
+        day_gan = gans[DAY]
+        day_index = self.day_pillar_index(target_date.toordinal())
+        gan, ji = day_index % 10, day_index % 12
+        today_gan, today_ji = self.CHEONGAN[gan], self.JIJI[ji]
+
+        found = {kind: [] for kind in RELATION_KINDS}
+        for i in range(4):
+            natal_gan, natal_ji = self.CHEONGAN[gans[i]], self.JIJI[jis[i]]
+            if self.STEM_RELATION_TABLE[gans[i]][gan] >> RELATION_CHEONGAN_HAP & 1:
+                found['cheongan_hap'].append(DayRelation(
+                    'cheongan_hap', i, natal_gan, today_gan, result=self.CHEONGAN_HAP_TABLE[gans[i]][gan]))
+
+            cell = self.BRANCH_RELATION_TABLE[jis[i]][ji]
+            if cell >> RELATION_YUKHAP & 1:
+                found['jiji_yukhap'].append(DayRelation(
+                    'jiji_yukhap', i, natal_ji, today_ji, result=self.YUKHAP_TABLE[jis[i]][ji]))
+            if cell >> RELATION_CHUNG & 1:
+                found['jiji_chung'].append(DayRelation('jiji_chung', i, natal_ji, today_ji))
+            if cell >> RELATION_HAE & 1:
+                found['jiji_hae'].append(DayRelation('jiji_hae', i, natal_ji, today_ji))
+            # 삼합/형 그룹은 서로 다른 두 지지가 같은 그룹에 들 때만 (같은 지지는 관계 아님)
+            if jis[i] != ji:
+                for n, (_, element) in enumerate(self.SAMHAP_CODES):
+                    if cell >> (RELATION_SAMHAP + n) & 1:
+                        found['jiji_samhap'].append(DayRelation('jiji_samhap', i, natal_ji, today_ji, result=element))
+                for n, (_, hyeong_type) in enumerate(self.HYEONG_CODES):
+                    if cell >> (RELATION_HYEONG + n) & 1:
+                        found['jiji_hyeong'].append(DayRelation('jiji_hyeong', i, natal_ji, today_ji, label=hyeong_type))
+
+        return DailyDelta(
+            date=target_date,
+            gan=today_gan,
+            ji=today_ji,
+            sipsung=self.SIPSUNG_NAMES[self.SIPSUNG_TABLE[day_gan][gan]],
+            sipsung_jiji=self.SIPSUNG_NAMES[self.SIPSUNG_TABLE[day_gan][self.JI_BONGI[ji]]],
+            sipiunsung=self.SIPIUNSUNG_NAMES[self.SIPIUNSUNG_TABLE[day_gan][ji]],
+            relations=tuple(relation for kind in RELATION_KINDS for relation in found[kind])
+        )
 
     def get_daily_fortune_info(self, target_date: date) -> Dict:
         """
@@ -467,37 +1101,23 @@ class SajuCalculator:
                 'description': '설명'
             }
         """
-        year = target_date.year
         month = target_date.month
-        day = target_date.day
 
         # 일주 간지 계산
-        base_date = datetime(1900, 1, 1)
-        target_datetime = datetime(year, month, day)
-        days_diff = (target_datetime - base_date).days
-        day_index = (days_diff + 16) % 60
-        day_gan = self.CHEONGAN[day_index % 10]
-        day_ji = self.JIJI[day_index % 12]
+        day_index = self.day_pillar_index(target_date.toordinal())
+        gan_index = day_index % 10
+        ji_index = day_index % 12
+        day_gan = self.CHEONGAN[gan_index]
+        day_ji = self.JIJI[ji_index]
 
         # 한글 간지
-        gan_kr = self.CHEONGAN_KR[day_index % 10]
-        ji_kr = self.JIJI_KR[day_index % 12]
-        ganzhi_kr = f'{gan_kr}{ji_kr}'
+        ganzhi_kr = f'{self.CHEONGAN_KR[gan_index]}{self.JIJI_KR[ji_index]}'
 
         # 오행
-        day_ohang = self.OHANG[day_gan]
+        day_ohang = self.OHANG_NAMES[self.GAN_OHANG[gan_index]]
 
-        # 12신살 계산 (지지 기반)
-        ji_index = self.JIJI.index(day_ji)
-
-        # 12신살 순서: 청룡, 명당, 천형, 주작, 금궤, 천덕, 백호, 옥당, 천뢰, 현무, 사명, 구진
-        sinsals = ['청룡', '명당', '천형', '주작', '금궤', '천덕',
-                   '백호', '옥당', '천뢰', '현무', '사명', '구진']
-
-        # 월건 기준으로 12신살 시작점 조정 (간략화)
-        start_index = (month - 1) % 12
-        sinsal_index = (ji_index + start_index) % 12
-        sinsal = sinsals[sinsal_index]
+        # 12신살 계산 (지지 기반, 월건 기준으로 시작점 조정 - 간략화)
+        sinsal = self.DAY_SINSALS[self.day_sinsal_index(ji_index, month)]
 
         # 길흉 판단
         luck_level = self._determine_luck_level(sinsal, day_gan, day_ji)
@@ -520,6 +1140,10 @@ class SajuCalculator:
             'description': description
         }
 
+    def day_sinsal_index(self, day_ji: int, month: int) -> int:
+        """일지 코드와 양력 월 → DAY_SINSALS 인덱스 (배열도 그대로 받음)"""
+        return (day_ji + month - 1) % 12
+
     def _determine_luck_level(self, sinsal: str, gan: str, ji: str) -> str:
         """길흉 등급 판단"""
         # 대길일
@@ -601,47 +1225,31 @@ class SajuCalculator:
         Returns:
             궁합 분석 정보
         """
-        # 각자의 사주 계산
-        saju1 = self.calculate_saju(birthdate1, None, 'solar', gender1)
-        saju2 = self.calculate_saju(birthdate2, None, 'solar', gender2)
-
-        # 일주 추출
-        day_gan1 = saju1['pillars']['cheongan'][2]
-        day_ji1 = saju1['pillars']['jiji'][2]
-        day_gan2 = saju2['pillars']['cheongan'][2]
-        day_ji2 = saju2['pillars']['jiji'][2]
-
-        # 일간(日干)의 오행 추출 (CHEONGAN은 이미 한자)
-        ohang1 = self.OHANG.get(day_gan1, '土')
-        ohang2 = self.OHANG.get(day_gan2, '土')
-
-        # 오행 상생상극 판단
-        ohang_relation = self._get_ohang_relation(ohang1, ohang2)
-
-        # 일주 궁합 판단
-        ilju_compatibility = self._get_ilju_compatibility(day_gan1, day_ji1, day_gan2, day_ji2)
+        # 궁합은 두 사람의 일주에만 의존하므로 60×60 테이블에서 조회
+        return get_compatibility_matrix(self).result(
+            self.day_pillar_index(birthdate1.toordinal()),
+            self.day_pillar_index(birthdate2.toordinal())
+        )
 
-        # 지지 육합/삼합/충/형/해 판단
-        jiji_relation = self._get_jiji_relation(day_ji1, day_ji2)
+    def rank_compatibility(self, birthdate: date, candidates: Sequence[date],
+                           limit: Optional[int] = None) -> List[Dict]:
+        """
+        한 사람과 여러 후보의 일주 궁합을 점수 높은 순으로 정렬
 
-        # 총 궁합 점수 계산 (100점 만점)
-        score = self._calculate_compatibility_score(ohang_relation, ilju_compatibility, jiji_relation)
+        Args:
+            birthdate: 기준 생년월일 (양력)
+            candidates: 후보 생년월일 목록 (양력)
+            limit: 상위 몇 명까지 (None이면 전체)
 
-        return {
-            'person1': {
-                'day_pillar': f'{day_gan1}{day_ji1}',
-                'ohang': ohang1
-            },
-            'person2': {
-                'day_pillar': f'{day_gan2}{day_ji2}',
-                'ohang': ohang2
-            },
-            'ohang_relation': ohang_relation,
-            'ilju_compatibility': ilju_compatibility,
-            'jiji_relation': jiji_relation,
-            'score': score,
-            'level': self._get_compatibility_level(score)
-        }
+        Returns:
+            [{'index': candidates 내 위치, 'day_pillar', 'score', 'level'}]
+        """
+        ordinals = np.fromiter((d.toordinal() for d in candidates), dtype=np.int64, count=len(candidates))
+        return get_compatibility_matrix(self).rank(
+            self.day_pillar_index(birthdate.toordinal()),
+            self.day_pillar_index(ordinals),
+            limit
+        )
 
     def _get_ohang_relation(self, ohang1: str, ohang2: str) -> Dict:
         """오행 상생상극 관계"""
@@ -825,8 +1433,8 @@ class SajuCalculator:
         # 월별 간지 계산 (간단 버전 - 정월 기준)
         monthly_ganzhi = self._calculate_monthly_ganzhi(year, year_gan)
 
-        # 대길일 찾기 (청룡, 명당, 금궤, 천덕 날)
-        lucky_days = self._find_lucky_days(year)
+        # 대길일 (청룡, 명당, 금궤, 천덕 날) - 연간 일진 달력에서 전체 목록
+        lucky_days = self.year_almanac(year).lucky_days()
 
         return {
             'year': year,
@@ -866,30 +1474,9 @@ class SajuCalculator:
 
         return monthly
 
-    def _find_lucky_days(self, year: int) -> list:
-        """년도의 대길일 찾기 (샘플)"""
-        from datetime import date as dt_date, timedelta
-
-        lucky_days = []
-        start_date = dt_date(year, 1, 1)
-
-        # 1년간 순회하며 청룡, 명당, 금궤, 천덕 날 찾기
-        for day_offset in range(0, 365, 10):  # 성능을 위해 10일마다만 체크
-            check_date = start_date + timedelta(days=day_offset)
-            if check_date.year != year:
-                break
-
-            daily_info = self.get_daily_fortune_info(check_date)
-
-            if daily_info['sinsal'] in ['청룡', '명당', '금궤', '천덕']:
-                if len(lucky_days) < 12:  # 최대 12개만
-                    lucky_days.append({
-                        'date': check_date.strftime('%m월 %d일'),
-                        'ganzhi': daily_info['ganzhi_kr'],
-                        'sinsal': daily_info['sinsal']
-                    })
-
-        return lucky_days
+    def year_almanac(self, year: int) -> YearAlmanac:
+        """연간 일진 달력 (년도별로 한 번 계산해 모듈 캐시에 보관)"""
+        return get_year_almanac(self, year)
 
     def calculate_hap_chung_hyeong_pa_hae(self, pillars: Dict) -> Dict:
         """
@@ -901,177 +1488,66 @@ class SajuCalculator:
         Returns:
             합충형파해 분석 결과
         """
-        result = {
-            'cheongan_hap': [],      # 천간합
-            'jiji_yukhap': [],        # 지지 육합
-            'jiji_samhap': [],        # 지지 삼합
-            'jiji_chung': [],         # 지지 충
-            'jiji_hyeong': [],        # 지지 형
-            'jiji_hae': [],           # 지지 해
-            'summary': ''
-        }
-
-        # 천간 추출
-        gans = [pillars['year'][0], pillars['month'][0], pillars['day'][0], pillars['hour'][0]]
-        gan_positions = ['년간', '월간', '일간', '시간']
-
-        # 지지 추출
-        jis = [pillars['year'][1], pillars['month'][1], pillars['day'][1], pillars['hour'][1]]
-        ji_positions = ['년지', '월지', '일지', '시지']
-
-        # === 천간합 체크 ===
-        cheongan_hap_pairs = {
-            ('甲', '己'): '토',
-            ('乙', '庚'): '금',
-            ('丙', '辛'): '수',
-            ('丁', '壬'): '목',
-            ('戊', '癸'): '화'
-        }
-
-        for i in range(len(gans)):
-            for j in range(i + 1, len(gans)):
-                pair = (gans[i], gans[j])
-                reverse_pair = (gans[j], gans[i])
-
-                if pair in cheongan_hap_pairs:
-                    result['cheongan_hap'].append({
-                        'positions': [gan_positions[i], gan_positions[j]],
-                        'gans': [gans[i], gans[j]],
-                        'result': cheongan_hap_pairs[pair],
-                        'description': f'{gan_positions[i]}({gans[i]})과 {gan_positions[j]}({gans[j]})이 합하여 {cheongan_hap_pairs[pair]}으로 화합니다.'
-                    })
-                elif reverse_pair in cheongan_hap_pairs:
-                    result['cheongan_hap'].append({
-                        'positions': [gan_positions[i], gan_positions[j]],
-                        'gans': [gans[i], gans[j]],
-                        'result': cheongan_hap_pairs[reverse_pair],
-                        'description': f'{gan_positions[i]}({gans[i]})과 {gan_positions[j]}({gans[j]})이 합하여 {cheongan_hap_pairs[reverse_pair]}으로 화합니다.'
-                    })
-
-        # === 지지 육합 체크 ===
-        yukhap_pairs = {
-            ('子', '丑'): '토', ('寅', '亥'): '목', ('卯', '戌'): '화',
-            ('辰', '酉'): '금', ('巳', '申'): '수', ('午', '未'): '화'
-        }
-
-        for i in range(len(jis)):
-            for j in range(i + 1, len(jis)):
-                pair = (jis[i], jis[j])
-                reverse_pair = (jis[j], jis[i])
-
-                if pair in yukhap_pairs:
-                    result['jiji_yukhap'].append({
-                        'positions': [ji_positions[i], ji_positions[j]],
-                        'jis': [jis[i], jis[j]],
-                        'result': yukhap_pairs[pair],
-                        'description': f'{ji_positions[i]}({jis[i]})와 {ji_positions[j]}({jis[j]})이 육합을 이룹니다.'
-                    })
-                elif reverse_pair in yukhap_pairs:
-                    result['jiji_yukhap'].append({
-                        'positions': [ji_positions[i], ji_positions[j]],
-                        'jis': [jis[i], jis[j]],
-                        'result': yukhap_pairs[reverse_pair],
-                        'description': f'{ji_positions[i]}({jis[i]})와 {ji_positions[j]}({jis[j]})이 육합을 이룹니다.'
-                    })
-
-        # === 지지 삼합 체크 ===
-        samhap_groups = [
-            (['申', '子', '辰'], '수'),
-            (['寅', '午', '戌'], '화'),
-            (['巳', '酉', '丑'], '금'),
-            (['亥', '卯', '未'], '목')
-        ]
-
-        for group, element in samhap_groups:
-            found_jis = []
-            found_positions = []
-            for i, ji in enumerate(jis):
-                if ji in group:
-                    found_jis.append(ji)
-                    found_positions.append(ji_positions[i])
-
-            if len(found_jis) >= 2:
-                result['jiji_samhap'].append({
-                    'positions': found_positions,
-                    'jis': found_jis,
-                    'result': element,
-                    'complete': len(found_jis) == 3,
-                    'description': f'{", ".join(found_positions)}이 {element} 삼합을 이룹니다.' if len(found_jis) == 3 else f'{", ".join(found_positions)}이 {element} 삼합의 일부를 이룹니다.'
-                })
-
-        # === 지지 충 체크 ===
-        chung_pairs = [
-            ('子', '午'), ('丑', '未'), ('寅', '申'),
-            ('卯', '酉'), ('辰', '戌'), ('巳', '亥')
-        ]
-
-        for i in range(len(jis)):
-            for j in range(i + 1, len(jis)):
-                for c1, c2 in chung_pairs:
-                    if (jis[i] == c1 and jis[j] == c2) or (jis[i] == c2 and jis[j] == c1):
-                        result['jiji_chung'].append({
-                            'positions': [ji_positions[i], ji_positions[j]],
-                            'jis': [jis[i], jis[j]],
-                            'description': f'{ji_positions[i]}({jis[i]})와 {ji_positions[j]}({jis[j]})이 충을 이룹니다. 변동과 충돌이 있을 수 있습니다.'
-                        })
-
-        # === 지지 형 체크 ===
-        hyeong_groups = [
-            (['寅', '巳', '申'], '무은지형'),
-            (['丑', '未', '戌'], '세형'),
-            (['子', '卯'], '무례지형')
-        ]
+        codes = self._pillars_to_codes(pillars)
+        return self.serialize_relations(codes, self.relation_mask(codes))
 
-        for group, hyeong_type in hyeong_groups:
-            found_jis = []
-            found_positions = []
-            for i, ji in enumerate(jis):
-                if ji in group:
-                    found_jis.append(ji)
-                    found_positions.append(ji_positions[i])
-
-            if len(found_jis) >= 2:
-                result['jiji_hyeong'].append({
-                    'positions': found_positions,
-                    'jis': found_jis,
-                    'type': hyeong_type,
-                    'description': f'{", ".join(found_positions)}이 {hyeong_type}을 이룹니다.'
-                })
-
-        # === 지지 해 체크 ===
-        hae_pairs = [
-            ('子', '未'), ('丑', '午'), ('寅', '巳'),
-            ('卯', '辰'), ('申', '亥'), ('酉', '戌')
-        ]
-
-        for i in range(len(jis)):
-            for j in range(i + 1, len(jis)):
-                for h1, h2 in hae_pairs:
-                    if (jis[i] == h1 and jis[j] == h2) or (jis[i] == h2 and jis[j] == h1):
-                        result['jiji_hae'].append({
-                            'positions': [ji_positions[i], ji_positions[j]],
-                            'jis': [jis[i], jis[j]],
-                            'description': f'{ji_positions[i]}({jis[i]})와 {ji_positions[j]}({jis[j]})이 해를 이룹니다.'
-                        })
-
-        # === 종합 요약 ===
-        summary_parts = []
-        if result['cheongan_hap']:
-            summary_parts.append(f"천간합 {len(result['cheongan_hap'])}개")
-        if result['jiji_yukhap']:
-            summary_parts.append(f"육합 {len(result['jiji_yukhap'])}개")
-        if result['jiji_samhap']:
-            summary_parts.append(f"삼합 {len(result['jiji_samhap'])}개")
-        if result['jiji_chung']:
-            summary_parts.append(f"충 {len(result['jiji_chung'])}개")
-        if result['jiji_hyeong']:
-            summary_parts.append(f"형 {len(result['jiji_hyeong'])}개")
-        if result['jiji_hae']:
-            summary_parts.append(f"해 {len(result['jiji_hae'])}개")
-
-        result['summary'] = ', '.join(summary_parts) if summary_parts else '특별한 합충형파해가 없습니다.'
+    def relation_mask(self, codes: PillarCodes) -> int:
+        """
+        합충형파해 판정 → 비트마스크 (RELATION_* 배치)
 
-        return result
+        기둥 쌍 6개에 대해 천간/지지 관계 테이블을 한 번씩 읽습니다. 쌍 관계 비트는 쌍 위치만큼
+        밀고, 삼합/형 그룹 비트(두 기둥 이상이 그룹에 속함)는 그대로 합칩니다.
+        """
+        gans, jis = codes
+        stem_table, branch_table = self.STEM_RELATION_TABLE, self.BRANCH_RELATION_TABLE
+        mask = 0
+        for bit, (i, j) in enumerate(PILLAR_PAIRS):
+            cell = stem_table[gans[i]][gans[j]] | branch_table[jis[i]][jis[j]]
+            mask |= (cell & RELATION_PAIR_FLAGS) << bit | cell & ~RELATION_PAIR_FLAGS
+        return mask
+
+    def relations_result(self, codes: PillarCodes, mask: int) -> RelationsResult:
+        """합충형파해 비트마스크 → 결과 객체"""
+        gan_codes, ji_codes = codes
+        gans = [self.CHEONGAN[g] for g in gan_codes]
+        jis = [self.JIJI[j] for j in ji_codes]
+        entries = []
+
+        def pairs(offset: int):
+            return [(i, j) for bit, (i, j) in enumerate(PILLAR_PAIRS) if mask >> (offset + bit) & 1]
+
+        def groups(offset: int, compiled):
+            for n, (group, value) in enumerate(compiled):
+                if mask >> (offset + n) & 1:
+                    found = tuple(i for i in range(4) if ji_codes[i] in group)
+                    yield found, tuple(jis[i] for i in found), value
+
+        # 천간합
+        for i, j in pairs(RELATION_CHEONGAN_HAP):
+            entries.append(RelationEntry('cheongan_hap', (i, j), (gans[i], gans[j]),
+                                         result=self.CHEONGAN_HAP_TABLE[gan_codes[i]][gan_codes[j]]))
+        # 지지 육합
+        for i, j in pairs(RELATION_YUKHAP):
+            entries.append(RelationEntry('jiji_yukhap', (i, j), (jis[i], jis[j]),
+                                         result=self.YUKHAP_TABLE[ji_codes[i]][ji_codes[j]]))
+        # 지지 삼합
+        for found, chars, element in groups(RELATION_SAMHAP, self.SAMHAP_CODES):
+            entries.append(RelationEntry('jiji_samhap', found, chars, result=element))
+        # 지지 충
+        for i, j in pairs(RELATION_CHUNG):
+            entries.append(RelationEntry('jiji_chung', (i, j), (jis[i], jis[j])))
+        # 지지 형
+        for found, chars, hyeong_type in groups(RELATION_HYEONG, self.HYEONG_CODES):
+            entries.append(RelationEntry('jiji_hyeong', found, chars, label=hyeong_type))
+        # 지지 해
+        for i, j in pairs(RELATION_HAE):
+            entries.append(RelationEntry('jiji_hae', (i, j), (jis[i], jis[j])))
+
+        return RelationsResult(tuple(entries))
+
+    def serialize_relations(self, codes: PillarCodes, mask: int) -> Dict:
+        """합충형파해 비트마스크 → 결과 사전"""
+        return self.relations_result(codes, mask).to_dict()
 
     def calculate_sinsals(self, pillars: Dict) -> Dict:
         """
@@ -1083,144 +1559,138 @@ class SajuCalculator:
         Returns:
             신살 목록과 설명
         """
-        result = {
-            'beneficial': [],  # 길신
-            'harmful': [],     # 흉신
-            'neutral': []      # 중립
-        }
+        codes = self._pillars_to_codes(pillars)
+        return self.serialize_sinsals(codes, self.sinsal_mask(codes))
+
+    def sinsal_mask(self, codes: PillarCodes) -> int:
+        """신살 판정 → 비트마스크 (SINSAL_RULES 순서로 처음 해당한 기둥 + 1)"""
+        jis = codes.jis
+        mask = 0
+        for slot, (kind, pillar, target_bits, positions) in enumerate(self.SINSAL_PROGRAM):
+            targets = target_bits[codes[kind][pillar]]
+            for i in range(4):
+                if positions >> i & 1 and targets >> jis[i] & 1:
+                    mask |= (i + 1) << (slot * SINSAL_POSITION_BITS)
+                    break
+        return mask
 
-        day_gan = pillars['day'][0]
-        day_ji = pillars['day'][1]
-        year_ji = pillars['year'][1]
+    def sinsal_masks(self, gans: np.ndarray, jis: np.ndarray) -> np.ndarray:
+        """
+        여러 사주의 신살 비트마스크 일괄 계산 (sinsal_mask와 같은 결과)
 
-        jis = [pillars['year'][1], pillars['month'][1], pillars['day'][1], pillars['hour'][1]]
+        Args:
+            gans: 천간 코드 배열 [사주 수, 4] (년, 월, 일, 시)
+            jis: 지지 코드 배열 [사주 수, 4]
 
-        # === 천을귀인 (天乙貴人) - 최고의 귀인 ===
-        cheoneur_map = {
-            '甲': ['丑', '未'], '戊': ['丑', '未'],
-            '乙': ['子', '申'], '己': ['子', '申'],
-            '丙': ['亥', '酉'], '丁': ['亥', '酉'],
-            '庚': ['丑', '未'], '辛': ['寅', '午'],
-            '壬': ['卯', '巳'], '癸': ['卯', '巳']
-        }
+        Returns:
+            uint32 비트마스크 배열 [사주 수]
+        """
+        gans = np.asarray(gans, dtype=np.int64)
+        jis = np.asarray(jis, dtype=np.int64)
+        rules = np.arange(len(self.SINSAL_RULES))
 
-        if day_gan in cheoneur_map:
-            for ji in jis:
-                if ji in cheoneur_map[day_gan]:
-                    result['beneficial'].append({
-                        'name': '천을귀인',
-                        'position': ji,
-                        'description': '귀인의 도움을 받는 길신입니다. 어려움에서 도움을 받을 수 있습니다.'
-                    })
-                    break
+        # 규칙별 기준 글자 코드 [사주, 규칙] → 대상 지지 비트 [사주, 규칙]
+        anchors = np.stack([gans, jis])[list(self.SINSAL_ANCHOR_KINDS), :, list(self.SINSAL_ANCHOR_PILLARS)].T
+        targets = self.SINSAL_TARGET_ARRAY[rules, anchors].astype(np.int64)
 
-        # === 역마살 (驛馬殺) - 이동수 ===
-        yeokma_map = {
-            '寅': '申', '午': '寅', '戌': '申',
-            '申': '寅', '子': '寅', '辰': '申',
-            '巳': '亥', '酉': '巳', '丑': '亥',
-            '亥': '巳', '卯': '巳', '未': '亥'
-        }
+        # 기둥별 해당 여부 [사주, 규칙, 기둥] → 처음 해당한 기둥 + 1 (없으면 0)
+        hits = ((targets[:, :, None] >> jis[:, None, :]) & 1) & self.SINSAL_POSITION_ARRAY
+        positions = np.where(hits.any(axis=2), hits.argmax(axis=2) + 1, 0)
 
-        if year_ji in yeokma_map:
-            target = yeokma_map[year_ji]
-            for ji in jis:
-                if ji == target:
-                    result['neutral'].append({
-                        'name': '역마살',
-                        'position': ji,
-                        'description': '이동과 변화가 많은 삶입니다. 여행, 이사, 직장 이동이 잦을 수 있습니다.'
-                    })
-                    break
+        shifts = rules * SINSAL_POSITION_BITS
+        return (positions << shifts).sum(axis=1).astype(np.uint32)
 
-        # === 도화살 (桃花殺) - 인기운 ===
-        dohwa_map = {
-            '寅': '卯', '午': '卯', '戌': '卯',
-            '申': '酉', '子': '酉', '辰': '酉',
-            '巳': '午', '酉': '午', '丑': '午',
-            '亥': '子', '卯': '子', '未': '子'
-        }
+    def ohang_count_array(self, gans: np.ndarray, jis: np.ndarray) -> np.ndarray:
+        """
+        여러 사주의 오행 개수 일괄 계산 (SajuRecord.ohang_counts와 같은 결과)
 
-        if year_ji in dohwa_map:
-            target = dohwa_map[year_ji]
-            for ji in jis:
-                if ji == target:
-                    result['neutral'].append({
-                        'name': '도화살',
-                        'position': ji,
-                        'description': '인기가 많고 이성운이 좋습니다. 예술적 재능이 있을 수 있습니다.'
-                    })
-                    break
+        Args:
+            gans: 천간 코드 배열 [사주 수, 4]
+            jis: 지지 코드 배열 [사주 수, 4]
 
-        # === 화개살 (華蓋殺) - 예술/종교 ===
-        hwagae_map = {
-            '寅': '戌', '午': '戌', '戌': '戌',
-            '申': '辰', '子': '辰', '辰': '辰',
-            '巳': '丑', '酉': '丑', '丑': '丑',
-            '亥': '未', '卯': '未', '未': '未'
-        }
+        Returns:
+            uint8 배열 [사주 수, 5] (木火土金水)
+        """
+        elements = np.concatenate([self.GAN_OHANG_ARRAY[np.asarray(gans, dtype=np.int64)],
+                                   self.JI_OHANG_ARRAY[np.asarray(jis, dtype=np.int64)]], axis=1)
+        rows = len(elements)
+        # 사주마다 5칸씩 떨어진 구간으로 옮겨 bincount 한 번으로 집계
+        flat = (elements + np.arange(rows)[:, None] * 5).ravel()
+        return np.bincount(flat, minlength=rows * 5).reshape(rows, 5).astype(np.uint8)
+
+    def ohang_status_array(self, counts: np.ndarray) -> np.ndarray:
+        """오행 개수 [사주 수, 5] → 상태 코드 [사주 수, 5] (OHANG_STATUS_NAMES 인덱스)"""
+        counts = np.asarray(counts, dtype=np.float64)
+        totals = counts.sum(axis=1, keepdims=True)
+        percents = np.round(np.divide(counts * 100, totals, out=np.zeros_like(counts), where=totals > 0), 1)
+        return np.searchsorted(self.OHANG_STATUS_THRESHOLDS, percents, side='right').astype(np.uint8)
+
+    def strength_code_array(self, counts: np.ndarray, day_gans: np.ndarray,
+                            thresholds: Optional[Sequence[float]] = None) -> np.ndarray:
+        """
+        여러 사주의 신강신약 코드 일괄 계산 (_strength_code와 같은 결과)
 
-        if year_ji in hwagae_map:
-            target = hwagae_map[year_ji]
-            for ji in jis:
-                if ji == target:
-                    result['neutral'].append({
-                        'name': '화개살',
-                        'position': ji,
-                        'description': '예술적, 종교적 재능이 있습니다. 학문과 연구에도 뛰어날 수 있습니다.'
-                    })
-                    break
+        Args:
+            counts: 오행 개수 [사주 수, 5]
+            day_gans: 일간 코드 [사주 수]
+            thresholds: 구간 경계 (기본 STRENGTH_THRESHOLDS, 경계 비교 분석용으로 바꿔 넣을 수 있음)
+
+        Returns:
+            uint8 신강신약 코드 [사주 수] (0=극약 ... 6=극왕)
+        """
+        counts = np.asarray(counts)
+        day_ohang = self.GAN_OHANG_ARRAY[np.asarray(day_gans, dtype=np.int64)]
+        same = counts[np.arange(len(counts)), day_ohang]
+        percents = np.round(same / 8 * 100, 1)
+        bounds = self.STRENGTH_THRESHOLDS if thresholds is None else sorted(thresholds)
+        return np.searchsorted(bounds, percents, side='right').astype(np.uint8)
+
+    def yongsin_code_array(self, day_gans: np.ndarray, strength_codes: np.ndarray) -> np.ndarray:
+        """일간 코드 [사주 수], 신강신약 코드 [사주 수] → 용신/희신/기신 오행 코드 [사주 수, 3]"""
+        day_ohang = self.GAN_OHANG_ARRAY[np.asarray(day_gans, dtype=np.int64)]
+        strong = np.asarray(strength_codes, dtype=np.int64) >= len(self.WEAK_STRENGTH_CODES)
+        return ((day_ohang[:, None] + self.YONGSIN_OFFSETS[strong.astype(np.int64)]) % 5).astype(np.uint8)
+
+    def score_arrays(self, gans: np.ndarray, jis: np.ndarray,
+                     strength_thresholds: Optional[Sequence[float]] = None) -> Dict[str, np.ndarray]:
+        """
+        여러 사주의 오행/신강신약/용신 일괄 계산 (통계, 신강신약 경계 비교 분석용)
+
+        Args:
+            gans: 천간 코드 배열 [사주 수, 4] (년, 월, 일, 시)
+            jis: 지지 코드 배열 [사주 수, 4]
+            strength_thresholds: 신강신약 구간 경계 (기본 STRENGTH_THRESHOLDS)
 
-        # === 양인살 (羊刃殺) - 강한 성격 ===
-        yangin_map = {
-            '甲': '卯', '乙': '寅',
-            '丙': '午', '丁': '巳',
-            '戊': '午', '己': '巳',
-            '庚': '酉', '辛': '申',
-            '壬': '子', '癸': '亥'
+        Returns:
+            {'ohang_counts': [n, 5], 'ohang_status': [n, 5], 'strength': [n], 'yongsin': [n, 3]}
+        """
+        gans = np.asarray(gans, dtype=np.int64)
+        counts = self.ohang_count_array(gans, jis)
+        strength = self.strength_code_array(counts, gans[:, DAY], strength_thresholds)
+        return {
+            'ohang_counts': counts,
+            'ohang_status': self.ohang_status_array(counts),
+            'strength': strength,
+            'yongsin': self.yongsin_code_array(gans[:, DAY], strength)
         }
 
-        if day_gan in yangin_map:
-            target = yangin_map[day_gan]
-            for ji in jis:
-                if ji == target:
-                    result['harmful'].append({
-                        'name': '양인살',
-                        'position': ji,
-                        'description': '성격이 강하고 극단적일 수 있습니다. 리더십이 있으나 충동적일 수 있습니다.'
-                    })
-                    break
+    def sinsals_result(self, codes: PillarCodes, mask: int) -> SinsalsResult:
+        """신살 비트마스크 → 결과 객체 (이름/설명은 규칙의 문자열을 공유)"""
+        jis = codes.jis
+        position_mask = (1 << SINSAL_POSITION_BITS) - 1
+        entries = []
 
-        # === 공망 (空亡) ===
-        # 60갑자별 공망 (간단 버전: 년주 기준)
-        year_gan = pillars['year'][0]
-        year_gan_idx = self.CHEONGAN.index(year_gan)
-
-        # 간단 공망 계산 (10천간 - 12지지 = 2개 공망)
-        gongmang_idx1 = (year_gan_idx + 10) % 12
-        gongmang_idx2 = (year_gan_idx + 11) % 12
-
-        for ji in jis:
-            ji_idx = self.JIJI.index(ji)
-            if ji_idx == gongmang_idx1 or ji_idx == gongmang_idx2:
-                result['harmful'].append({
-                    'name': '공망',
-                    'position': ji,
-                    'description': '허무함이나 공허함을 느낄 수 있습니다. 일이 뜻대로 안 될 때가 있습니다.'
-                })
-                break
+        for slot, rule in enumerate(self.SINSAL_RULES):
+            position = (mask >> (slot * SINSAL_POSITION_BITS)) & position_mask
+            if position:
+                entries.append(SinsalEntry(rule.name, rule.group, self.JIJI[jis[position - 1]], rule.description))
 
-        # === 괴강살 (魁罡殺) ===
-        goegang_pairs = [
-            ('庚', '辰'), ('庚', '戌'),
-            ('壬', '辰'), ('戊', '戌')
-        ]
+        return SinsalsResult(tuple(entries))
 
-        if (day_gan, day_ji) in goegang_pairs:
-            result['neutral'].append({
-                'name': '괴강살',
-                'position': day_ji,
-                'description': '특별한 성격과 능력을 가졌습니다. 강한 카리스마가 있으나 고집이 셀 수 있습니다.'
-            })
+    def serialize_sinsals(self, codes: PillarCodes, mask: int) -> Dict:
+        """신살 비트마스크 → 결과 사전"""
+        return self.sinsals_result(codes, mask).to_dict()
 
-        return result
+
+# 싱글톤 인스턴스 (상태가 없으므로 모든 요청이 공유)
+saju_calculator = SajuCalculator()
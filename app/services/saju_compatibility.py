@@ -0,0 +1,129 @@
+"""
+일주 궁합 테이블
+
+궁합 점수는 두 사람의 일주(육십갑자 60개)에만 의존하므로 60×60 조합을 한 번 채점해
+점수/등급/관계 코드 배열로 보관합니다. 한 쌍의 결과 사전은 조회할 때 만들고,
+한 사람과 여러 후보의 비교는 배열 인덱싱 한 번으로 처리합니다.
+
+계산기 모듈이 이 모듈을 가져오므로 여기서는 계산기를 인자로만 받습니다.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from app.services.saju_calculator import SajuCalculator
+
+# 등급 코드 순서 (점수 높은 순)
+COMPATIBILITY_LEVELS = ['천생연분', '매우 좋음', '좋음', '보통', '노력 필요', '많은 이해 필요']
+
+# 관계 코드 (배열 값 → 유형 이름)
+OHANG_RELATION_TYPES = ['비화', '상생', '상극', '중립']
+GAN_RELATION_TYPES = ['일반', '천간합', '천간동일']
+JI_RELATION_TYPES = ['일반', '육합', '충', '지지동일']
+
+
+class CompatibilityMatrix:
+    """
+    일주 60×60 궁합 테이블
+
+    배열은 [첫 번째 사람 일주, 두 번째 사람 일주] (육십갑자 인덱스, 0=甲子)입니다.
+    """
+
+    def __init__(self, calculator: "SajuCalculator"):
+        self.calculator = calculator
+        calc = calculator
+        ohang_names = calc.OHANG_NAMES
+
+        # 관계별 결과 사전 (오행 5×5, 천간 10×10, 지지 12×12)
+        self._ohang_relations = [
+            [calc._get_ohang_relation(o1, o2) for o2 in ohang_names] for o1 in ohang_names
+        ]
+        self._gan_relations = [
+            [calc._get_ilju_compatibility(g1, '', g2, '') for g2 in calc.CHEONGAN] for g1 in calc.CHEONGAN
+        ]
+        self._ji_relations = [
+            [calc._get_jiji_relation(j1, j2) for j2 in calc.JIJI] for j1 in calc.JIJI
+        ]
+
+        shape = (60, 60)
+        self.scores = np.zeros(shape, dtype=np.uint8)
+        self.levels = np.zeros(shape, dtype=np.uint8)
+        self.ohang_relations = np.zeros(shape, dtype=np.uint8)
+        self.gan_relations = np.zeros(shape, dtype=np.uint8)
+        self.ji_relations = np.zeros(shape, dtype=np.uint8)
+
+        for a in range(60):
+            for b in range(60):
+                ohang_rel, gan_rel, ji_rel = self._relations(a, b)
+                score = calc._calculate_compatibility_score(ohang_rel, gan_rel, ji_rel)
+                self.scores[a, b] = score
+                self.levels[a, b] = COMPATIBILITY_LEVELS.index(calc._get_compatibility_level(score))
+                self.ohang_relations[a, b] = OHANG_RELATION_TYPES.index(ohang_rel['type'])
+                self.gan_relations[a, b] = GAN_RELATION_TYPES.index(gan_rel['gan_relation'])
+                self.ji_relations[a, b] = JI_RELATION_TYPES.index(ji_rel['type'])
+
+    def _relations(self, a: int, b: int):
+        """일주 인덱스 쌍 → (오행 관계, 천간 관계, 지지 관계) 사전"""
+        gan_ohang = self.calculator.GAN_OHANG
+        return (
+            self._ohang_relations[gan_ohang[a % 10]][gan_ohang[b % 10]],
+            self._gan_relations[a % 10][b % 10],
+            self._ji_relations[a % 12][b % 12]
+        )
+
+    def result(self, a: int, b: int) -> Dict:
+        """일주 인덱스 쌍 → calculate_compatibility 결과 사전"""
+        calc = self.calculator
+        ohang_rel, gan_rel, ji_rel = self._relations(a, b)
+        return {
+            'person1': {
+                'day_pillar': f'{calc.CHEONGAN[a % 10]}{calc.JIJI[a % 12]}',
+                'ohang': calc.OHANG_NAMES[calc.GAN_OHANG[a % 10]]
+            },
+            'person2': {
+                'day_pillar': f'{calc.CHEONGAN[b % 10]}{calc.JIJI[b % 12]}',
+                'ohang': calc.OHANG_NAMES[calc.GAN_OHANG[b % 10]]
+            },
+            'ohang_relation': dict(ohang_rel),
+            'ilju_compatibility': dict(gan_rel),
+            'jiji_relation': dict(ji_rel),
+            'score': int(self.scores[a, b]),
+            'level': COMPATIBILITY_LEVELS[self.levels[a, b]]
+        }
+
+    def rank(self, a: int, candidates: np.ndarray, limit: Optional[int] = None) -> List[Dict]:
+        """
+        한 사람(일주 a)과 후보 일주 배열의 궁합을 점수 높은 순으로 정렬
+
+        Args:
+            a: 기준 일주 인덱스
+            candidates: 후보 일주 인덱스 배열
+            limit: 상위 몇 명까지 (None이면 전체)
+
+        Returns:
+            [{'index': 후보 위치, 'day_pillar', 'score', 'level'}] (동점은 입력 순서 유지)
+        """
+        calc = self.calculator
+        candidates = np.asarray(candidates, dtype=np.int64)
+        scores = self.scores[a, candidates]
+        order = np.argsort(-scores.astype(np.int16), kind='stable')[:limit]
+        levels = self.levels[a, candidates[order]]
+
+        return [
+            {
+                'index': index,
+                'day_pillar': f'{calc.CHEONGAN[b % 10]}{calc.JIJI[b % 12]}',
+                'score': score,
+                'level': COMPATIBILITY_LEVELS[level]
+            }
+            for index, b, score, level in zip(order.tolist(), candidates[order].tolist(),
+                                              scores[order].tolist(), levels.tolist())
+        ]
+
+
+@lru_cache(maxsize=4)
+def get_compatibility_matrix(calculator: "SajuCalculator") -> CompatibilityMatrix:
+    """계산기별 궁합 테이블 (처음 사용할 때 한 번 생성)"""
+    return CompatibilityMatrix(calculator)
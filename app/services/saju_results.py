@@ -0,0 +1,263 @@
+"""
+사주 결과 타입
+
+SajuChart는 섹션을 중첩 사전 대신 작은 불변 객체(__slots__ 데이터클래스)로 보관하고,
+calculate_saju 형식의 사전은 to_dict()를 부를 때만 만듭니다. 문자열 필드는 계산기 테이블
+(천간/지지/십성 이름, 신살 설명 등)의 같은 문자열 객체를 참조하므로 차트마다 복사되지 않고,
+합충형파해 설명 문장은 직렬화할 때 조립합니다.
+
+신강신약은 경우가 몇 개뿐이라 계산기가 미리 만든 객체(STRENGTH_RESULTS)를 모든 차트가 공유합니다.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, List, Tuple
+
+# 합충형파해 위치 이름 (기둥 순서: 년, 월, 일, 시)
+GAN_POSITION_NAMES = ('년간', '월간', '일간', '시간')
+JI_POSITION_NAMES = ('년지', '월지', '일지', '시지')
+
+# 합충형파해 종류 (결과 사전 키 순서) → 요약 이름
+RELATION_KINDS = ('cheongan_hap', 'jiji_yukhap', 'jiji_samhap', 'jiji_chung', 'jiji_hyeong', 'jiji_hae')
+RELATION_SUMMARY_NAMES = ('천간합', '육합', '삼합', '충', '형', '해')
+
+# 신살 분류 (결과 사전 키 순서)
+SINSAL_GROUPS = ('beneficial', 'harmful', 'neutral')
+
+
+@dataclass(frozen=True, slots=True)
+class PillarsResult:
+    """사주 기둥 문자 (출력 순서: 시, 일, 월, 년)"""
+    cheongan: Tuple[str, ...]
+    jiji: Tuple[str, ...]
+    sipsung: Tuple[str, ...]
+    sipsung_jiji: Tuple[str, ...]
+    sipiunsung: Tuple[str, ...]
+
+    def to_dict(self) -> Dict:
+        return {
+            'cheongan': list(self.cheongan),
+            'jiji': list(self.jiji),
+            'sipsung': list(self.sipsung),
+            'sipsung_jiji': list(self.sipsung_jiji),
+            'sipiunsung': list(self.sipiunsung)
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class OhangResult:
+    """오행 분포 (names 순서의 개수/비율/상태)"""
+    names: Tuple[str, ...]
+    counts: Tuple[int, ...]
+    percents: Tuple[float, ...]
+    statuses: Tuple[str, ...]
+
+    def to_dict(self) -> Dict:
+        return {
+            name: {'count': count, 'percent': percent, 'status': status}
+            for name, count, percent, status in zip(self.names, self.counts, self.percents, self.statuses)
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class StrengthResult:
+    """신강신약"""
+    level: str
+    position: int
+
+    def to_dict(self) -> Dict:
+        return {'level': self.level, 'position': self.position}
+
+
+@dataclass(frozen=True, slots=True)
+class YongsinResult:
+    """용신/희신/기신 (오행 한글 이름)"""
+    yongsin: str
+    heesin: str
+    gisin: str
+
+    def to_dict(self) -> Dict:
+        return {'yongsin': self.yongsin, 'heesin': self.heesin, 'gisin': self.gisin}
+
+
+@dataclass(frozen=True, slots=True)
+class LuckPeriod:
+    """대운 한 칸"""
+    year: int
+    age: int
+    gan: str
+    ji: str
+
+    def to_dict(self) -> Dict:
+        return {'year': self.year, 'age': self.age, 'gan': self.gan, 'ji': self.ji}
+
+
+@dataclass(frozen=True, slots=True)
+class DaeunResult:
+    """대운"""
+    start_age: int
+    periods: Tuple[LuckPeriod, ...]
+
+    def to_dict(self) -> Dict:
+        return {
+            'start_age': self.start_age,
+            'periods': [period.to_dict() for period in self.periods]
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class RelationEntry:
+    """
+    합충형파해 한 항목
+
+    kind는 RELATION_KINDS 중 하나이고, positions는 관계에 든 기둥 인덱스(년0 ~ 시3),
+    chars는 그 기둥의 천간(천간합) 또는 지지입니다. result는 합/삼합의 오행, label은 형의 종류입니다.
+    """
+    kind: str
+    positions: Tuple[int, ...]
+    chars: Tuple[str, ...]
+    result: str = ''
+    label: str = ''
+
+    def to_dict(self) -> Dict:
+        kind, chars = self.kind, self.chars
+        if kind == 'cheongan_hap':
+            (a, b), (ga, gb) = [GAN_POSITION_NAMES[i] for i in self.positions], chars
+            return {
+                'positions': [a, b],
+                'gans': list(chars),
+                'result': self.result,
+                'description': f'{a}({ga})과 {b}({gb})이 합하여 {self.result}으로 화합니다.'
+            }
+
+        names = [JI_POSITION_NAMES[i] for i in self.positions]
+        entry = {'positions': names, 'jis': list(chars)}
+        if kind == 'jiji_samhap':
+            complete = len(chars) == 3
+            entry['result'] = self.result
+            entry['complete'] = complete
+            entry['description'] = (f'{", ".join(names)}이 {self.result} 삼합을 이룹니다.' if complete
+                                    else f'{", ".join(names)}이 {self.result} 삼합의 일부를 이룹니다.')
+        elif kind == 'jiji_hyeong':
+            entry['type'] = self.label
+            entry['description'] = f'{", ".join(names)}이 {self.label}을 이룹니다.'
+        else:
+            pair = f'{names[0]}({chars[0]})와 {names[1]}({chars[1]})이'
+            if kind == 'jiji_yukhap':
+                entry['result'] = self.result
+                entry['description'] = f'{pair} 육합을 이룹니다.'
+            elif kind == 'jiji_chung':
+                entry['description'] = f'{pair} 충을 이룹니다. 변동과 충돌이 있을 수 있습니다.'
+            else:
+                entry['description'] = f'{pair} 해를 이룹니다.'
+        return entry
+
+
+@dataclass(frozen=True, slots=True)
+class RelationsResult:
+    """합충형파해 (RELATION_KINDS 순서의 항목 목록)"""
+    entries: Tuple[RelationEntry, ...]
+
+    def to_dict(self) -> Dict:
+        result: Dict = {kind: [] for kind in RELATION_KINDS}
+        for entry in self.entries:
+            result[entry.kind].append(entry.to_dict())
+
+        summary_parts = [f'{name} {len(result[kind])}개'
+                         for kind, name in zip(RELATION_KINDS, RELATION_SUMMARY_NAMES) if result[kind]]
+        result['summary'] = ', '.join(summary_parts) if summary_parts else '특별한 합충형파해가 없습니다.'
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class SinsalEntry:
+    """신살 한 항목 (name/group/description은 신살 규칙의 문자열을 그대로 참조)"""
+    name: str
+    group: str
+    position: str
+    description: str
+
+    def to_dict(self) -> Dict:
+        return {'name': self.name, 'position': self.position, 'description': self.description}
+
+
+@dataclass(frozen=True, slots=True)
+class SinsalsResult:
+    """신살 (규칙 순서의 항목 목록)"""
+    entries: Tuple[SinsalEntry, ...]
+
+    def to_dict(self) -> Dict:
+        result: Dict[str, List[Dict]] = {group: [] for group in SINSAL_GROUPS}
+        for entry in self.entries:
+            result[entry.group].append(entry.to_dict())
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class DayRelation:
+    """
+    오늘 일진과 원국 기둥 하나의 관계
+
+    kind는 RELATION_KINDS 중 하나이고 position은 원국 기둥 인덱스(년0 ~ 시3),
+    natal/today는 원국과 오늘의 천간(천간합) 또는 지지입니다.
+    """
+    kind: str
+    position: int
+    natal: str
+    today: str
+    result: str = ''
+    label: str = ''
+
+    def to_dict(self) -> Dict:
+        if self.kind == 'cheongan_hap':
+            name = GAN_POSITION_NAMES[self.position]
+            return {
+                'kind': self.kind,
+                'position': name,
+                'natal': self.natal,
+                'today': self.today,
+                'result': self.result,
+                'description': f'{name}({self.natal})과 오늘 일간({self.today})이 합하여 {self.result}으로 화합니다.'
+            }
+
+        name = JI_POSITION_NAMES[self.position]
+        pair = f'{name}({self.natal})와 오늘 일지({self.today})이'
+        entry = {'kind': self.kind, 'position': name, 'natal': self.natal, 'today': self.today}
+        if self.kind == 'jiji_yukhap':
+            entry['result'] = self.result
+            entry['description'] = f'{pair} 육합을 이룹니다.'
+        elif self.kind == 'jiji_samhap':
+            entry['result'] = self.result
+            entry['description'] = f'{pair} {self.result} 삼합의 일부를 이룹니다.'
+        elif self.kind == 'jiji_chung':
+            entry['description'] = f'{pair} 충을 이룹니다. 변동과 충돌이 있을 수 있습니다.'
+        elif self.kind == 'jiji_hyeong':
+            entry['type'] = self.label
+            entry['description'] = f'{pair} {self.label}을 이룹니다.'
+        else:
+            entry['description'] = f'{pair} 해를 이룹니다.'
+        return entry
+
+
+@dataclass(frozen=True, slots=True)
+class DailyDelta:
+    """오늘 일진이 원국에 주는 영향 (일간 기준 십성/십이운성, 원국 기둥과의 합충형해)"""
+    date: date
+    gan: str
+    ji: str
+    sipsung: str          # 오늘 천간의 십성
+    sipsung_jiji: str     # 오늘 지지(본기)의 십성
+    sipiunsung: str       # 일간의 오늘 지지 십이운성
+    relations: Tuple[DayRelation, ...]
+
+    def to_dict(self) -> Dict:
+        counts = [sum(1 for relation in self.relations if relation.kind == kind) for kind in RELATION_KINDS]
+        summary_parts = [f'{name} {count}개' for name, count in zip(RELATION_SUMMARY_NAMES, counts) if count]
+        return {
+            'date': self.date.isoformat(),
+            'ganzhi': f'{self.gan}{self.ji}',
+            'sipsung': self.sipsung,
+            'sipsung_jiji': self.sipsung_jiji,
+            'sipiunsung': self.sipiunsung,
+            'relations': [relation.to_dict() for relation in self.relations],
+            'summary': ', '.join(summary_parts) if summary_parts else '원국과 특별한 합충형해가 없습니다.'
+        }
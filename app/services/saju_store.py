@@ -0,0 +1,193 @@
+"""
+사전 계산 사주 저장소 (메모리 맵)
+
+출생 입력은 유한한 범위(양력 1900-01-01 ~ 2050-12-31 × 시지 12개)이므로 모든 조합의
+SajuRecord를 미리 계산해 열(column)별 .npy 파일로 저장하고, 온라인 요청은 행 번호 하나로
+읽어 결과 사전으로 직렬화합니다. 성별은 대운 순행/역행에만 영향을 주므로 행을 나누지 않고,
+대운 시작 나이를 순행/역행 두 값으로 저장해 두었다가 읽을 때 고릅니다.
+
+빌드:
+    python -m scripts.dev.build_saju_store [출력 디렉터리]
+
+디렉터리 구성:
+    meta.json       형식/계산 엔진 버전, 시작 날짜 서수, 일수
+    <열 이름>.npy   행 = (날짜 서수 - 시작 서수) * 12 + 시지
+"""
+import json
+import logging
+import os
+import shutil
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from app.services.saju_calculator import YEAR, PillarCodes, SajuCalculator, SajuChart, SajuRecord, saju_calculator
+from app.utils.solar_terms import kst_minutes
+
+logger = logging.getLogger(__name__)
+
+# 기본 저장 위치
+DEFAULT_STORE_PATH = Path(__file__).parent.parent / "data" / "saju_store"
+
+STORE_FORMAT = 2
+FIRST_DATE = date(1900, 1, 1)
+LAST_DATE = date(2050, 12, 31)
+
+# 열 이름 → (dtype, 행당 값 개수)
+COLUMNS = {
+    "gans": (np.uint8, 4),
+    "jis": (np.uint8, 4),
+    "sipsung": (np.uint8, 4),
+    "sipsung_jiji": (np.uint8, 4),
+    "sipiunsung": (np.uint8, 4),
+    "ohang_counts": (np.uint8, 5),
+    "strength": (np.uint8, 1),
+    "yongsin": (np.uint8, 3),
+    "daeun_start": (np.uint8, 2),  # (순행, 역행)
+    "relations": (np.uint32, 1),
+    "sinsals": (np.uint32, 1),
+}
+
+
+def build_saju_store(path: Path = DEFAULT_STORE_PATH,
+                     calculator: SajuCalculator = saju_calculator) -> Path:
+    """
+    전체 범위 사주 저장소 생성
+
+    임시 디렉터리에 쓴 뒤 교체하므로, 실행 중인 프로세스가 기존 파일을 매핑하고 있어도 안전합니다.
+
+    Args:
+        path: 출력 디렉터리
+        calculator: 계산기 (기본 싱글톤)
+
+    Returns:
+        생성된 디렉터리 경로
+    """
+    path = Path(path)
+    days = LAST_DATE.toordinal() - FIRST_DATE.toordinal() + 1
+    rows = days * 12
+    columns = {
+        name: np.zeros((rows, width) if width > 1 else rows, dtype=dtype)
+        for name, (dtype, width) in COLUMNS.items()
+    }
+
+    row = 0
+    for ordinal in range(FIRST_DATE.toordinal(), LAST_DATE.toordinal() + 1):
+        solar = date.fromordinal(ordinal)
+        for hour_ji in range(12):
+            codes = calculator.pillar_codes(solar.year, solar.month, solar.day, hour_ji * 2)
+            minutes = kst_minutes(solar, hour_ji * 2)
+            record = calculator.analyze_codes(codes, solar.year, minutes, 'male')
+            columns["gans"][row] = codes.gans
+            columns["jis"][row] = codes.jis
+            columns["sipsung"][row] = record.sipsung
+            columns["sipsung_jiji"][row] = record.sipsung_jiji
+            columns["sipiunsung"][row] = record.sipiunsung
+            columns["daeun_start"][row] = (calculator.daeun_start_age(minutes, 1),
+                                           calculator.daeun_start_age(minutes, -1))
+            columns["relations"][row] = record.relations
+            row += 1
+
+    # 오행/신강신약/용신과 신살은 코드 배열로 전체 행을 한 번에 계산
+    scores = calculator.score_arrays(columns["gans"], columns["jis"])
+    for name in ("ohang_counts", "strength", "yongsin"):
+        columns[name] = scores[name]
+    columns["sinsals"] = calculator.sinsal_masks(columns["gans"], columns["jis"])
+
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+    for name, values in columns.items():
+        np.save(tmp_path / f"{name}.npy", values)
+    with open(tmp_path / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({
+            "format": STORE_FORMAT,
+            "engine_version": calculator.ENGINE_VERSION,
+            "first_ordinal": FIRST_DATE.toordinal(),
+            "days": days,
+        }, f)
+
+    old_path = path.with_name(path.name + f".{os.getpid()}.old")
+    if path.exists():
+        path.rename(old_path)
+    tmp_path.rename(path)
+    shutil.rmtree(old_path, ignore_errors=True)
+    return path
+
+
+class SajuChartStore:
+    """메모리 맵 기반 사전 계산 사주 조회"""
+
+    def __init__(self, path: Path = DEFAULT_STORE_PATH, calculator: SajuCalculator = saju_calculator):
+        path = Path(path)
+        with open(path / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        if meta.get("format") != STORE_FORMAT or meta.get("engine_version") != calculator.ENGINE_VERSION:
+            raise ValueError(f"사주 저장소 버전이 현재 계산 엔진과 맞지 않습니다: {path}")
+
+        self.calculator = calculator
+        self.first_ordinal = meta["first_ordinal"]
+        self.days = meta["days"]
+        # memmap 하위 클래스의 행 조회 오버헤드를 피하려고 일반 ndarray 뷰로 보관
+        self._columns = {
+            name: np.load(path / f"{name}.npy", mmap_mode="r").view(np.ndarray) for name in COLUMNS
+        }
+
+    def __len__(self) -> int:
+        return self.days * 12
+
+    def record(self, solar_date: date, hour_ji: int, gender: str) -> Optional[SajuRecord]:
+        """양력 날짜/시지/성별 → SajuRecord (범위 밖이면 None)"""
+        day_offset = solar_date.toordinal() - self.first_ordinal
+        if not 0 <= day_offset < self.days:
+            return None
+
+        row = day_offset * 12 + hour_ji
+        c = self._columns
+        daeun_step = self.calculator.daeun_step(int(c["gans"][row, YEAR]), gender)
+        return SajuRecord(
+            codes=PillarCodes(tuple(c["gans"][row].tolist()), tuple(c["jis"][row].tolist())),
+            birth_year=solar_date.year,
+            sipsung=tuple(c["sipsung"][row].tolist()),
+            sipsung_jiji=tuple(c["sipsung_jiji"][row].tolist()),
+            sipiunsung=tuple(c["sipiunsung"][row].tolist()),
+            ohang_counts=tuple(c["ohang_counts"][row].tolist()),
+            strength=int(c["strength"][row]),
+            yongsin=tuple(c["yongsin"][row].tolist()),
+            daeun_start=int(c["daeun_start"][row, 0 if daeun_step > 0 else 1]),
+            daeun_step=daeun_step,
+            relations=int(c["relations"][row]),
+            sinsals=int(c["sinsals"][row])
+        )
+
+    def chart(self, solar_date: date, hour_ji: int, gender: str) -> Optional[SajuChart]:
+        """저장된 분석 결과로 만든 SajuChart (범위 밖이면 None)"""
+        record = self.record(solar_date, hour_ji, gender)
+        return SajuChart.from_record(self.calculator, record) if record else None
+
+    def lookup(self, solar_date: date, hour_ji: int, gender: str) -> Optional[dict]:
+        """calculate_saju와 같은 결과 사전 (범위 밖이면 None)"""
+        chart = self.chart(solar_date, hour_ji, gender)
+        return chart.to_dict() if chart else None
+
+
+@lru_cache()
+def get_saju_chart_store(path: Optional[Path] = None) -> Optional[SajuChartStore]:
+    """
+    저장소 싱글톤 반환 (빌드되지 않았거나 버전이 다르면 None)
+
+    빌드에 시간이 걸리므로 요청 중에 만들지 않고 배포 시 미리 빌드합니다.
+    """
+    path = Path(path) if path else DEFAULT_STORE_PATH
+    if not (path / "meta.json").exists():
+        return None
+    try:
+        return SajuChartStore(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"사주 저장소를 사용하지 않습니다: {e}")
+        return None
+
@@ -0,0 +1,245 @@
+"""
+운세 생성 상태 알림
+
+생성 작업을 등록할 때 share_code를 '처리 중'으로 올려 두고, 작업이 끝나면 완료/실패를 알립니다.
+상태 API(롱폴링)와 SSE 스트림은 DB를 반복 조회하지 않고 여기서 상태를 읽거나 알림을 기다리므로,
+기다리는 브라우저는 열린 연결 하나만 차지하고 완료는 곧바로 전달됩니다.
+
+PostgreSQL을 쓰면 완료/실패 알림을 LISTEN/NOTIFY로 다른 uvicorn 워커 프로세스에도 전달합니다.
+그래서 로딩 페이지 요청이 생성 작업과 다른 프로세스로 가도, DB를 한 번 조회한 뒤 알림을 기다립니다.
+SQLite(단일 프로세스 개발 환경)에서는 프로세스 안에서만 알립니다.
+
+끝난 상태는 RETENTION_SECONDS 동안만 남겨 두고, 그 뒤나 모르는 share_code(재시작 전 작업,
+알림을 놓친 경우)는 호출하는 쪽이 저장된 FortuneResult를 조회합니다.
+"""
+import asyncio
+import json
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# 끝난 상태를 남겨 두는 시간 (초)
+RETENTION_SECONDS = 60
+
+# 워커 프로세스 간 알림 채널 (PostgreSQL LISTEN/NOTIFY)과 연결이 끊겼을 때 다시 연결하는 간격 (초)
+NOTIFY_CHANNEL = "fortune_status"
+RELAY_RETRY_SECONDS = 5
+
+# NOTIFY 페이로드 상한(8000바이트) 안에 들어가도록 자르는 에러 메시지 길이
+NOTIFY_MESSAGE_CHARS = 1000
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+ERROR = "error"
+
+
+class StatusHub:
+    """share_code → 생성 상태 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, retention_seconds: float = RETENTION_SECONDS):
+        self.retention_seconds = retention_seconds
+        self._local: Set[str] = set()                   # 이 프로세스에서 생성 중인 share_code
+        self._events: Dict[str, asyncio.Event] = {}     # 끝나기를 기다리는 share_code → 이벤트
+        self._watchers: Dict[str, int] = {}             # 다른 프로세스 작업을 기다리는 요청 수
+        self._finished: Dict[str, Tuple[str, Optional[str]]] = {}  # share_code → (상태, 에러 메시지)
+        self._relay_task: Optional[asyncio.Task] = None
+        self._relay_conn = None
+        self.waiters = 0
+        self.published = 0
+        self.relayed = 0
+
+    @property
+    def relaying(self) -> bool:
+        """다른 워커 프로세스의 알림을 받고 있는지"""
+        return self._relay_conn is not None
+
+    def register(self, share_code: str):
+        """생성 작업 등록 (처리 중)"""
+        self._finished.pop(share_code, None)
+        self._local.add(share_code)
+        self._events.setdefault(share_code, asyncio.Event())
+
+    def publish(self, share_code: str, status: str, error_message: Optional[str] = None):
+        """
+        생성 종료 알림 (다른 워커 프로세스에도 전달)
+
+        Args:
+            share_code: 공유 코드
+            status: COMPLETED 또는 ERROR
+            error_message: 실패 시 사용자에게 보여 줄 메시지
+        """
+        self._finish(share_code, status, error_message)
+        self.published += 1
+        if self.relaying:
+            payload = json.dumps({
+                'share_code': share_code,
+                'status': status,
+                'error_message': error_message[:NOTIFY_MESSAGE_CHARS] if error_message else None
+            }, ensure_ascii=False)
+            asyncio.get_running_loop().run_in_executor(None, self._send_notify, payload)
+
+    def _finish(self, share_code: str, status: str, error_message: Optional[str]):
+        self._finished[share_code] = (status, error_message)
+        self._local.discard(share_code)
+        event = self._events.pop(share_code, None)
+        if event is not None:
+            event.set()
+        asyncio.get_running_loop().call_later(self.retention_seconds, self._discard, share_code)
+
+    def _discard(self, share_code: str):
+        if share_code not in self._local:
+            self._finished.pop(share_code, None)
+
+    def get(self, share_code: str) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        현재 상태
+
+        Returns:
+            (상태, 에러 메시지) - 모르는 share_code면 None
+        """
+        if share_code in self._local:
+            return PROCESSING, None
+        return self._finished.get(share_code)
+
+    def is_pending(self, share_code: str) -> bool:
+        """이 프로세스에서 생성 중인지"""
+        return share_code in self._local
+
+    @contextmanager
+    def watch(self, share_code: str) -> Iterator[None]:
+        """
+        다른 프로세스의 작업 알림 구독 (블록 안에서 wait 가능)
+
+        DB를 조회하기 전에 구독하므로, 조회와 대기 사이에 끝나도 알림을 놓치지 않습니다.
+        """
+        self._events.setdefault(share_code, asyncio.Event())
+        self._watchers[share_code] = self._watchers.get(share_code, 0) + 1
+        try:
+            yield
+        finally:
+            self._watchers[share_code] -= 1
+            if not self._watchers[share_code]:
+                del self._watchers[share_code]
+                if share_code not in self._local:
+                    self._events.pop(share_code, None)
+
+    async def wait(self, share_code: str, timeout: float) -> Optional[Tuple[str, Optional[str]]]:
+        """처리 중이면 끝나거나 timeout초가 지날 때까지 기다린 뒤 상태 반환 (get과 같은 형식)"""
+        event = self._events.get(share_code)
+        if event is not None:
+            self.waiters += 1
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self.waiters -= 1
+        return self.get(share_code)
+
+    # ---- 워커 프로세스 간 알림 (PostgreSQL LISTEN/NOTIFY) ----
+    def start(self):
+        """다른 프로세스 알림 수신 시작 (앱 시작 시 이벤트 루프 안에서 호출, PostgreSQL만)"""
+        if not settings.database_url.startswith("postgresql"):
+            return
+        if self._relay_task is None or self._relay_task.done():
+            self._relay_task = asyncio.get_running_loop().create_task(self._relay_loop())
+
+    async def stop(self):
+        """알림 수신 종료 (앱 종료 시 호출)"""
+        task, self._relay_task = self._relay_task, None
+        if task is None:
+            return
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @staticmethod
+    def _listen_connection():
+        """LISTEN 전용 DB 연결 (풀에서 떼어 내 계속 붙잡아 둠)"""
+        from app.database import engine
+
+        conn = engine.raw_connection()
+        conn.detach()
+        driver_conn = conn.driver_connection
+        driver_conn.autocommit = True
+        with driver_conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        return driver_conn
+
+    @staticmethod
+    def _send_notify(payload: str):
+        from sqlalchemy import text
+        from app.database import engine
+
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                             {'channel': NOTIFY_CHANNEL, 'payload': payload})
+        except Exception:
+            logger.exception("생성 상태 알림 전송 실패")
+
+    async def _relay_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                conn = await asyncio.to_thread(self._listen_connection)
+            except Exception as e:
+                logger.warning(f"생성 상태 알림 수신 연결 실패 ({RELAY_RETRY_SECONDS}초 후 재시도): {e}")
+                await asyncio.sleep(RELAY_RETRY_SECONDS)
+                continue
+
+            lost = loop.create_future()
+
+            def on_readable():
+                try:
+                    conn.poll()
+                except Exception as e:
+                    if not lost.done():
+                        lost.set_result(e)
+                    return
+                while conn.notifies:
+                    self._on_notify(conn.notifies.pop(0).payload)
+
+            loop.add_reader(conn.fileno(), on_readable)
+            self._relay_conn = conn
+            try:
+                error = await lost
+                logger.warning(f"생성 상태 알림 수신 연결 끊김 ({RELAY_RETRY_SECONDS}초 후 재연결): {error}")
+            finally:
+                self._relay_conn = None
+                loop.remove_reader(conn.fileno())
+                conn.close()
+            await asyncio.sleep(RELAY_RETRY_SECONDS)
+
+    def _on_notify(self, payload: str):
+        try:
+            data = json.loads(payload)
+            share_code = data['share_code']
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"알 수 없는 생성 상태 알림: {payload[:200]}")
+            return
+        if share_code in self._local or share_code in self._finished:
+            # 이 프로세스가 보낸 알림
+            return
+        self.relayed += 1
+        self._finish(share_code, data.get('status', ERROR), data.get('error_message'))
+
+    def stats(self) -> Dict:
+        """관리자 화면용 카운터"""
+        return {
+            'pending': len(self._local),
+            'watched': len(self._watchers),
+            'finished': len(self._finished),
+            'waiters': self.waiters,
+            'published': self.published,
+            'relaying': self.relaying,
+            'relayed': self.relayed
+        }
+
+
+# 싱글톤 인스턴스
+status_hub = StatusHub()
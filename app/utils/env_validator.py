@@ -64,7 +64,11 @@ class EnvironmentValidator:
             )
 
     def _check_gemini_api_key(self):
-        """Gemini API KEY 검증"""
+        """Gemini API KEY 검증 (GEMINI_FAKE면 API를 호출하지 않으므로 건너뜀)"""
+        if os.getenv("GEMINI_FAKE", "False").lower() == "true":
+            self.warnings.append("⚠️  GEMINI_FAKE=True - 가짜 모델로 응답합니다 (개발/테스트 전용).")
+            return
+
         api_key = os.getenv("GEMINI_API_KEY", "")
 
         if not api_key:
@@ -34,7 +34,60 @@ This file has been integrated into the project to ensure stability and
 independence from external package managers.
 """
 
+import bisect
 import datetime
+from functools import lru_cache
+from typing import NamedTuple
+
+
+def _buildYearPrefix(yearDays):
+    # prefix[i] = total days of the first i years of the table
+    prefix = [0]
+    for days in yearDays:
+        prefix.append(prefix[-1] + days)
+    return tuple(prefix)
+
+
+def _buildLunarMonthTables(lunarDataList):
+    # per year: cumulative days of the ordinary months (index 0..12),
+    # and the start offset / (month, isIntercalation) label of every month
+    # in calendar order, intercalation month included
+    monthPrefixes = []
+    monthStarts = []
+    monthLabels = []
+    for lunarData in lunarDataList:
+        intercalationMonth = (lunarData >> 12) & 0x000F
+        intercalationDays = 30 if ((lunarData >> 16) & 0x01) > 0 else 29
+
+        prefix = [0]
+        starts = []
+        labels = []
+        offset = 0
+        for month in range(1, 13):
+            days = 30 if ((lunarData >> (12 - month)) & 0x01) > 0 else 29
+            prefix.append(prefix[-1] + days)
+            starts.append(offset)
+            labels.append((month, False))
+            offset += days
+            if month == intercalationMonth:
+                starts.append(offset)
+                labels.append((month, True))
+                offset += intercalationDays
+
+        monthPrefixes.append(tuple(prefix))
+        monthStarts.append(tuple(starts))
+        monthLabels.append(tuple(labels))
+    return tuple(monthPrefixes), tuple(monthStarts), tuple(monthLabels)
+
+
+def _buildSolarMonthPrefix(solarDays, isIntercalationYear):
+    prefix = [0]
+    for month in range(1, 13):
+        days = solarDays[12] if (month == 2) and isIntercalationYear else solarDays[month - 1]
+        prefix.append(prefix[-1] + days)
+    return tuple(prefix)
+
+
 class KoreanLunarCalendar(object) :
     KOREAN_LUNAR_MIN_VALUE = 10000101
     KOREAN_LUNAR_MAX_VALUE = 20501118
@@ -167,7 +220,14 @@ class KoreanLunarCalendar(object) :
             0x82c405aa, 0x83003b6a, 0xc2c6096d, 0x8300b4af, 0x82c404ae, 0x82c40a4d, 0xc3016d0d, 0x82c40d25, 0x82c40d52, 0x83005dd4,
             0xc2c60b6a, 0x82c6096d, 0x8300255b, 0x82c4049b, 0xc3007a57, 0x82c40a4b, 0x82c40b25, 0x83015b25, 0xc2c406d4, 0x82c60ada,
             0x830138b6]
-    
+
+    # cumulative day tables, built once at import so that every conversion
+    # is answered with index lookups and a bisect instead of year/month loops
+    __lunarYearPrefix = _buildYearPrefix([(lunarData >> 17) & 0x01FF for lunarData in KOREAN_LUNAR_DATA])
+    __solarYearPrefix = _buildYearPrefix([366 if ((lunarData >> 30) & 0x01) > 0 else 365 for lunarData in KOREAN_LUNAR_DATA])
+    __lunarMonthPrefix, __lunarMonthStarts, __lunarMonthLabels = _buildLunarMonthTables(KOREAN_LUNAR_DATA)
+    __solarMonthPrefix = (_buildSolarMonthPrefix(SOLAR_DAYS, False), _buildSolarMonthPrefix(SOLAR_DAYS, True))
+
     def __init__(self):
         self.lunarYear = 0
         self.lunarMonth = 0
@@ -211,16 +271,14 @@ class KoreanLunarCalendar(object) :
         return days
 
     def __getLunarDaysBeforeBaseYear(self, year):
-        days = 0
-        for baseYear in range(self.KOREAN_LUNAR_BASE_YEAR, year+1):
-            days += self.__getLunarDays(baseYear)
-        return days
+        if year < self.KOREAN_LUNAR_BASE_YEAR:
+            return 0
+        return self.__lunarYearPrefix[year - self.KOREAN_LUNAR_BASE_YEAR + 1]
 
     def __getLunarDaysBeforeBaseMonth(self, year, month, isIntercalation):
         days = 0
         if (year >= self.KOREAN_LUNAR_BASE_YEAR) and (month > 0):
-            for baseMonth in range(1, month+1):
-                days += self.__getLunarDays(year, baseMonth, False)
+            days = self.__lunarMonthPrefix[year - self.KOREAN_LUNAR_BASE_YEAR][month]
 
             if isIntercalation == True:
                 intercalationMonth = self.__getLunarIntercalationMonth(self.__getLunarData(year))
@@ -246,23 +304,22 @@ class KoreanLunarCalendar(object) :
         return days
 
     def __getSolarDaysBeforeBaseYear(self, year):
-        days = 0
-        for baseYear in range(self.KOREAN_LUNAR_BASE_YEAR, year+1):
-            days += self.__getSolarDays(baseYear)
-        return days
+        if year < self.KOREAN_LUNAR_BASE_YEAR:
+            return 0
+        return self.__solarYearPrefix[year - self.KOREAN_LUNAR_BASE_YEAR + 1]
 
     def __getSolarDaysBeforeBaseMonth(self, year, month):
-        days = 0
-        for baseMonth in range(1, month+1):
-            days += self.__getSolarDays(year, baseMonth)
-        return days
+        if month <= 0:
+            return 0
+        isIntercalationYear = self.__isSolarIntercalationYear(self.__getLunarData(year))
+        return self.__solarMonthPrefix[1 if isIntercalationYear else 0][month]
     
     def __getSolarAbsDays(self, year, month, day):
         days = self.__getSolarDaysBeforeBaseYear(year-1) + self.__getSolarDaysBeforeBaseMonth(year, month-1) + day
         days -= self.SOLAR_LUNAR_DAY_DIFF
         return days
 
-    def __setSolarDateByLunarDate(self, lunarYear, lunarMonth, lunarDay, isIntercalation):
+    def __getSolarDateByLunarDate(self, lunarYear, lunarMonth, lunarDay, isIntercalation):
         absDays = self.__getLunarAbsDays(lunarYear, lunarMonth, lunarDay, isIntercalation)
         solarYear = 0
         solarMonth = 0
@@ -270,38 +327,32 @@ class KoreanLunarCalendar(object) :
 
         solarYear = lunarYear if (absDays < self.__getSolarAbsDays(lunarYear+1, 1, 1)) else lunarYear+1
 
-        for month in range(12, 0, -1) :
-            absDaysByMonth = self.__getSolarAbsDays(solarYear, month, 1)
-            if (absDays >= absDaysByMonth) :
-                solarMonth = month
-                solarDay = absDays - absDaysByMonth +1
-                break
+        dayOffset = absDays - self.__getSolarAbsDays(solarYear, 1, 1)
+        isIntercalationYear = self.__isSolarIntercalationYear(self.__getLunarData(solarYear))
+        monthPrefix = self.__solarMonthPrefix[1 if isIntercalationYear else 0]
+        month = bisect.bisect_right(monthPrefix, dayOffset, 0, 12)
+        if month > 0 :
+            solarMonth = month
+            solarDay = dayOffset - monthPrefix[month - 1] + 1
 
-        self.solarYear = solarYear
-        self.solarMonth = solarMonth
-        self.solarDay  = solarDay
+        return solarYear, solarMonth, solarDay
 
-    def __setLunarDateBySolarDate(self, solarYear, solarMonth, solarDay):
+    def __getLunarDateBySolarDate(self, solarYear, solarMonth, solarDay):
         absDays = self.__getSolarAbsDays(solarYear, solarMonth, solarDay)
         lunarYear = solarYear if (absDays >= self.__getLunarAbsDays(solarYear, 1, 1, False)) else solarYear-1
         lunarMonth = 0
         lunarDay = 0
         isIntercalation = False
-        
-        for month in range(12, 0, -1) :
-            absDaysByMonth = self.__getLunarAbsDays(lunarYear, month, 1, False)
-            if absDays >= absDaysByMonth:
-                lunarMonth = month
-                if self.__getLunarIntercalationMonth(self.__getLunarData(lunarYear)) == month :
-                    isIntercalation = absDays >= self.__getLunarAbsDays(lunarYear, month, 1, True)
-                
-                lunarDay = absDays - self.__getLunarAbsDays(lunarYear, lunarMonth, 1, isIntercalation) + 1
-                break
-
-        self.lunarYear = lunarYear
-        self.lunarMonth = lunarMonth
-        self.lunarDay = lunarDay        
-        self.isIntercalation = isIntercalation
+
+        dayOffset = absDays - self.__getLunarAbsDays(lunarYear, 1, 1, False)
+        yearIndex = lunarYear - self.KOREAN_LUNAR_BASE_YEAR
+        monthStarts = self.__lunarMonthStarts[yearIndex]
+        monthIndex = bisect.bisect_right(monthStarts, dayOffset) - 1
+        if monthIndex >= 0 :
+            lunarMonth, isIntercalation = self.__lunarMonthLabels[yearIndex][monthIndex]
+            lunarDay = dayOffset - monthStarts[monthIndex] + 1
+
+        return lunarYear, lunarMonth, lunarDay, isIntercalation
 
     def __checkValidDate(self, isLunar, isIntercalation, year, month, day):
         isValid = False
@@ -331,7 +382,7 @@ class KoreanLunarCalendar(object) :
             self.lunarMonth = lunarMonth
             self.lunarDay = lunarDay
             self.isIntercalation = isIntercalation and (self.__getLunarIntercalationMonth(self.__getLunarData(lunarYear)) == lunarMonth)
-            self.__setSolarDateByLunarDate(lunarYear, lunarMonth, lunarDay, isIntercalation)
+            self.solarYear, self.solarMonth, self.solarDay = self.__getSolarDateByLunarDate(lunarYear, lunarMonth, lunarDay, isIntercalation)
             isValid = True
         return isValid
 
@@ -341,10 +392,22 @@ class KoreanLunarCalendar(object) :
             self.solarYear = solarYear
             self.solarMonth = solarMonth
             self.solarDay = solarDay
-            self.__setLunarDateBySolarDate(solarYear, solarMonth, solarDay)
+            self.lunarYear, self.lunarMonth, self.lunarDay, self.isIntercalation = self.__getLunarDateBySolarDate(solarYear, solarMonth, solarDay)
             isValid = True
         return isValid
 
+    def convertLunarToSolar(self, lunarYear, lunarMonth, lunarDay, isIntercalation):
+        # stateless: returns (solarYear, solarMonth, solarDay), or None for an invalid date
+        if not self.__checkValidDate(True, isIntercalation, lunarYear, lunarMonth, lunarDay):
+            return None
+        return self.__getSolarDateByLunarDate(lunarYear, lunarMonth, lunarDay, isIntercalation)
+
+    def convertSolarToLunar(self, solarYear, solarMonth, solarDay):
+        # stateless: returns (lunarYear, lunarMonth, lunarDay, isIntercalation), or None for an invalid date
+        if not self.__checkValidDate(False, False, solarYear, solarMonth, solarDay):
+            return None
+        return self.__getLunarDateBySolarDate(solarYear, solarMonth, solarDay)
+
     def __getGapJa(self):
         absDays = self.__getLunarAbsDays(self.lunarYear, self.lunarMonth, self.lunarDay, self.isIntercalation)
         if absDays > 0 :
@@ -379,3 +442,75 @@ class KoreanLunarCalendar(object) :
         if self.isIntercalation == True :
             gapjaStr += " (%c%c)" % (chr(self.INTERCALATION_STR[1]), chr(self.CHINESE_GAPJA_UNIT[1]))
         return gapjaStr
+
+
+class LunarDate(NamedTuple):
+    """음력 날짜 (불변)"""
+    year: int
+    month: int
+    day: int
+    is_intercalation: bool = False
+
+    def isoformat(self) -> str:
+        date_str = "%04d-%02d-%02d" % (self.year, self.month, self.day)
+        if self.is_intercalation:
+            date_str += " Intercalation"
+        return date_str
+
+
+# 변환 전용 인스턴스: 상태를 바꾸지 않는 convert* 메서드만 호출하므로 스레드 간 공유해도 안전
+_converter = KoreanLunarCalendar()
+
+# 변환 결과 메모 크기 (생년월일 분포가 좁아 적중률이 높음)
+CONVERSION_CACHE_SIZE = 4096
+
+
+@lru_cache()
+def _day_table():
+    """
+    일별 음력 테이블 (app/utils/lunar_day_table.py)
+
+    파일을 만들거나 읽을 수 없으면(읽기 전용 배포 등) None - 이때는 계산으로 변환합니다.
+    """
+    from app.utils.lunar_day_table import get_lunar_day_table
+
+    try:
+        return get_lunar_day_table()
+    except (OSError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def lunar_to_solar(year: int, month: int, day: int, is_intercalation: bool = False) -> datetime.date:
+    """
+    음력 → 양력 변환 (스레드 안전, 순수 함수)
+
+    Raises:
+        ValueError: 지원 범위를 벗어났거나 존재하지 않는 음력 날짜
+    """
+    table = _day_table()
+    if table is not None:
+        return table.lunar_to_solar(year, month, day, is_intercalation)
+
+    solar = _converter.convertLunarToSolar(year, month, day, is_intercalation)
+    if solar is None:
+        raise ValueError(f"유효하지 않은 음력 날짜입니다: {year}-{month}-{day}")
+    return datetime.date(*solar)
+
+
+@lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def solar_to_lunar(solar_date: datetime.date) -> LunarDate:
+    """
+    양력 → 음력 변환 (스레드 안전, 순수 함수)
+
+    Raises:
+        ValueError: 지원 범위를 벗어난 양력 날짜
+    """
+    table = _day_table()
+    if table is not None:
+        return table.solar_to_lunar(solar_date)
+
+    lunar = _converter.convertSolarToLunar(solar_date.year, solar_date.month, solar_date.day)
+    if lunar is None:
+        raise ValueError(f"유효하지 않은 양력 날짜입니다: {solar_date}")
+    return LunarDate(*lunar)
@@ -0,0 +1,151 @@
+"""
+음력/양력 대량 변환 (NumPy 벡터화)
+
+저장된 요청 데이터 재처리, 생년월일 분포 분석 같은 백오피스 작업에서
+수십만 건의 날짜를 한 번에 변환합니다. KOREAN_LUNAR_DATA 비트필드를
+배열 연산으로 풀어 연/월 누적 일수 테이블을 만들고, 날짜별 Python 루프 없이
+searchsorted와 팬시 인덱싱만으로 변환합니다.
+
+날짜 축은 KoreanLunarCalendar와 같은 연속 일수(양력 1000-02-13 = 음력 1000-01-01)를 씁니다.
+"""
+import numpy as np
+
+from app.utils.korean_lunar_calendar import KoreanLunarCalendar
+
+# 결과 dtype
+LUNAR_DTYPE = np.dtype([
+    ("year", np.int16),
+    ("month", np.int8),
+    ("day", np.int8),
+    ("is_intercalation", np.bool_),
+    ("valid", np.bool_),
+])
+SOLAR_DTYPE = np.dtype([
+    ("year", np.int16),
+    ("month", np.int8),
+    ("day", np.int8),
+    ("valid", np.bool_),
+])
+
+_BASE_YEAR = KoreanLunarCalendar.KOREAN_LUNAR_BASE_YEAR
+_EPOCH = np.datetime64("1000-02-13", "D")  # 음력 1000-01-01
+_SOLAR_MIN = np.datetime64("1000-02-13", "D")
+_SOLAR_MAX = np.datetime64("2050-12-31", "D")
+_LUNAR_MIN = KoreanLunarCalendar.KOREAN_LUNAR_MIN_VALUE
+_LUNAR_MAX = KoreanLunarCalendar.KOREAN_LUNAR_MAX_VALUE
+_NO_MONTH = np.iinfo(np.int32).max
+
+
+def _build_tables():
+    """비트필드 → (연 시작 누적일, 월 시작 오프셋, 월 길이, 월 번호, 윤달 표시, 윤달 월)"""
+    data = np.array(KoreanLunarCalendar.KOREAN_LUNAR_DATA, dtype=np.int64)
+    years = len(data)
+    rows = np.arange(years)[:, None]
+
+    year_days = (data >> 17) & 0x01FF
+    year_start = np.concatenate(([0], np.cumsum(year_days)))
+
+    intercalation_month = (data >> 12) & 0x0F
+    intercalation_days = 29 + ((data >> 16) & 0x01)
+
+    months = np.arange(1, 13)
+    month_days = 29 + ((data[:, None] >> (12 - months)) & 0x01)
+
+    # 윤달이 있으면 해당 월 다음 칸에 끼워 넣어 달력 순서(최대 13칸)로 배치
+    has_intercalation = intercalation_month > 0
+    slot = months - 1 + (has_intercalation[:, None] & (months > intercalation_month[:, None]))
+
+    lengths = np.zeros((years, 13), dtype=np.int64)
+    labels = np.zeros((years, 13), dtype=np.int64)
+    flags = np.zeros((years, 13), dtype=bool)
+    lengths[rows, slot] = month_days
+    labels[rows, slot] = months
+    lunar_rows = np.flatnonzero(has_intercalation)
+    lunar_slots = intercalation_month[has_intercalation]
+    lengths[lunar_rows, lunar_slots] = intercalation_days[has_intercalation]
+    labels[lunar_rows, lunar_slots] = lunar_slots
+    flags[lunar_rows, lunar_slots] = True
+
+    starts = np.cumsum(lengths, axis=1) - lengths
+    starts[lengths == 0] = _NO_MONTH
+    return year_start, starts, lengths, labels, flags, intercalation_month
+
+
+_YEAR_START, _MONTH_START, _MONTH_LENGTH, _MONTH_LABEL, _MONTH_IS_INTERCALATION, _INTERCALATION_MONTH = _build_tables()
+
+
+def solar_to_lunar_many(solar_dates) -> np.ndarray:
+    """
+    양력 날짜 배열 → 음력 구조화 배열
+
+    Args:
+        solar_dates: datetime64로 변환 가능한 배열 (예: np.array([...], dtype='datetime64[D]'))
+
+    Returns:
+        LUNAR_DTYPE 구조화 배열 (범위를 벗어난 항목은 valid=False, 나머지 필드 0)
+    """
+    solar = np.asarray(solar_dates, dtype="datetime64[D]")
+    result = np.zeros(solar.shape, dtype=LUNAR_DTYPE)
+
+    valid = (solar >= _SOLAR_MIN) & (solar <= _SOLAR_MAX)
+    offset = (solar[valid] - _EPOCH).astype(np.int64)
+
+    year_index = np.searchsorted(_YEAR_START, offset, side="right") - 1
+    day_of_year = offset - _YEAR_START[year_index]
+    starts = _MONTH_START[year_index]
+    slot = (starts <= day_of_year[:, None]).sum(axis=1) - 1
+
+    result["year"][valid] = year_index + _BASE_YEAR
+    result["month"][valid] = _MONTH_LABEL[year_index, slot]
+    result["day"][valid] = day_of_year - starts[np.arange(len(slot)), slot] + 1
+    result["is_intercalation"][valid] = _MONTH_IS_INTERCALATION[year_index, slot]
+    result["valid"] = valid
+    return result
+
+
+def lunar_to_solar_many(years, months, days, is_intercalation=False) -> np.ndarray:
+    """
+    음력 연/월/일 배열 → 양력 구조화 배열
+
+    KoreanLunarCalendar.setLunarDate와 같이, 윤달 플래그는 그 해 윤달과 월이 일치할 때만 적용됩니다.
+
+    Args:
+        years, months, days: 정수 배열 또는 스칼라 (브로드캐스트 가능)
+        is_intercalation: 윤달 여부 (bool 배열 또는 스칼라)
+
+    Returns:
+        SOLAR_DTYPE 구조화 배열 - 입력을 브로드캐스트한 모양 (스칼라 입력이면 0차원)
+        유효하지 않은 음력 날짜는 valid=False, 나머지 필드 0
+    """
+    years, months, days, leaps = np.broadcast_arrays(
+        np.asarray(years, dtype=np.int64),
+        np.asarray(months, dtype=np.int64),
+        np.asarray(days, dtype=np.int64),
+        np.asarray(is_intercalation, dtype=bool),
+    )
+    # 0차원 입력도 마스크 대입이 되도록 1차원으로 펴서 계산한 뒤 원래 모양으로 되돌림
+    shape = years.shape
+    years, months, days, leaps = (np.ravel(values) for values in (years, months, days, leaps))
+    result = np.zeros(years.shape, dtype=SOLAR_DTYPE)
+
+    date_value = years * 10000 + months * 100 + days
+    valid = (date_value >= _LUNAR_MIN) & (date_value <= _LUNAR_MAX) & (months >= 1) & (months <= 12) & (days >= 1)
+
+    year_index = years[valid] - _BASE_YEAR
+    month = months[valid]
+    intercalation_month = _INTERCALATION_MONTH[year_index]
+    leap = leaps[valid] & (intercalation_month == month)
+    slot = month - 1 + ((intercalation_month > 0) & (month > intercalation_month)) + leap
+
+    day = days[valid]
+    in_month = day <= _MONTH_LENGTH[year_index, slot]
+    valid[valid] = in_month
+
+    offset = _YEAR_START[year_index] + _MONTH_START[year_index, slot] + day - 1
+    solar = _EPOCH + offset[in_month].astype("timedelta64[D]")
+
+    result["year"][valid] = solar.astype("datetime64[Y]").astype(np.int64) + 1970
+    result["month"][valid] = solar.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    result["day"][valid] = (solar - solar.astype("datetime64[M]")).astype(np.int64) + 1
+    result["valid"] = valid
+    return result.reshape(shape)
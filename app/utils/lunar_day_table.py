@@ -0,0 +1,186 @@
+"""
+음력 일별 조회 테이블 (메모리 맵)
+
+지원 범위(양력 1000-02-13 ~ 2050-12-31)의 모든 날짜를 하루당 uint32 하나로
+패킹한 바이너리 파일을 만들고, 이를 mmap으로 읽어 양력→음력은 배열 인덱스,
+음력→양력은 이진 탐색 한 번으로 변환합니다. 파일은 읽기 전용으로 매핑되므로
+여러 uvicorn 워커 프로세스가 같은 페이지를 공유합니다.
+korean_lunar_calendar.lunar_to_solar/solar_to_lunar가 이 테이블로 변환합니다.
+
+빌드:
+    python -m app.utils.lunar_day_table [출력 경로]
+
+패킹 형식 (하위 비트부터):
+    bits 0-5   일진 육십갑자 인덱스 (0=甲子 ... 59=癸亥)
+    bits 6-10  음력 일
+    bit  11    윤달 여부
+    bits 12-15 음력 월
+    bits 16-26 음력 년 - 1000
+
+일진 비트를 제외한 값(value >> 6)은 날짜 순으로 단조 증가하므로
+음력→양력 변환에 그대로 이진 탐색을 쓸 수 있습니다.
+"""
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.utils.korean_lunar_calendar import KoreanLunarCalendar, LunarDate
+
+# 기본 파일 위치
+DEFAULT_TABLE_PATH = Path(__file__).parent.parent / "data" / "lunar_day_table.bin"
+
+# 헤더: 매직, 바이트 순서 표식, 시작 날짜 서수(date.toordinal), 일수
+_MAGIC = b"LDT2"
+_BYTE_ORDER_MARK = 0x01020304
+_HEADER = struct.Struct("=4sIII")
+
+_PILLAR_BITS = 6
+_YEAR_BASE = KoreanLunarCalendar.KOREAN_LUNAR_BASE_YEAR
+
+
+def _pack(lunar_year: int, lunar_month: int, lunar_day: int, is_intercalation: bool, pillar: int = 0) -> int:
+    return ((lunar_year - _YEAR_BASE) << 16 | lunar_month << 12 | int(is_intercalation) << 11
+            | lunar_day << _PILLAR_BITS | pillar)
+
+
+def _from_packed_int(value: int) -> date:
+    year, month_day = divmod(value, 10000)
+    return date(year, *divmod(month_day, 100))
+
+
+FIRST_DATE = _from_packed_int(KoreanLunarCalendar.KOREAN_SOLAR_MIN_VALUE)
+LAST_DATE = _from_packed_int(KoreanLunarCalendar.KOREAN_SOLAR_MAX_VALUE)
+
+# 그레고리력 전환으로 없는 양력 날짜 (테이블에는 일수 연속성을 위해 들어 있지만 입력으로는 거부)
+GREGORIAN_GAP = (date(1582, 10, 5), date(1582, 10, 14))
+
+
+def build_lunar_day_table(path: Path = DEFAULT_TABLE_PATH) -> Path:
+    """
+    일별 음력 테이블 파일 생성
+
+    임시 파일에 쓴 뒤 교체하므로, 실행 중인 프로세스가 기존 파일을 매핑하고 있어도 안전합니다.
+
+    Args:
+        path: 출력 경로
+
+    Returns:
+        생성된 파일 경로
+    """
+    # 일진은 사주 엔진과 같은 값을 써야 하므로 엔진에서 계산 (2000-01-01 = 甲子)
+    from app.services.saju_calculator import saju_calculator
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    converter = KoreanLunarCalendar()
+    values = array("I")
+    lunar = None
+    for ordinal in range(FIRST_DATE.toordinal(), LAST_DATE.toordinal() + 1):
+        solar = date.fromordinal(ordinal)
+        converted = converter.convertSolarToLunar(solar.year, solar.month, solar.day)
+        if converted is None:
+            # KoreanLunarCalendar는 1582-10-05~14를 입력으로 받지 않지만 일수는 연속으로 셈
+            converted = (lunar[0], lunar[1], lunar[2] + 1, lunar[3])
+        lunar = converted
+        values.append(_pack(*lunar, pillar=saju_calculator.day_pillar_index(ordinal)))
+
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _BYTE_ORDER_MARK, FIRST_DATE.toordinal(), len(values)))
+        values.tofile(f)
+    os.replace(tmp_path, path)
+    return path
+
+
+class LunarDayTable:
+    """메모리 맵 기반 일별 음력 조회 테이블"""
+
+    def __init__(self, path: Path = DEFAULT_TABLE_PATH):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, byte_order_mark, first_ordinal, count = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC or byte_order_mark != _BYTE_ORDER_MARK:
+            self._mmap.close()
+            raise ValueError(f"음력 테이블 형식이 올바르지 않습니다: {path}")
+
+        self.first_ordinal = first_ordinal
+        self._values = memoryview(self._mmap)[_HEADER.size:_HEADER.size + count * 4].cast("I")
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _index(self, solar_date: date) -> int:
+        index = solar_date.toordinal() - self.first_ordinal
+        if not 0 <= index < len(self._values):
+            raise ValueError(f"지원 범위를 벗어난 양력 날짜입니다: {solar_date}")
+        return index
+
+    def solar_to_lunar(self, solar_date: date) -> LunarDate:
+        """양력 → 음력 (배열 인덱스 1회)"""
+        if GREGORIAN_GAP[0] <= solar_date <= GREGORIAN_GAP[1]:
+            raise ValueError(f"존재하지 않는 양력 날짜입니다: {solar_date}")
+        value = self._values[self._index(solar_date)]
+        return LunarDate(
+            (value >> 16) + _YEAR_BASE,
+            (value >> 12) & 0x0F,
+            (value >> _PILLAR_BITS) & 0x1F,
+            bool((value >> 11) & 0x01)
+        )
+
+    def lunar_to_solar(self, year: int, month: int, day: int, is_intercalation: bool = False) -> date:
+        """
+        음력 → 양력 (이진 탐색 1회)
+
+        윤달이 없는 달에 is_intercalation=True를 주면 KoreanLunarCalendar처럼 평달로 봅니다.
+        """
+        index = self._find(_pack(year, month, day, is_intercalation))
+        if index is None and is_intercalation and self._find(_pack(year, month, 1, True)) is None:
+            index = self._find(_pack(year, month, day, False))
+        if index is None:
+            raise ValueError(f"유효하지 않은 음력 날짜입니다: {year}-{month}-{day}")
+        return date.fromordinal(self.first_ordinal + index)
+
+    def _find(self, key: int) -> Optional[int]:
+        index = bisect.bisect_left(self._values, key)
+        if index >= len(self._values) or self._values[index] >> _PILLAR_BITS != key >> _PILLAR_BITS:
+            return None
+        return index
+
+    def day_pillar_index(self, solar_date: date) -> int:
+        """일진 육십갑자 인덱스 (0=甲子)"""
+        return self._values[self._index(solar_date)] & 0x3F
+
+    def close(self):
+        self._values.release()
+        self._mmap.close()
+
+
+@lru_cache()
+def get_lunar_day_table(path: Optional[Path] = None) -> LunarDayTable:
+    """
+    테이블 싱글톤 반환 (파일이 없거나 형식이 이전 버전이면 먼저 생성)
+
+    여러 워커가 같은 매핑을 공유하려면 배포 시 미리 빌드해 두는 것이 좋습니다.
+    """
+    path = Path(path) if path else DEFAULT_TABLE_PATH
+    if path.exists():
+        try:
+            return LunarDayTable(path)
+        except ValueError:
+            pass
+    build_lunar_day_table(path)
+    return LunarDayTable(path)
+
+
+if __name__ == "__main__":
+    output = build_lunar_day_table(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_TABLE_PATH)
+    print(f"[OK] Lunar day table written: {output} ({output.stat().st_size:,} bytes)")
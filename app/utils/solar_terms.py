@@ -0,0 +1,134 @@
+"""
+24절기 시각 테이블
+
+사주의 월주(절입 기준)와 년주(입춘 기준), 대운 시작 나이는 절기 시각이 필요합니다.
+1899~2101년 24절기의 KST 시각을 분 단위 정수로 정렬해 저장한 파일(app/data/solar_terms.bin)을
+읽어 두고, 요청마다 이진 탐색 한 번으로 조회합니다. 천문 계산은 빌드 스크립트에서만 합니다.
+시각은 UTC+9 고정 기준이며 과거 표준시 변경이나 서머타임은 반영하지 않습니다.
+
+빌드:
+    python -m scripts.dev.build_solar_terms [출력 경로]
+
+파일 형식:
+    헤더   매직, 바이트 순서 표식, 첫 년도, 항목 수
+    본문   int32 배열 - 1900-01-01 00:00 KST부터 지난 분 (년도별 소한 ~ 동지 순서)
+"""
+import bisect
+import os
+import struct
+from array import array
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# 기본 파일 위치
+DEFAULT_TABLE_PATH = Path(__file__).parent.parent / "data" / "solar_terms.bin"
+
+# 1900년 1월생의 월주에 1899년 대설이, 2100년 12월생의 대운에 2101년 소한이 필요
+FIRST_YEAR = 1899
+LAST_YEAR = 2101
+
+# 한 해의 절기 순서 (소한부터) 와 태양 황경
+TERM_NAMES = ['소한', '대한', '입춘', '우수', '경칩', '춘분', '청명', '곡우',
+              '입하', '소만', '망종', '하지', '소서', '대서', '입추', '처서',
+              '백로', '추분', '한로', '상강', '입동', '소설', '대설', '동지']
+TERM_LONGITUDES = [(285 + 15 * i) % 360 for i in range(24)]
+
+_MAGIC = b"STT1"
+_BYTE_ORDER_MARK = 0x01020304
+_HEADER = struct.Struct("=4sIiI")
+
+# 분 단위 시각의 기준: 1900-01-01 00:00 KST
+_EPOCH = datetime(1900, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+
+
+def kst_minutes(solar_date: date, hour: int = 0, minute: int = 0) -> int:
+    """KST 날짜/시각 → 1900-01-01 00:00부터 지난 분"""
+    return (solar_date.toordinal() - _EPOCH_ORDINAL) * 1440 + hour * 60 + minute
+
+
+def minutes_to_datetime(minutes: int) -> datetime:
+    """kst_minutes 값 → KST datetime (tzinfo 없음)"""
+    return _EPOCH + timedelta(minutes=minutes)
+
+
+def write_solar_term_table(path: Path, instants: List[datetime]) -> Path:
+    """
+    절기 시각 목록(FIRST_YEAR 소한부터 24개씩, KST)을 테이블 파일로 저장
+
+    임시 파일에 쓴 뒤 교체하므로 실행 중인 프로세스가 기존 파일을 읽고 있어도 안전합니다.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    values = array("i", (round((instant - _EPOCH).total_seconds() / 60) for instant in instants))
+    if list(values) != sorted(values) or len(values) != (LAST_YEAR - FIRST_YEAR + 1) * 24:
+        raise ValueError("절기 시각은 FIRST_YEAR ~ LAST_YEAR 전체를 시간 순서로 담아야 합니다.")
+
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _BYTE_ORDER_MARK, FIRST_YEAR, len(values)))
+        values.tofile(f)
+    os.replace(tmp_path, path)
+    return path
+
+
+class SolarTermTable:
+    """정렬된 절기 시각 배열과 이진 탐색 조회"""
+
+    def __init__(self, path: Path = DEFAULT_TABLE_PATH):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, byte_order_mark, first_year, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC or byte_order_mark != _BYTE_ORDER_MARK:
+            raise ValueError(f"절기 테이블 형식이 올바르지 않습니다: {path}")
+
+        self.first_year = first_year
+        self._minutes = array("i")
+        self._minutes.frombytes(data[_HEADER.size:_HEADER.size + count * 4])
+
+    def __len__(self) -> int:
+        return len(self._minutes)
+
+    def covers(self, minutes: int) -> bool:
+        """앞뒤 절(節)이 모두 테이블 안에 있는 시각인지"""
+        return self._minutes[0] <= minutes < self._minutes[-2]
+
+    def _last_jeol(self, minutes: int) -> int:
+        """minutes 이전(같은 시각 포함) 마지막 절(節, 월 경계)의 배열 인덱스"""
+        index = bisect.bisect_right(self._minutes, minutes) - 1
+        if not 0 <= index < len(self._minutes) - 2:
+            raise ValueError(f"절기 테이블 범위({self.first_year}~)를 벗어난 시각입니다: {minutes_to_datetime(minutes)}")
+        return index - index % 2  # 절은 짝수, 중기는 홀수 인덱스
+
+    def saju_month(self, minutes: int) -> Tuple[int, int]:
+        """
+        시각 → (사주 년도, 월지 코드)
+
+        소한~입춘 전은 丑월이고 전년도에 속합니다. 입춘부터 寅월(2)로 새 해가 시작됩니다.
+        """
+        index = self._last_jeol(minutes)
+        year_offset, term = divmod(index, 24)
+        month_ji = (term // 2 + 1) % 12  # 소한 → 丑, 입춘 → 寅, ..., 대설 → 子
+        saju_year = self.first_year + year_offset - (1 if month_ji == 1 else 0)
+        return saju_year, month_ji
+
+    def jeol_bounds(self, minutes: int) -> Tuple[int, int]:
+        """minutes가 속한 달의 (시작 절, 다음 절) 시각"""
+        index = self._last_jeol(minutes)
+        return self._minutes[index], self._minutes[index + 2]
+
+    def terms(self, year: int) -> List[Tuple[str, datetime]]:
+        """year년의 24절기 [(이름, KST 시각)]"""
+        start = (year - self.first_year) * 24
+        if not 0 <= start < len(self._minutes):
+            raise ValueError(f"절기 테이블 범위를 벗어난 년도입니다: {year}")
+        return [(name, minutes_to_datetime(self._minutes[start + i])) for i, name in enumerate(TERM_NAMES)]
+
+
+@lru_cache()
+def get_solar_term_table(path: Optional[Path] = None) -> SolarTermTable:
+    """절기 테이블 싱글톤 (파일은 저장소에 포함되어 배포됨)"""
+    return SolarTermTable(Path(path) if path else DEFAULT_TABLE_PATH)
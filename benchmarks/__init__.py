@@ -0,0 +1,20 @@
+"""
+사주 계산 엔진 벤치마크
+
+SajuCalculator와 음력 변환의 공개 진입점을 고정 시드 입력으로 측정합니다.
+결과(초당 처리 수, 호출당 메모리 할당)를 JSON 기준선으로 저장해 두고, 이후 실행이 기준선보다
+허용 폭 이상 느려지거나 할당이 늘면 실패 코드로 종료합니다.
+
+Usage:
+    python -m benchmarks                          # 측정만
+    python -m benchmarks --save                   # 기준선 저장 (benchmarks/baseline.json)
+    python -m benchmarks --compare --margin 0.15  # 기준선 대비 15% 넘게 나빠지면 실패
+"""
+from benchmarks.cases import BENCHMARK_CASES, BenchmarkCase
+from benchmarks.corpus import BirthInput, make_corpus
+from benchmarks.runner import compare_results, load_baseline, run_benchmarks, save_baseline
+
+__all__ = [
+    'BENCHMARK_CASES', 'BenchmarkCase', 'BirthInput', 'make_corpus',
+    'compare_results', 'load_baseline', 'run_benchmarks', 'save_baseline',
+]
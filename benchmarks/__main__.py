@@ -0,0 +1,53 @@
+"""
+벤치마크 명령행
+
+Usage:
+    python -m benchmarks [--cases 이름,...] [--size N] [--rounds N]
+                         [--save [PATH]] [--compare [PATH]] [--margin 0.15]
+"""
+import argparse
+import sys
+
+from benchmarks.corpus import DEFAULT_SEED, DEFAULT_SIZE
+from benchmarks.runner import (DEFAULT_BASELINE_PATH, DEFAULT_MARGIN, compare_results, load_baseline,
+                               run_benchmarks, save_baseline)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="사주 계산 엔진 벤치마크")
+    parser.add_argument("--cases", help="실행할 항목 (쉼표로 구분, 기본: 전체)")
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help="입력 개수")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="입력 시드")
+    parser.add_argument("--rounds", type=int, default=5, help="시간 측정 라운드 수")
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE_PATH, help="기준선으로 저장")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE_PATH, help="기준선과 비교")
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN, help="허용 폭 (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    names = args.cases.split(",") if args.cases else None
+    results = run_benchmarks(names, args.size, args.seed, args.rounds)
+
+    print(f"{'case':<26}{'ops/s':>12}{'mean us':>10}{'alloc B/op':>12}")
+    for name, result in results['cases'].items():
+        print(f"{name:<26}{result['ops_per_sec']:>12,.0f}{result['mean_us']:>10}{result['alloc_bytes_per_op']:>12,}")
+
+    if args.save:
+        print(f"[OK] Baseline saved: {save_baseline(results, args.save)}")
+
+    if args.compare:
+        try:
+            regressions = compare_results(load_baseline(args.compare), results, args.margin)
+        except ValueError as e:
+            print(f"[FAIL] {e}")
+            return 2
+        if regressions:
+            print(f"[FAIL] {len(regressions)} regression(s) over {args.margin:.0%}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"[OK] No regression over {args.margin:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
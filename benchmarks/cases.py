@@ -0,0 +1,70 @@
+"""
+벤치마크 항목
+
+각 항목은 입력 목록에서 호출 인자 목록을 만들고(prepare), 인자 하나로 진입점을 한 번
+호출합니다(run). 진입점 안의 메모(lru_cache)는 라운드마다 비워(reset) 같은 입력이 두 번째
+라운드부터 캐시 적중으로만 측정되지 않게 합니다.
+"""
+from datetime import date, timedelta
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from app.services.saju_almanac import get_year_almanac
+from app.services.saju_calculator import saju_calculator
+from app.utils.korean_lunar_calendar import lunar_to_solar, solar_to_lunar
+from benchmarks.corpus import BirthInput
+
+
+class BenchmarkCase(NamedTuple):
+    """벤치마크 항목 하나"""
+    name: str
+    prepare: Callable[[List[BirthInput]], List[tuple]]
+    run: Callable[..., Any]
+    reset: Optional[Callable[[], None]] = None
+
+
+def _clear_lunar_caches():
+    lunar_to_solar.cache_clear()
+    solar_to_lunar.cache_clear()
+
+
+def _ganzhi_args(corpus: List[BirthInput]) -> List[tuple]:
+    return [(b.solar_date.year, b.solar_date.month, b.solar_date.day, saju_calculator.parse_hour(b.birth_time))
+            for b in corpus]
+
+
+def _saju_args(corpus: List[BirthInput]) -> List[tuple]:
+    return [(b.birthdate, b.birth_time, b.calendar_type, b.gender) for b in corpus]
+
+
+def _compatibility_args(corpus: List[BirthInput]) -> List[tuple]:
+    # 이웃한 두 입력을 한 쌍으로
+    return [(a.solar_date, a.gender, b.solar_date, b.gender) for a, b in zip(corpus, corpus[1:])]
+
+
+def _daily_args(corpus: List[BirthInput]) -> List[tuple]:
+    # 입력 개수만큼 연속된 날짜 (운세 요청 날짜 분포)
+    return [(date(2024, 1, 1) + timedelta(days=i),) for i in range(len(corpus))]
+
+
+def _year_args(corpus: List[BirthInput]) -> List[tuple]:
+    return [(year,) for year in range(1950, 2051)]
+
+
+def _lunar_args(corpus: List[BirthInput]) -> List[tuple]:
+    return [tuple(solar_to_lunar(b.solar_date)) for b in corpus]
+
+
+def _solar_args(corpus: List[BirthInput]) -> List[tuple]:
+    return [(b.solar_date,) for b in corpus]
+
+
+BENCHMARK_CASES = [
+    BenchmarkCase('get_ganzhi', _ganzhi_args, saju_calculator.get_ganzhi),
+    BenchmarkCase('calculate_saju', _saju_args, saju_calculator.calculate_saju, _clear_lunar_caches),
+    BenchmarkCase('calculate_compatibility', _compatibility_args, saju_calculator.calculate_compatibility),
+    BenchmarkCase('get_daily_fortune_info', _daily_args, saju_calculator.get_daily_fortune_info),
+    BenchmarkCase('get_year_fortune_info', _year_args, saju_calculator.get_year_fortune_info,
+                  get_year_almanac.cache_clear),
+    BenchmarkCase('lunar_to_solar', _lunar_args, lunar_to_solar, _clear_lunar_caches),
+    BenchmarkCase('solar_to_lunar', _solar_args, solar_to_lunar, _clear_lunar_caches),
+]
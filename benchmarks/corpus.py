@@ -0,0 +1,70 @@
+"""
+벤치마크 입력 생성
+
+실제 요청 분포와 비슷하게 양력/음력, 시간 입력/모름, 남녀를 섞은 생년월일 목록을
+고정 시드로 만듭니다. 같은 시드와 크기면 항상 같은 목록이므로 실행 간 비교가 가능합니다.
+"""
+import random
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional
+
+from app.utils.korean_lunar_calendar import solar_to_lunar
+
+DEFAULT_SEED = 20240204
+DEFAULT_SIZE = 500
+
+# 생년월일 범위 (서비스 사용자 분포)
+FIRST_BIRTHDATE = date(1940, 1, 1)
+LAST_BIRTHDATE = date(2010, 12, 31)
+
+# 입력 폼의 시간 선택지 (2시간 단위) - None은 '모름'
+BIRTH_TIMES = [None, '23-01', '01-03', '03-05', '05-07', '07-09', '09-11',
+               '11-13', '13-15', '15-17', '17-19', '19-21', '21-23']
+
+LUNAR_RATIO = 0.3
+UNKNOWN_TIME_RATIO = 0.25
+
+
+class BirthInput(NamedTuple):
+    """calculate_saju 인자 한 벌 (음력이면 birthdate는 음력 년월일)"""
+    birthdate: date
+    birth_time: Optional[str]
+    calendar_type: str
+    gender: str
+    solar_date: date  # 양력 날짜 (음력 입력도 변환해 둠)
+
+
+def _is_valid_date(lunar) -> bool:
+    """음력 년월일을 date로 담을 수 있는지 (음력 2월 29/30일은 양력 달력에 없음)"""
+    try:
+        date(lunar.year, lunar.month, lunar.day)
+    except ValueError:
+        return False
+    return True
+
+
+def make_corpus(size: int = DEFAULT_SIZE, seed: int = DEFAULT_SEED) -> List[BirthInput]:
+    """
+    고정 시드 생년월일 입력 목록
+
+    Args:
+        size: 입력 개수
+        seed: 난수 시드
+
+    Returns:
+        BirthInput 목록
+    """
+    rng = random.Random(seed)
+    span = (LAST_BIRTHDATE - FIRST_BIRTHDATE).days
+    corpus = []
+    for _ in range(size):
+        solar = FIRST_BIRTHDATE + timedelta(days=rng.randrange(span + 1))
+        birth_time = None if rng.random() < UNKNOWN_TIME_RATIO else rng.choice(BIRTH_TIMES[1:])
+        gender = rng.choice(('male', 'female'))
+
+        lunar = solar_to_lunar(solar)
+        if rng.random() < LUNAR_RATIO and not lunar.is_intercalation and _is_valid_date(lunar):
+            corpus.append(BirthInput(date(lunar.year, lunar.month, lunar.day), birth_time, 'lunar', gender, solar))
+        else:
+            corpus.append(BirthInput(solar, birth_time, 'solar', gender, solar))
+    return corpus
@@ -0,0 +1,161 @@
+"""
+벤치마크 실행 / 기준선 저장 / 회귀 판정
+"""
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from benchmarks.cases import BENCHMARK_CASES, BenchmarkCase
+from benchmarks.corpus import DEFAULT_SEED, DEFAULT_SIZE, BirthInput, make_corpus
+
+# 기본 기준선 위치 (측정 환경마다 다르므로 저장소에는 올리지 않음)
+DEFAULT_BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# 기본 허용 폭 (기준선 대비 15%)
+DEFAULT_MARGIN = 0.15
+
+# 이보다 작은 할당 증가는 무시 (바이트, 측정 잡음)
+ALLOC_NOISE_BYTES = 64
+
+# 같아야 비교할 수 있는 측정 조건 (입력이나 인터프리터가 다르면 다른 작업량)
+COMPARABLE_META_KEYS = ('size', 'seed', 'python')
+
+
+def run_case(case: BenchmarkCase, corpus: List[BirthInput], rounds: int = 5) -> Dict:
+    """
+    항목 하나 측정
+
+    라운드마다 입력 전체를 한 번씩 호출하고 가장 빠른 라운드로 초당 처리 수를 계산합니다.
+    할당은 별도 라운드에서 호출마다 tracemalloc 최고 사용량 증가분을 재서 평균합니다.
+    """
+    args = case.prepare(corpus)
+    run = case.run
+
+    # 예열 (지연 생성 테이블 등)
+    if case.reset:
+        case.reset()
+    for arg in args:
+        run(*arg)
+
+    timings = []
+    for _ in range(rounds):
+        if case.reset:
+            case.reset()
+        gc.collect()
+        start = time.perf_counter()
+        for arg in args:
+            run(*arg)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    if case.reset:
+        case.reset()
+    allocated = 0
+    tracemalloc.start()
+    try:
+        for arg in args:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            run(*arg)
+            allocated += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'ops': len(args),
+        'ops_per_sec': round(len(args) / best, 1),
+        'mean_us': round(best / len(args) * 1e6, 2),
+        'alloc_bytes_per_op': round(allocated / len(args))
+    }
+
+
+def run_benchmarks(names: Optional[Iterable[str]] = None, size: int = DEFAULT_SIZE,
+                   seed: int = DEFAULT_SEED, rounds: int = 5) -> Dict:
+    """
+    벤치마크 실행
+
+    Args:
+        names: 실행할 항목 이름 (None이면 전체)
+        size: 입력 개수
+        seed: 입력 시드
+        rounds: 시간 측정 라운드 수
+
+    Returns:
+        {'meta': {...}, 'cases': {이름: 측정값}}
+    """
+    cases = BENCHMARK_CASES
+    if names is not None:
+        names = list(names)
+        known = {case.name for case in BENCHMARK_CASES}
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise ValueError(f"알 수 없는 벤치마크 항목입니다: {', '.join(unknown)}")
+        cases = [case for case in BENCHMARK_CASES if case.name in names]
+
+    corpus = make_corpus(size, seed)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'size': size,
+            'seed': seed,
+            'rounds': rounds,
+        },
+        'cases': {case.name: run_case(case, corpus, rounds) for case in cases}
+    }
+
+
+def save_baseline(results: Dict, path: Path = DEFAULT_BASELINE_PATH) -> Path:
+    """측정 결과를 기준선 JSON으로 저장"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE_PATH) -> Dict:
+    """기준선 JSON 읽기"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(baseline: Dict, current: Dict, margin: float = DEFAULT_MARGIN) -> List[str]:
+    """
+    기준선 대비 회귀 항목
+
+    두 결과에 모두 있는 항목만 비교합니다. 초당 처리 수가 margin보다 많이 줄거나
+    호출당 할당이 margin보다 많이 늘면 회귀입니다.
+
+    Returns:
+        회귀 설명 목록 (없으면 빈 목록)
+
+    Raises:
+        ValueError: 입력 개수/시드/Python 버전이 기준선과 달라 비교할 수 없는 경우
+    """
+    base_meta, now_meta = baseline.get('meta', {}), current.get('meta', {})
+    mismatched = [f"{key} {base_meta.get(key)} → {now_meta.get(key)}"
+                  for key in COMPARABLE_META_KEYS if base_meta.get(key) != now_meta.get(key)]
+    if mismatched:
+        raise ValueError(f"기준선과 측정 조건이 달라 비교할 수 없습니다: {', '.join(mismatched)}")
+
+    regressions = []
+    for name, base in baseline['cases'].items():
+        now = current['cases'].get(name)
+        if now is None:
+            continue
+
+        if now['ops_per_sec'] < base['ops_per_sec'] * (1 - margin):
+            change = now['ops_per_sec'] / base['ops_per_sec'] - 1
+            regressions.append(
+                f"{name}: 처리량 {base['ops_per_sec']:,.0f} → {now['ops_per_sec']:,.0f} ops/s ({change:+.1%})"
+            )
+
+        base_alloc, now_alloc = base['alloc_bytes_per_op'], now['alloc_bytes_per_op']
+        if now_alloc > base_alloc * (1 + margin) and now_alloc - base_alloc > ALLOC_NOISE_BYTES:
+            regressions.append(f"{name}: 호출당 할당 {base_alloc:,} → {now_alloc:,} bytes")
+    return regressions
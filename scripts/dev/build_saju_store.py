@@ -0,0 +1,16 @@
+"""
+사주 사전 계산 저장소 빌드 (app/data/saju_store)
+
+Usage:
+    python -m scripts.dev.build_saju_store [output_dir]
+"""
+import sys
+from pathlib import Path
+
+from app.services.saju_store import DEFAULT_STORE_PATH, build_saju_store
+
+
+if __name__ == "__main__":
+    output = build_saju_store(Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STORE_PATH)
+    size = sum(f.stat().st_size for f in output.iterdir())
+    print(f"[OK] Saju chart store written: {output} ({size:,} bytes)")
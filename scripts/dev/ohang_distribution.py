@@ -0,0 +1,189 @@
+"""
+오행/신강신약/용신 분포 집계 (저장된 운세 결과 / 입력 파일)
+
+사용자 생년월일의 오행 분포와 신강신약/용신 비율을 집계합니다. --thresholds를 주면 같은 사주를
+새 신강신약 경계로도 나눠 현재 경계와 비교합니다. 생년월일은 (양력 날짜, 시지) 단위로 묶어
+간지 코드를 한 번씩만 계산하고, 점수는 SajuCalculator.score_arrays로 한 번에 계산합니다.
+
+Usage:
+    # 저장된 사주/궁합 결과의 생년월일 (궁합은 두 사람 모두)
+    python -m scripts.dev.ohang_distribution db [--service saju,match]
+
+    # CSV/JSONL 입력 (birthdate, birth_time, calendar 열)
+    python -m scripts.dev.ohang_distribution file input.csv
+
+    # 신강신약 경계 비교
+    python -m scripts.dev.ohang_distribution db --thresholds 10,14,20,30,37,45
+"""
+import argparse
+import sys
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+SUPPORTED_SERVICES = ('saju', 'match')
+
+# request_payload의 생년월일 필드 (생년월일, 시간, 달력)
+BIRTH_FIELDS = {
+    'saju': [('birthdate', 'birth_time', 'calendar')],
+    'match': [('birthdate', 'birth_time', 'calendar'),
+              ('partner_birthdate', 'partner_birth_time', 'partner_calendar')],
+}
+
+DB_CHUNK_SIZE = 5000
+
+Birth = Tuple[date, Optional[str], str]
+
+
+# ---- 입력 ----
+def iter_db_births(services: List[str]) -> Iterator[Birth]:
+    """FortuneResult request_payload의 생년월일"""
+    from app.database import SessionLocal
+    from app.models.fortune_result import FortuneResult
+
+    db = SessionLocal()
+    try:
+        after_id = 0
+        while True:
+            rows = db.query(FortuneResult.id, FortuneResult.service_code, FortuneResult.request_payload).filter(
+                FortuneResult.service_code.in_(services),
+                FortuneResult.id > after_id
+            ).order_by(FortuneResult.id).limit(DB_CHUNK_SIZE).all()
+            if not rows:
+                return
+            after_id = rows[-1].id
+            for row in rows:
+                payload = row.request_payload or {}
+                for date_key, time_key, calendar_key in BIRTH_FIELDS[row.service_code]:
+                    if payload.get(date_key):
+                        yield payload[date_key], payload.get(time_key), payload.get(calendar_key, 'solar')
+    finally:
+        db.close()
+
+
+def iter_file_births(path: Path) -> Iterator[Birth]:
+    """CSV/JSONL 입력의 생년월일"""
+    from scripts.dev.recompute_charts import iter_file_rows
+
+    for row in iter_file_rows(path):
+        yield row['birthdate'], row.get('birth_time'), row.get('calendar', 'solar')
+
+
+# ---- 집계 ----
+def collect_codes(births: Iterator[Birth]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    생년월일 → (천간 코드 [n, 4], 지지 코드 [n, 4], 인원 수 [n], 건너뛴 행 수)
+
+    (양력 날짜, 시지)가 같으면 간지가 같으므로 한 행으로 묶고 인원 수를 가중치로 둡니다.
+    """
+    from app.services.saju_cache import saju_cache
+    from app.services.saju_calculator import saju_calculator
+
+    keys: Counter = Counter()
+    skipped = 0
+    for birthdate, birth_time, calendar_type in births:
+        try:
+            birthdate = datetime.fromisoformat(str(birthdate)).date()
+            ordinal, hour_ji, _ = saju_cache.make_key(birthdate, birth_time, calendar_type)
+        except (TypeError, ValueError):
+            skipped += 1
+            continue
+        keys[ordinal, hour_ji] += 1
+
+    gans, jis, weights = [], [], []
+    for (ordinal, hour_ji), count in keys.items():
+        solar = date.fromordinal(ordinal)
+        codes = saju_calculator.pillar_codes(solar.year, solar.month, solar.day, hour_ji * 2)
+        gans.append(codes.gans)
+        jis.append(codes.jis)
+        weights.append(count)
+
+    shape = (len(weights), 4)
+    return (np.array(gans, dtype=np.int64).reshape(shape), np.array(jis, dtype=np.int64).reshape(shape),
+            np.array(weights, dtype=np.int64), skipped)
+
+
+def share(codes: np.ndarray, weights: np.ndarray, size: int) -> np.ndarray:
+    """코드별 인원 비율 (%)"""
+    counts = np.bincount(codes.astype(np.int64), weights=weights, minlength=size)
+    return counts / max(weights.sum(), 1) * 100
+
+
+def print_distribution(gans: np.ndarray, jis: np.ndarray, weights: np.ndarray,
+                       thresholds: Optional[List[float]]):
+    from app.services.saju_calculator import DAY, saju_calculator as calc
+
+    scores = calc.score_arrays(gans, jis)
+    total = int(weights.sum())
+
+    print(f"\n== 오행 (평균 개수, 상태 비율 %) - {total:,}명")
+    mean_counts = (scores['ohang_counts'] * weights[:, None]).sum(axis=0) / max(total, 1)
+    print(f"  {'':4}{'평균':>6}" + "".join(f"{name:>6}" for name in calc.OHANG_STATUS_NAMES))
+    for element, name in enumerate(calc.OHANG_NAMES):
+        statuses = share(scores['ohang_status'][:, element], weights, len(calc.OHANG_STATUS_NAMES))
+        print(f"  {name:4}{mean_counts[element]:>6.2f}" + "".join(f"{value:>7.1f}" for value in statuses))
+
+    print("\n== 용신 (비율 %)")
+    for column, label in enumerate(('용신', '희신', '기신')):
+        values = share(scores['yongsin'][:, column], weights, 5)
+        print(f"  {label}  " + "  ".join(f"{name} {value:5.1f}" for name, value in zip(calc.OHANG_NAMES, values)))
+
+    print("\n== 신강신약 (비율 %)")
+    current = share(scores['strength'], weights, len(calc.STRENGTH_LEVELS))
+    if thresholds is None:
+        for level, value in zip(calc.STRENGTH_LEVELS, current):
+            print(f"  {level:4}{value:>7.1f}")
+        return
+
+    candidate_codes = calc.strength_code_array(scores['ohang_counts'], gans[:, DAY], thresholds)
+    candidate = share(candidate_codes, weights, len(calc.STRENGTH_LEVELS))
+    changed = weights[candidate_codes != scores['strength']].sum() / max(total, 1) * 100
+    print(f"  {'':4}{'현재':>7}{'후보':>7}   현재 {calc.STRENGTH_THRESHOLDS} / 후보 {sorted(thresholds)}")
+    for level, before, after in zip(calc.STRENGTH_LEVELS, current, candidate):
+        print(f"  {level:4}{before:>7.1f}{after:>7.1f}")
+    print(f"  등급이 바뀌는 비율: {changed:.1f}%")
+
+
+def parse_thresholds(value: str) -> List[float]:
+    from app.services.saju_calculator import SajuCalculator
+
+    thresholds = [float(part) for part in value.split(",") if part.strip()]
+    if len(thresholds) != len(SajuCalculator.STRENGTH_THRESHOLDS):
+        raise argparse.ArgumentTypeError(f"경계는 {len(SajuCalculator.STRENGTH_THRESHOLDS)}개여야 합니다.")
+    return thresholds
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.dev.ohang_distribution", description="오행/신강신약 분포 집계")
+    parser.add_argument("--thresholds", type=parse_thresholds, help="비교할 신강신약 경계 (쉼표로 구분)")
+    sources = parser.add_subparsers(dest="source", required=True)
+
+    db_parser = sources.add_parser("db", help="저장된 FortuneResult의 생년월일")
+    db_parser.add_argument("--service", default=",".join(SUPPORTED_SERVICES), help="서비스 코드 (쉼표로 구분)")
+
+    file_parser = sources.add_parser("file", help="CSV/JSONL 생년월일 목록")
+    file_parser.add_argument("input", type=Path, help="입력 파일 (.csv 또는 .jsonl)")
+
+    args = parser.parse_args(argv)
+
+    if args.source == "db":
+        services = [code.strip() for code in args.service.split(",") if code.strip()]
+        unsupported = set(services) - set(SUPPORTED_SERVICES)
+        if unsupported:
+            parser.error(f"지원하지 않는 서비스입니다: {', '.join(sorted(unsupported))}")
+        births = iter_db_births(services)
+    else:
+        births = iter_file_births(args.input)
+
+    gans, jis, weights, skipped = collect_codes(births)
+    print(f"[OK] {int(weights.sum()):,}명 ({len(weights):,}개 간지 조합), 건너뜀 {skipped:,}행")
+    if len(weights):
+        print_distribution(gans, jis, weights, args.thresholds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+"""
+사주 일괄 재계산 (저장된 운세 결과 / 입력 파일)
+
+계산 규칙을 고친 뒤 저장된 FortuneResult의 사주 데이터를 다시 만들거나, 마케팅 대상자처럼
+생년월일 목록의 사주를 미리 계산할 때 씁니다. 입력을 청크 단위로 읽어 프로세스 풀에 나눠
+계산하고, 결과를 청크마다 한 번에 씁니다. 다음 청크 계산은 현재 청크를 쓰는 동안 진행됩니다.
+
+청크를 쓸 때마다 체크포인트 파일에 진행 위치(DB는 마지막 id, 파일은 처리한 행 수)를 기록하므로
+중단된 작업은 --resume으로 이어서 실행할 수 있습니다. 체크포인트는 결과를 쓴 뒤에 갱신하므로
+쓰기 직후 끊기면 마지막 청크가 한 번 더 계산될 수 있습니다 (DB는 같은 값으로 덮어씀).
+
+Usage:
+    # 저장된 사주/궁합 결과의 사주 데이터 재계산 (--dry-run이면 결과도 체크포인트도 쓰지 않음)
+    python -m scripts.dev.recompute_charts db [--service saju,match] [--dry-run]
+
+    # CSV/JSONL 입력 (birthdate, birth_time, calendar, gender 열) → JSONL 출력
+    python -m scripts.dev.recompute_charts file input.csv --output charts.jsonl
+
+    공통 옵션: --workers N --chunk-size N --checkpoint PATH --resume
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# 재계산하는 서비스 (request_payload에 사주 데이터를 저장하는 서비스)
+SUPPORTED_SERVICES = ('saju', 'match')
+
+# 궁합 결과에 저장하는 사주 섹션 (FortuneService.build_match_prompt와 같음)
+MATCH_SECTIONS = ('pillars', 'ohang', 'strength', 'hap_chung_hyeong_pa_hae', 'sinsals')
+
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_CHECKPOINT_PATH = Path("recompute_charts.checkpoint.json")
+
+# (키, 서비스 코드, request_payload) - 키는 DB id 또는 입력 줄 번호
+Task = Tuple[int, str, Dict]
+
+
+# ---- 작업 프로세스 ----
+def recompute_payload(service_code: str, payload: Dict) -> Dict:
+    """request_payload의 사주 데이터를 현재 계산 엔진으로 다시 만든 사본"""
+    from app.services.saju_cache import saju_cache
+    from app.services.saju_calculator import saju_calculator
+
+    payload = dict(payload)
+    birthdate = datetime.fromisoformat(str(payload["birthdate"])).date()
+
+    if service_code == 'saju':
+        saju_data = saju_cache.calculate_saju(
+            birthdate, payload.get("birth_time"), payload.get("calendar", "solar"), payload["gender"]
+        )
+        saju_data["name"] = payload.get("name", "고객")
+        payload["saju_data"] = saju_data
+
+    elif service_code == 'match':
+        partner_birthdate = datetime.fromisoformat(str(payload["partner_birthdate"])).date()
+        payload["person1_saju"] = saju_cache.calculate_saju(
+            birthdate, payload.get("birth_time", "모름"), payload.get("calendar", "solar"),
+            payload["gender"], sections=MATCH_SECTIONS
+        )
+        payload["person2_saju"] = saju_cache.calculate_saju(
+            partner_birthdate, payload.get("partner_birth_time", "모름"), payload.get("partner_calendar", "solar"),
+            payload["partner_gender"], sections=MATCH_SECTIONS
+        )
+        payload["compatibility_info"] = saju_calculator.calculate_compatibility(
+            birthdate, payload["gender"], partner_birthdate, payload["partner_gender"]
+        )
+
+    else:
+        raise ValueError(f"재계산을 지원하지 않는 서비스입니다: {service_code}")
+    return payload
+
+
+def recompute_batch(tasks: List[Task]) -> List[Tuple[int, Optional[Dict], Optional[str]]]:
+    """작업 묶음 계산 → [(키, 새 payload 또는 None, 오류 메시지 또는 None)]"""
+    results = []
+    for key, service_code, payload in tasks:
+        try:
+            results.append((key, recompute_payload(service_code, payload), None))
+        except (KeyError, TypeError, ValueError) as e:
+            results.append((key, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+# ---- 입력 ----
+def iter_db_chunks(services: List[str], chunk_size: int, after_id: int) -> Iterator[Tuple[List[Task], int]]:
+    """FortuneResult를 id 순서로 청크 단위 조회 → (작업 목록, 청크의 마지막 id)"""
+    from app.database import SessionLocal
+    from app.models.fortune_result import FortuneResult
+
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.query(FortuneResult.id, FortuneResult.service_code, FortuneResult.request_payload).filter(
+                FortuneResult.service_code.in_(services),
+                FortuneResult.id > after_id
+            ).order_by(FortuneResult.id).limit(chunk_size).all()
+            if not rows:
+                return
+            after_id = rows[-1].id
+            yield [(row.id, row.service_code, row.request_payload or {}) for row in rows], after_id
+    finally:
+        db.close()
+
+
+def count_db_rows(services: List[str], after_id: int) -> int:
+    from app.database import SessionLocal
+    from app.models.fortune_result import FortuneResult
+
+    db = SessionLocal()
+    try:
+        return db.query(FortuneResult.id).filter(
+            FortuneResult.service_code.in_(services),
+            FortuneResult.id > after_id
+        ).count()
+    finally:
+        db.close()
+
+
+def iter_file_rows(path: Path) -> Iterator[Dict]:
+    """CSV(헤더 포함) 또는 JSONL 입력 행"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            for row in csv.DictReader(f):
+                yield {key: value for key, value in row.items() if value not in (None, "")}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_file_chunks(path: Path, chunk_size: int, skip: int) -> Iterator[Tuple[List[Task], int]]:
+    """입력 파일을 청크 단위로 읽기 → (작업 목록, 지금까지 읽은 줄 수)"""
+    rows = islice(iter_file_rows(path), skip, None)
+    position = skip
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        tasks = [(position + i, 'saju', row) for i, row in enumerate(chunk)]
+        position += len(chunk)
+        yield tasks, position
+
+
+# ---- 출력 ----
+def write_db_results(results: List[Tuple[int, Optional[Dict], Optional[str]]]) -> int:
+    """새 payload를 한 번의 bulk update로 저장 → 저장한 행 수"""
+    from app.database import SessionLocal
+    from app.models.fortune_result import FortuneResult
+
+    mappings = [{'id': key, 'request_payload': payload} for key, payload, _ in results if payload is not None]
+    if not mappings:
+        return 0
+    db = SessionLocal()
+    try:
+        db.bulk_update_mappings(FortuneResult, mappings)
+        db.commit()
+    finally:
+        db.close()
+    return len(mappings)
+
+
+class JsonlWriter:
+    """결과 JSONL 출력 ({'line': 입력 행 번호(0부터), ...입력, 'saju_data' 또는 'error'})"""
+
+    def __init__(self, path: Path, append: bool):
+        self.file = open(path, "a" if append else "w", encoding="utf-8")
+
+    def __call__(self, tasks: List[Task], results: List[Tuple[int, Optional[Dict], Optional[str]]]) -> int:
+        inputs = {key: payload for key, _, payload in tasks}
+        for key, payload, error in results:
+            record = {'line': key, **(payload if payload is not None else inputs[key])}
+            if error:
+                record['error'] = error
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # 체크포인트보다 출력이 먼저 디스크에 닿도록
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return sum(1 for _, payload, _ in results if payload is not None)
+
+    def close(self):
+        self.file.close()
+
+
+# ---- 체크포인트 ----
+def load_checkpoint(path: Path, source: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != source:
+        raise SystemExit(f"[ERROR] 체크포인트의 작업({checkpoint.get('source')})이 현재 작업({source})과 다릅니다: {path}")
+    return checkpoint
+
+
+def save_checkpoint(path: Path, checkpoint: Dict):
+    """임시 파일에 쓴 뒤 교체 (중간에 끊겨도 이전 체크포인트가 남음)"""
+    checkpoint["updated_at"] = datetime.now().isoformat(timespec="seconds")
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ---- 실행 ----
+def split_batches(tasks: List[Task], parts: int) -> List[List[Task]]:
+    size = max(1, -(-len(tasks) // parts))
+    return [tasks[i:i + size] for i in range(0, len(tasks), size)]
+
+
+def run(chunks: Iterator[Tuple[List[Task], int]], write, checkpoint: Dict, checkpoint_path: Optional[Path],
+        workers: int, total: Optional[int]) -> Dict:
+    """
+    청크를 프로세스 풀에 나눠 계산하고 순서대로 쓰기
+
+    Args:
+        chunks: (작업 목록, 진행 위치) 이터레이터
+        write: (작업 목록, 결과) → 저장한 행 수
+        checkpoint: 이어서 갱신할 체크포인트 (processed/written/errors/position)
+        checkpoint_path: 체크포인트 파일 (None이면 기록하지 않음 - dry-run)
+        workers: 작업 프로세스 수
+        total: 전체 행 수 (모르면 None)
+    """
+    started = time.perf_counter()
+    done_this_run = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        def submit(chunk):
+            tasks, position = chunk
+            return tasks, position, [executor.submit(recompute_batch, batch)
+                                     for batch in split_batches(tasks, workers * 2)]
+
+        pending = submit(next(chunks, ([], None)))
+        while pending[0]:
+            tasks, position, futures = pending
+            # 다음 청크는 지금 청크를 모으고 쓰는 동안 계산
+            pending = submit(next(chunks, ([], None)))
+
+            results = [result for future in futures for result in future.result()]
+            written = write(tasks, results)
+            errors = [(key, error) for key, _, error in results if error]
+            for key, error in errors[:3]:
+                print(f"  [WARN] {key}: {error}")
+
+            checkpoint["processed"] += len(tasks)
+            checkpoint["written"] += written
+            checkpoint["errors"] += len(errors)
+            checkpoint["position"] = position
+            if checkpoint_path is not None:
+                save_checkpoint(checkpoint_path, checkpoint)
+
+            done_this_run += len(tasks)
+            elapsed = time.perf_counter() - started
+            rate = done_this_run / elapsed if elapsed else 0.0
+            progress = f"{done_this_run:,}/{total:,}" if total is not None else f"{done_this_run:,}"
+            eta = f", 남은 시간 {(total - done_this_run) / rate:,.0f}s" if total and rate else ""
+            print(f"[{progress}] {rate:,.0f} rows/s, 누적 {checkpoint['processed']:,}행 "
+                  f"(저장 {checkpoint['written']:,}, 오류 {checkpoint['errors']:,}){eta}")
+
+    checkpoint["done"] = True
+    if checkpoint_path is not None:
+        save_checkpoint(checkpoint_path, checkpoint)
+    elapsed = time.perf_counter() - started
+    print(f"[OK] {done_this_run:,} rows in {elapsed:,.1f}s "
+          f"({done_this_run / elapsed if elapsed else 0:,.0f} rows/s, workers={workers})")
+    return checkpoint
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m scripts.dev.recompute_charts", description="사주 일괄 재계산")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="작업 프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="한 번에 읽고 쓰는 행 수")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT_PATH, help="체크포인트 파일")
+    parser.add_argument("--resume", action="store_true", help="체크포인트 위치부터 이어서 실행")
+    sources = parser.add_subparsers(dest="source", required=True)
+
+    db_parser = sources.add_parser("db", help="저장된 FortuneResult 재계산")
+    db_parser.add_argument("--service", default=",".join(SUPPORTED_SERVICES), help="서비스 코드 (쉼표로 구분)")
+    db_parser.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음")
+
+    file_parser = sources.add_parser("file", help="CSV/JSONL 생년월일 목록 계산")
+    file_parser.add_argument("input", type=Path, help="입력 파일 (.csv 또는 .jsonl)")
+    file_parser.add_argument("--output", type=Path, required=True, help="출력 JSONL 파일")
+
+    args = parser.parse_args(argv)
+
+    if args.source == "db":
+        services = [code.strip() for code in args.service.split(",") if code.strip()]
+        unsupported = set(services) - set(SUPPORTED_SERVICES)
+        if unsupported:
+            parser.error(f"재계산을 지원하지 않는 서비스입니다: {', '.join(sorted(unsupported))}")
+        source = f"db:{','.join(sorted(services))}"
+    else:
+        source = f"file:{args.input.resolve()}"
+
+    if args.resume and args.checkpoint.exists():
+        checkpoint = load_checkpoint(args.checkpoint, source)
+        if checkpoint.get("done"):
+            print(f"[OK] 이미 끝난 작업입니다 ({checkpoint['processed']:,}행): {args.checkpoint}")
+            return 0
+        print(f"[RESUME] {checkpoint['processed']:,}행 처리됨, 위치 {checkpoint['position']}부터 이어서 실행")
+    else:
+        checkpoint = {"source": source, "processed": 0, "written": 0, "errors": 0, "position": 0}
+
+    if args.source == "db":
+        after_id = checkpoint["position"]
+        total = count_db_rows(services, after_id)
+        chunks = iter_db_chunks(services, args.chunk_size, after_id)
+        if args.dry_run:
+            # 아무것도 쓰지 않으므로 체크포인트도 남기지 않음 (실제 실행의 체크포인트 보존)
+            def write(tasks, results):
+                return 0
+        else:
+            def write(tasks, results):
+                return write_db_results(results)
+        run(chunks, write, checkpoint, None if args.dry_run else args.checkpoint, args.workers, total)
+    else:
+        writer = JsonlWriter(args.output, append=args.resume and checkpoint["position"] > 0)
+        try:
+            chunks = iter_file_chunks(args.input, args.chunk_size, checkpoint["position"])
+            run(chunks, writer, checkpoint, args.checkpoint, args.workers, None)
+        finally:
+            writer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
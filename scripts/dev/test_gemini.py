@@ -1,13 +1,25 @@
 """
 Gemini API 테스트 스크립트
+
+Usage:
+    python -m scripts.dev.test_gemini           # 동기 경로 (SDK)
+    python -m scripts.dev.test_gemini --async   # 비동기 경로 (REST, httpx)
 """
+import asyncio
 import sys
 import io
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
 from app.services.gemini_service import gemini_service
 
-def test_gemini():
+async def generate_async(prompt: str) -> str:
+    try:
+        return await gemini_service.generate_content_async(prompt)
+    finally:
+        await gemini_service.aclose()
+
+
+def test_gemini(use_async: bool = False):
     """Gemini API 연결 테스트"""
     print("Gemini API 테스트 시작...")
     print("-" * 50)
@@ -19,7 +31,10 @@ def test_gemini():
         print(f"\n프롬프트: {test_prompt}\n")
         print("응답 대기 중...")
 
-        response = gemini_service.generate_content(test_prompt)
+        if use_async:
+            response = asyncio.run(generate_async(test_prompt))
+        else:
+            response = gemini_service.generate_content(test_prompt)
 
         print("\n[성공] Gemini API 응답:")
         print("-" * 50)
@@ -34,4 +49,4 @@ def test_gemini():
     return True
 
 if __name__ == "__main__":
-    test_gemini()
+    test_gemini(use_async="--async" in sys.argv)